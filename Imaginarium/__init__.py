@@ -1,6 +1,17 @@
+from . import card
+from . import metrics
+from . import randomness
 from . import sources
 from . import exceptions
 from . import getting_game_information
 from . import gameplay
+from . import scoring
+from . import scheduling
+from . import journal
+from . import statistics
+from . import timings
+from . import tracing
+from . import protocol
+from . import service
 from . import rules_setup
 from . import setting_up_game
@@ -0,0 +1,59 @@
+from itertools import count
+from typing import NamedTuple
+from weakref import WeakValueDictionary
+
+
+class Card:
+    """A card that can be received from a source.
+
+    There is only one card with the same URL at a time,
+    so the same card is shared by reference
+    between hands, discarded cards and games
+    instead of being stored several times."""
+    __slots__ = ('id', 'source', 'url', 'type', '__weakref__')
+
+    _cards: WeakValueDictionary[str, 'Card'] = WeakValueDictionary()
+    """The map of URLs and the cards that are used now."""
+    _ids = count(1)
+
+    def __new__(cls,
+                url: str,
+                source: str | None = None,
+                card_type: str | None = None) -> 'Card':
+        """Return the card with the URL or create a new one.
+
+        :param url: The link to the content of the card.
+        :param source: The link to the source the card was received from.
+        :param card_type: The type of the card content, like "photo".
+
+        :return: The card which is shared by everyone
+        who uses the same URL."""
+        try:
+            return cls._cards[url]
+        except KeyError:
+            card = super().__new__(cls)
+            card.id = next(cls._ids)
+            card.url = url
+            card.source = source
+            card.type = card_type
+            cls._cards[url] = card
+
+            return card
+
+    def __reduce__(self):
+        return type(self), (self.url, self.source, self.type)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.url!r})'
+
+    def __str__(self) -> str:
+        return self.url
+
+
+class DiscardedCard(NamedTuple):
+    """A card discarded in a round.
+
+    :param card: The discarded card.
+    :param owner: The key of the player who discarded the card."""
+    card: Card
+    owner: int
@@ -123,3 +123,14 @@ class PlayerAlreadyLeft(ImaginariumException, ValueError):
         self.message = message
 
         super().__init__(message)
+
+
+class ChoiceIsNotExpected(ImaginariumException, ValueError):
+    """Exception raised when the player cannot make the choice now
+    or the choice is invalid."""
+
+    def __init__(self, message=None):
+        super().__init__(
+            message or
+            'The choice cannot be made now.'
+        )
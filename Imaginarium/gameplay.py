@@ -1,27 +1,39 @@
 import asyncio
 from collections import defaultdict
 from math import ceil
-from random import choices, shuffle
-from time import time
+from pathlib import Path
+from time import perf_counter, time
 from typing import (
     MutableSequence,
-    Tuple,
     Mapping,
     Any,
     TypeAlias,
     Callable,
     Awaitable,
-    AsyncIterable)
+    AsyncIterable,
+    Iterable,
+    Iterator)
 
 import validators
 
 from . import sources
 from . import exceptions
 from . import rules_setup
+from . import metrics
+from . import randomness
+from . import scoring
+from . import timings
+from . import tracing
+from .journal import Journal
+from .statistics import RoundRecord, StatisticsStore
+from .scheduling import DeadlineScheduler
+from .card import Card, DiscardedCard
 
 
 class Player:
     """A player in the game."""
+    __slots__ = ('id', '_name', 'cards', 'discarded_cards',
+                 'score', 'chosen_card')
 
     def __init__(self, player_id: int, name: str = None) -> None:
         """Create a new player.
@@ -32,9 +44,9 @@ class Player:
         self.id: int = player_id
         self._name = name
 
-        self.cards: MutableSequence[str] = []
+        self.cards: MutableSequence[Card] = []
         """The player's cards."""
-        self.discarded_cards: MutableSequence[str] = []
+        self.discarded_cards: MutableSequence[Card] = []
         """The cards the player has discarded during a game."""
         self.score: float = 0
         """The player's score in a game."""
@@ -106,6 +118,86 @@ class Player:
         self.score = 0
 
 
+BOT_ID: int = -1
+"""The key of the bot in votes and discarded cards."""
+
+
+class Roster:
+    """The players in the order of their turns indexed by their IDs.
+
+    Checking, finding, adding and removing a player takes constant time."""
+
+    def __init__(self, players: Iterable[Player] = ()) -> None:
+        """Create a new roster.
+
+        :param players: The players in the order of their turns."""
+        self._players: dict[int, Player] = {}
+        for player in players:
+            self.append(player)
+
+    @staticmethod
+    def key(player: Player | int | None) -> int:
+        """Return the canonical key of the player in votes and discarded cards.
+
+        :param player: The player, the player's ID
+        or None if it is the bot."""
+        if player is None:
+            return BOT_ID
+        elif isinstance(player, int):
+            return player
+        else:
+            return player.id
+
+    def __contains__(self, player: Player | int) -> bool:
+        return self.key(player) in self._players
+
+    def __iter__(self) -> Iterator[Player]:
+        return iter(self._players.values())
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __getitem__(self, index: int | slice) -> Player | list[Player]:
+        """Return the player by their position in the order of turns.
+
+        .. note:: It takes linear time, so iterate over the roster instead."""
+        return list(self._players.values())[index]
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self._players.values())!r})'
+
+    def get(self, player: Player | int, default: Any = None) -> Player | Any:
+        """Return the player by their ID or the default value
+        if the player is not in the roster."""
+        return self._players.get(self.key(player), default)
+
+    def append(self, player: Player) -> None:
+        """Add the player to the end of the order of turns.
+
+        :raise PlayerAlreadyJoined: If the player is already in the roster."""
+        if player.id in self._players:
+            raise exceptions.PlayerAlreadyJoined(player)
+        self._players[player.id] = player
+
+    def remove(self, player: Player | int) -> Player:
+        """Remove the player from the roster and return them.
+
+        :raise PlayerAlreadyLeft: If the player is not in the roster."""
+        try:
+            return self._players.pop(self.key(player))
+        except KeyError:
+            raise exceptions.PlayerAlreadyLeft(player) from None
+
+    def clear(self) -> None:
+        self._players.clear()
+
+    def shuffle(self) -> None:
+        """Shuffle the order of turns."""
+        players = list(self._players.values())
+        GameCondition._random.game.shuffle(players)
+        self._players = {player.id: player for player in players}
+
+
 def create_source_object(source: str) -> sources.BaseSource:
     """Process the link to the source (email, url, etc.)
     and create a BaseSource object that can be used to get cards.
@@ -165,13 +257,28 @@ async def get_random_source() -> sources.BaseSource:
                 weights_count = len(GameCondition._used_sources)
                 weights.append(weights_sum / weights_count)
 
-        return choices(population=GameCondition._used_sources,
-                       weights=weights)[0]
+        return GameCondition._random.sources.choices(
+            population=GameCondition._used_sources, weights=weights)[0]
+
+
+async def receive_card(source: sources.BaseSource) -> Card:
+    """Receive a random card from the source
+    and count it in the metrics of the source."""
+    started_at = perf_counter()
+    try:
+        card = await source.get_random_card()
+    except exceptions.InvalidSource as e:
+        metrics.card_errors.labels(source, type(e).__name__).inc()
+        raise
+    metrics.cards_received.labels(source).inc()
+    metrics.card_seconds.labels(source).observe(perf_counter() - started_at)
+
+    return card
 
 
 async def get_random_card(
         timeout: float | None = None,
-        raise_timeout_error: bool = False) -> str:
+        raise_timeout_error: bool = False) -> Card:
     """Get a random card from a random source in the list of sources.
 
     Try to get a random card from a random source in a certain amount of time,
@@ -183,7 +290,7 @@ async def get_random_card(
     :param raise_timeout_error: If True, then if the card timeout is exceeded,
     the asyncio.TimeoutError exception is raised.
 
-    :return: A link to a random card.
+    :return: A random card.
     .. note:: The card will not necessarily be received before the timeout,
     but after the timeout, attempts will begin to get some card
     as soon as possible.
@@ -194,39 +301,54 @@ async def get_random_card(
     except exceptions.NoAnyUsedSources:
         source = default_source
 
-    try:
-        if raise_timeout_error:
-            return await asyncio.wait_for(
-                asyncio.create_task(source.get_random_card()),
-                timeout=timeout)
-        # If we do not have to raise the "TimeoutError" exception,
-        # then just in case, run both tasks at the same time.
-        else:
-            source_task = asyncio.create_task(
-                source.get_random_card())
-            default_source_task = asyncio.create_task(
-                default_source.get_random_card())
-
-            done, _ = await asyncio.wait((source_task,), timeout=timeout)
-
-            # If the selected source has been waiting too long,
-            # then try to get the result as soon as possible from both sources.
-            if not done:
-                done, pending = await asyncio.wait(
-                    (source_task, default_source_task),
-                    return_when=asyncio.FIRST_COMPLETED)
-                for task in pending:
-                    task.cancel()
-
-            return done.pop().result()
-    except exceptions.InvalidSource:
-        return await get_random_card()
+    with tracing.trace_card(source) as trace:
+        try:
+            if raise_timeout_error:
+                return await asyncio.wait_for(
+                    asyncio.create_task(receive_card(source)),
+                    timeout=timeout)
+            # If we do not have to raise the "TimeoutError" exception,
+            # then just in case, run both tasks at the same time.
+            else:
+                source_task = asyncio.create_task(
+                    receive_card(source))
+                # The default source does not have to race itself
+                if source is default_source:
+                    default_source_task = source_task
+                else:
+                    default_source_task = asyncio.create_task(
+                        receive_card(default_source))
+
+                try:
+                    done, _ = await asyncio.wait((source_task,), timeout=timeout)
+
+                    # If the selected source has been waiting too long,
+                    # then try to get the result as soon as possible from both sources.
+                    if not done:
+                        metrics.card_hedges.inc()
+                        if trace is not None:
+                            trace.hedged = True
+                        done, _ = await asyncio.wait(
+                            (source_task, default_source_task),
+                            return_when=asyncio.FIRST_COMPLETED)
+
+                    task = done.pop()
+                    if trace is not None:
+                        trace.served_by = str(
+                            source if task is source_task else default_source)
+                    return task.result()
+                finally:
+                    # Do not let the lost task receive a card in vain
+                    for task in (source_task, default_source_task):
+                        task.cancel()
+        except exceptions.InvalidSource:
+            return await get_random_card()
 
 
 async def async_generate_random_cards(
         cards_count: int,
         timeout: float | None = None,
-        raise_timeout_error: bool = False) -> AsyncIterable[str]:
+        raise_timeout_error: bool = False) -> AsyncIterable[Card]:
     """Return an asynchronous iterator with random cards.
 
     The iterator returns cards received by the get_random_card function.
@@ -250,7 +372,7 @@ async def async_generate_random_cards(
 async def get_random_cards(
         cards_count: int,
         timeout: float | None = None,
-        raise_timeout_error: bool = False) -> list[str]:
+        raise_timeout_error: bool = False) -> list[Card]:
     """Get random cards from a random source in the list of sources.
 
     :param cards_count: The count of cards that have to be received.
@@ -259,7 +381,7 @@ async def get_random_cards(
     :param raise_timeout_error: If True, then if some card timeout is exceeded,
     the asyncio.TimeoutError exception is raised.
 
-    :return: Links to random cards.
+    :return: Random cards.
 
     :raise asyncio.TimeoutError: If the timeout is exceeded."""
     return [f async for f in
@@ -269,18 +391,59 @@ async def get_random_cards(
                 raise_timeout_error=raise_timeout_error)]
 
 
+class PhaseProgress:
+    """The progress of a phase in which players make choices."""
+
+    def __init__(self,
+                 players: Iterable[Player],
+                 deadline: asyncio.Future,
+                 progress_hook: Callable[[], Awaitable[None]]) -> None:
+        """Start tracking the phase.
+
+        :param players: The players who have to make a choice.
+        :param deadline: The future which is resolved when
+        the time of the phase is up.
+        :param progress_hook: A hook that is called
+        when someone has made a choice."""
+        self.deadline = deadline
+        self.progress_hook = progress_hook
+        self.started_at: float = time()
+
+        self.pending: set[int] = {Roster.key(player) for player in players}
+        """The keys of the players who have not made a choice yet."""
+        self.answered: dict[int, float] = {}
+        """The map of the keys of the players who have made a choice
+        and the time in seconds they spent on it."""
+        self.players_count: int = len(self.pending)
+
+    @property
+    def answered_count(self) -> int:
+        return len(self.answered)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self.pending)
+
+    @property
+    def is_completed(self) -> bool:
+        return not self.pending
+
+
 class GameCondition:
     """Contains variables with information about the state of the game.
 
     :param _leader: The player who is the leader in the current round.
     :param _circle_num: The number of the current circle.
     :param _round_num: The number of the current round.
-    :param _discarded_cards: The tuples of cards and
-    the players who discarded them.
-    The player is None if the card was discarded by the bot.
-    :param _votes_for_card: The map of players and
+    :param _discarded_cards: The cards and
+    the keys of the players who discarded them.
+    The key is BOT_ID if the card was discarded by the bot.
+    :param _votes_for_card: The map of the players' keys and
     the number of votes for their cards.
+    The key is BOT_ID for the bot's cards.
     :param _game_started_at: The moment at which the game was started.
+    :param _seed: The seed of the random numbers of the game.
+    :param _random: The random numbers of the current session.
     :param _bot_score: The bot's score in two-person mode.
     :param _players_score: The players' score in two-person mode.
     :param _game_started: Whether the game has started.
@@ -291,23 +454,178 @@ class GameCondition:
     :param _used_cards: The cards that have already been used in the game.
     :param _unused_cards: The cards that will be used in the game.
     :param _used_sources: The sources that are used in a game.
-    :param _players: The players that are playing."""
+    :param _players: The players that are playing.
+    :param _prefetched_cards: The cards that were received in advance
+    and have not been taken yet.
+    :param _cards_prefetches: The tasks that are receiving cards in advance.
+    :param _deadlines: The scheduler of the deadlines of the game phases.
+    :param _phase_deadline: The future which is resolved when the time
+    of the current phase in which players make choices is up.
+    :param _phase: The progress of the current phase
+    in which players make choices.
+    :param _progress_notifications: The tasks that are calling
+    the hooks which show the progress of a phase.
+    :param _journal: The journal of the current game
+    if rules_setup.journal_directory is set.
+    :param _statistics: The store of the statistics of players
+    if rules_setup.statistics_path is set.
+    :param _round_decisions: The map of the players' keys and the times
+    in seconds they spent on the choices in the current round."""
     _leader: Any = None
     _circle_num: int = None
     _round_num: int = None
-    _discarded_cards: MutableSequence[Tuple[str, Player | int | None]] = None
-    _votes_for_card: Mapping[Player | int | None, int] = None
+    _discarded_cards: MutableSequence[DiscardedCard] = None
+    _votes_for_card: Mapping[int, int] = None
     _game_started_at: float = None
+    _seed: int = None
+    _random: randomness.Session = randomness.Session()
     _bot_score: float = None
     _players_score: float = None
     _game_started: bool = None
     _round_association: str = None
     _game_took_time: float = None
     _players_count: int = None
-    _used_cards: MutableSequence[str] = []
-    _unused_cards: MutableSequence[str] = []
+    _used_cards: MutableSequence[Card] = []
+    _unused_cards: MutableSequence[Card] = []
     _used_sources: MutableSequence[sources.BaseSource] = []
-    _players: MutableSequence[Any] = []
+    _players: Roster = Roster()
+    _prefetched_cards: MutableSequence[Card] = []
+    _cards_prefetches: MutableSequence[asyncio.Task] = []
+    _deadlines: DeadlineScheduler = DeadlineScheduler()
+    _phase_deadline: asyncio.Future | None = None
+    _phase: PhaseProgress | None = None
+    _progress_notifications: set[asyncio.Task] = set()
+    _journal: Journal | None = None
+    _statistics: StatisticsStore | None = None
+    _round_decisions: Mapping[int, MutableSequence[float]] = None
+
+
+metrics.games_active.set_function(lambda: int(bool(GameCondition._game_started)))
+metrics.players_joined.set_function(lambda: len(GameCondition._players))
+metrics.cards_prefetched.set_function(
+    lambda: len(GameCondition._prefetched_cards))
+metrics.deadlines_pending.set_function(lambda: len(GameCondition._deadlines))
+
+
+def start_random_session(seed: int | None = None) -> int:
+    """Start a new session of the random numbers of the game and its sources.
+
+    :param seed: The seed of the session.
+    If it is None, then a new seed is generated.
+
+    :return: The seed of the session."""
+    GameCondition._random = randomness.Session(seed)
+    for source in GameCondition._used_sources:
+        seed_source(source)
+
+    return GameCondition._random.seed
+
+
+def seed_source(source: sources.BaseSource) -> None:
+    """Derive the random numbers of the source from the current session."""
+    source.rng = GameCondition._random.derive(f'source:{source}')
+
+
+def prefetch_cards(cards_count: int) -> None:
+    """Start receiving random cards in the background,
+    so they can be taken by the take_cards function later.
+
+    :param cards_count: The count of cards that have to be received."""
+    GameCondition._cards_prefetches.append(
+        asyncio.create_task(get_random_cards(cards_count)))
+
+
+async def take_cards(cards_count: int, in_advance: int = 0) -> list[Card]:
+    """Take random cards that were prefetched
+    and receive the missing ones.
+
+    :param cards_count: The count of cards that have to be taken.
+    :param in_advance: The count of cards that are received
+    together with the missing ones to be taken later,
+    so that they do not have to be received by a separate request.
+
+    :return: Random cards."""
+    while (len(GameCondition._prefetched_cards) < cards_count and
+           GameCondition._cards_prefetches):
+        GameCondition._prefetched_cards.extend(
+            await GameCondition._cards_prefetches.pop(0))
+
+    missing_cards_count = cards_count - len(GameCondition._prefetched_cards)
+    if missing_cards_count > 0:
+        GameCondition._prefetched_cards.extend(
+            await get_random_cards(missing_cards_count + in_advance))
+
+    cards = GameCondition._prefetched_cards[:cards_count]
+    del GameCondition._prefetched_cards[:cards_count]
+    return cards
+
+
+def cancel_cards_prefetches() -> None:
+    """Stop receiving cards in advance and forget the received ones."""
+    for task in GameCondition._cards_prefetches:
+        task.cancel()
+    GameCondition._cards_prefetches.clear()
+    GameCondition._prefetched_cards.clear()
+
+
+def count_bot_cards() -> int:
+    """Count the cards the bot discards in each round."""
+    match GameCondition._players_count:
+        case 2:
+            return 1
+        case 3:
+            return 2
+        case _:
+            return 0
+
+
+def count_next_round_cards() -> int:
+    """Count the cards that have to be received
+    between the card submission of the current round
+    and the card submission of the next one.
+
+    .. note:: The cards for the next circle are counted
+    in the last round of the current one,
+    although the game may end after it."""
+    if GameCondition._players_count == 2:
+        cards_count = rules_setup.cards_per_player * GameCondition._players_count
+    else:
+        # Missed cards of the current round
+        cards_count = GameCondition._players_count
+        if GameCondition._round_num == GameCondition._players_count:
+            cards_count += (rules_setup.cards_per_player *
+                            GameCondition._players_count)
+    return cards_count + count_bot_cards()
+
+
+def count_round_scores() -> None:
+    """Count the players' score of the current round
+    by the cards the players have chosen.
+
+    .. note:: The score is counted by the scoring.count_score_deltas
+    function, so the players who vote must have the chosen_card set."""
+    players_indexes = {player.id: i
+                       for i, player in enumerate(GameCondition._players)}
+    leader_index = players_indexes[GameCondition._leader.id]
+
+    votes = [scoring.NO_CARD if (player.chosen_card is None or
+                                 (GameCondition._players_count != 2 and
+                                  i == leader_index))
+             else player.chosen_card - 1
+             for i, player in enumerate(GameCondition._players)]
+    owners = [scoring.BOT_OWNER if owner == BOT_ID
+              else players_indexes.get(Roster.key(owner), scoring.NO_OWNER)
+              for _, owner in GameCondition._discarded_cards]
+    if not owners:
+        owners = [scoring.NO_OWNER]
+
+    deltas = scoring.count_score_deltas(
+        (votes,), (owners,), (leader_index,), (GameCondition._players_count,))
+
+    GameCondition._bot_score += int(deltas.bot[0])
+    GameCondition._players_score += int(deltas.players_team[0])
+    for player, delta in zip(GameCondition._players, deltas.players[0]):
+        player.score += int(delta)
 
 
 AsyncEmptyHook: TypeAlias = Callable[[], Awaitable[None]]
@@ -318,6 +636,197 @@ async def async_empty_hook() -> None:
     pass
 
 
+def record(event: str, **data) -> None:
+    """Add the event to the journal of the game if it is kept.
+
+    :param event: The kind of the event.
+    :param data: The details of the event."""
+    if GameCondition._journal is not None:
+        GameCondition._journal.record(event, **data)
+
+
+def flush_journal() -> None:
+    """Write the recorded events in the background if the journal is kept."""
+    if GameCondition._journal is not None:
+        GameCondition._journal.flush()
+
+
+def get_statistics() -> StatisticsStore | None:
+    """Return the store of the statistics of players
+    which is opened at rules_setup.statistics_path,
+    or None if the statistics are not kept."""
+    path = rules_setup.statistics_path
+    if path is None:
+        return None
+    if (GameCondition._statistics is None or
+            GameCondition._statistics.path != Path(path)):
+        GameCondition._statistics = StatisticsStore(path)
+
+    return GameCondition._statistics
+
+
+def record_round_statistics(scores: Mapping[int, float],
+                            voters: Iterable[Player]) -> None:
+    """Add the results of the round to the statistics if they are kept.
+
+    :param scores: The map of the players' IDs
+    and their scores before the round was scored.
+    :param voters: The players who voted in the round."""
+    statistics = get_statistics()
+    if statistics is None:
+        return
+
+    # The target card is the bot's card in two-person mode
+    target = BOT_ID if GameCondition._players_count == 2 \
+        else GameCondition._leader.id
+    guessers = {player.id for player in voters
+                if player.chosen_card is not None and
+                GameCondition._discarded_cards[
+                    player.chosen_card - 1].owner == target}
+    voters = {player.id for player in voters}
+
+    statistics.record_round(
+        RoundRecord(player.id,
+                    player.name,
+                    player.score - scores[player.id],
+                    player.id in voters,
+                    player.id in guessers,
+                    len(GameCondition._round_decisions[player.id]),
+                    sum(GameCondition._round_decisions[player.id]))
+        for player in GameCondition._players)
+
+
+def record_game_statistics() -> None:
+    """Count the game in the statistics if they are kept."""
+    statistics = get_statistics()
+    if statistics is None:
+        return
+
+    if GameCondition._players_count == 2:
+        winners = GameCondition._players \
+            if GameCondition._players_score > GameCondition._bot_score else ()
+    else:
+        best_score = max(player.score for player in GameCondition._players)
+        winners = [player for player in GameCondition._players
+                   if player.score == best_score]
+
+    statistics.record_game((player.id for player in GameCondition._players),
+                           (player.id for player in winners))
+
+
+def record_association() -> None:
+    """Record the association of the round.
+
+    The hooks can set the association to the reply of the leader,
+    so it is recorded as its text."""
+    association = GameCondition._round_association
+    record('association',
+           association=None if association is None else str(association))
+
+
+def record_deal(cards_by_players: Iterable[tuple[Player, Iterable[Card]]],
+                replace: bool = False) -> None:
+    """Record the cards handed out to the players.
+
+    :param cards_by_players: The players and their new cards.
+    :param replace: Whether the cards replace the players' hands."""
+    if GameCondition._journal is not None:
+        for player, cards in cards_by_players:
+            record('deal', player=player.id,
+                   cards=[str(card) for card in cards],
+                   replace=replace)
+
+
+def record_discards(start: int) -> None:
+    """Record the cards discarded since the start index."""
+    if GameCondition._journal is not None:
+        for card, owner in GameCondition._discarded_cards[start:]:
+            record('discard', player=owner, card=str(card))
+
+
+async def run_phase(name: str,
+                    hook: AsyncEmptyHook,
+                    players: Iterable[Player],
+                    timeout: float | None = None,
+                    progress_hook: AsyncEmptyHook = async_empty_hook) -> None:
+    """Call the hook of a phase in which players make choices
+    and keep the deadline and the progress of the phase
+    until the hook returns.
+
+    The deadline is shared by all the players of the phase,
+    so the hook can wait for GameCondition._phase_deadline
+    instead of creating its own timeouts for each player.
+
+    :param name: The name of the phase in the journal.
+    :param hook: The hook that requests the choices.
+    :param players: The players who have to make a choice.
+    :param timeout: The time in seconds the players have.
+    If it is None, then the timeout is rules_setup.step_timeout.
+    :param progress_hook: A hook that is called
+    when someone has made a choice."""
+    if timeout is None:
+        timeout = rules_setup.step_timeout
+
+    GameCondition._phase_deadline = GameCondition._deadlines.schedule(timeout)
+    GameCondition._phase = phase = PhaseProgress(
+        players, GameCondition._phase_deadline, progress_hook)
+    discarded_count = len(GameCondition._discarded_cards)
+    try:
+        with timings.measure(f'phase.{name}'):
+            await hook()
+    finally:
+        # The phase may have been completed before the deadline
+        GameCondition._deadlines.cancel(GameCondition._phase_deadline)
+        GameCondition._phase_deadline = None
+        GameCondition._phase = None
+
+        for key, took in phase.answered.items():
+            GameCondition._round_decisions[key].append(took)
+        record_discards(discarded_count)
+        record('phase', name=name,
+               took=time() - phase.started_at,
+               answered=list(phase.answered.items()),
+               missed=list(phase.pending))
+
+
+def get_not_leaders() -> MutableSequence[Player]:
+    """Return the players who are not the leader of the round."""
+    return [player for player in GameCondition._players
+            if player is not GameCondition._leader]
+
+
+def mark_answered(player: Player | int) -> None:
+    """Mark that the player has made the choice in the current phase.
+
+    Shorten the time of the phase to rules_setup.quorum_grace_timeout
+    for the rest of the players if the quorum has made the choice,
+    and show the progress of the phase.
+
+    :param player: The player or the player's ID."""
+    phase = GameCondition._phase
+    key = Roster.key(player)
+    if phase is None or key not in phase.pending:
+        return
+
+    phase.pending.remove(key)
+    phase.answered[key] = time() - phase.started_at
+
+    if (phase.pending and
+            rules_setup.quorum is not None and
+            phase.answered_count >= rules_setup.quorum * phase.players_count and
+            GameCondition._deadlines.remaining(phase.deadline) >
+            rules_setup.quorum_grace_timeout):
+        GameCondition._deadlines.reschedule(phase.deadline,
+                                            rules_setup.quorum_grace_timeout)
+
+    if phase.players_count < 2:
+        return
+    # Do not make the player wait while the progress is shown
+    task = asyncio.create_task(phase.progress_hook())
+    GameCondition._progress_notifications.add(task)
+    task.add_done_callback(GameCondition._progress_notifications.discard)
+
+
 # This is already some kind of bullshit
 async def start_game(
         at_start_hook: AsyncEmptyHook = async_empty_hook,
@@ -334,7 +843,8 @@ async def start_game(
         vote_for_target_card_hook: AsyncEmptyHook = async_empty_hook,
         at_round_end_hook: AsyncEmptyHook = async_empty_hook,
         at_circle_end_hook: AsyncEmptyHook = async_empty_hook,
-        at_end_hook: AsyncEmptyHook = async_empty_hook) -> None:
+        at_end_hook: AsyncEmptyHook = async_empty_hook,
+        show_phase_progress_hook: AsyncEmptyHook = async_empty_hook) -> None:
     """Call the function inside another module to start the game
     with following order and the module's own hooks.
 
@@ -364,7 +874,10 @@ async def start_game(
     to require a vote for a target card.
     :param at_round_end_hook: A hook that is called when a round ends.
     :param at_circle_end_hook: A hook that is called when a circle ends.
-    :param at_end_hook: A hook that is called when the game ends."""
+    :param at_end_hook: A hook that is called when the game ends.
+    :param show_phase_progress_hook: A hook that is called
+    when someone has made a choice in a phase
+    in which several players make choices."""
     if GameCondition._game_started:
         raise exceptions.GameIsStarted(
             'The game cannot start until it is over.')
@@ -374,11 +887,52 @@ async def start_game(
             'There are not enough players to start.')
 
     GameCondition._game_started_at = time()
+    GameCondition._seed = start_random_session(rules_setup.seed)
     GameCondition._bot_score = 0
     GameCondition._players_score = 0
     for player in GameCondition._players:
         player.reset_state()
+    cancel_cards_prefetches()
     GameCondition._game_started = True
+    metrics.games_started.inc()
+    timings.session.clear()
+    if timings.enabled:
+        at_start_hook = timings.timed_hook(at_start_hook, 'hook.at_start')
+        at_circle_start_hook = timings.timed_hook(
+            at_circle_start_hook, 'hook.at_circle_start')
+        at_round_start_hook = timings.timed_hook(
+            at_round_start_hook, 'hook.at_round_start')
+        show_association_hook = timings.timed_hook(
+            show_association_hook, 'hook.show_association')
+        show_players_cards_hook = timings.timed_hook(
+            show_players_cards_hook, 'hook.show_players_cards')
+        show_discarded_cards_hook = timings.timed_hook(
+            show_discarded_cards_hook, 'hook.show_discarded_cards')
+        at_round_end_hook = timings.timed_hook(
+            at_round_end_hook, 'hook.at_round_end')
+        at_circle_end_hook = timings.timed_hook(
+            at_circle_end_hook, 'hook.at_circle_end')
+        at_end_hook = timings.timed_hook(at_end_hook, 'hook.at_end')
+        show_phase_progress_hook = timings.timed_hook(
+            show_phase_progress_hook, 'hook.show_phase_progress')
+
+    # The journal of the previous game is left open if it was interrupted
+    if GameCondition._journal is not None:
+        await GameCondition._journal.close()
+    if rules_setup.journal_directory is None:
+        GameCondition._journal = None
+    else:
+        GameCondition._journal = Journal.in_directory(
+            rules_setup.journal_directory)
+    # Open the statistics before the first round is recorded
+    get_statistics()
+    record('game_started',
+           seed=GameCondition._seed,
+           players=[(player.id, player.name)
+                    for player in GameCondition._players],
+           settings={'cards_per_player': rules_setup.cards_per_player,
+                     'winning_score': rules_setup.winning_score,
+                     'step_timeout': rules_setup.step_timeout})
 
     await at_start_hook()
 
@@ -389,13 +943,19 @@ async def start_game(
             break
 
         GameCondition._circle_num += 1
+        record('circle_started', circle=GameCondition._circle_num)
         # Hand out cards
         if GameCondition._players_count >= 3:
-            cards = await get_random_cards(rules_setup.cards_per_player *
-                                           GameCondition._players_count)
+            with timings.measure('deal'):
+                cards = await take_cards(rules_setup.cards_per_player *
+                                         GameCondition._players_count,
+                                         in_advance=count_bot_cards())
             for i, player in enumerate(GameCondition._players):
                 player.cards = cards[i * rules_setup.cards_per_player:
                                      (i + 1) * rules_setup.cards_per_player]
+            record_deal(((player, player.cards)
+                         for player in GameCondition._players),
+                        replace=True)
 
         await at_circle_start_hook()
 
@@ -405,92 +965,134 @@ async def start_game(
             if not GameCondition._game_started:
                 break
 
+            round_started_at = perf_counter()
             GameCondition._round_num += 1
             GameCondition._votes_for_card = defaultdict(int)
             GameCondition._discarded_cards = []
             GameCondition._round_association = None
+            GameCondition._round_decisions = defaultdict(list)
+            # The votes of the previous round are not counted again
+            for player in GameCondition._players:
+                player.chosen_card = None
+            record('round_started', round=GameCondition._round_num,
+                   leader=GameCondition._leader.id)
             # Refresh cards
             if GameCondition._players_count == 2:
-                cards = await get_random_cards(rules_setup.cards_per_player *
-                                               GameCondition._players_count)
+                with timings.measure('deal'):
+                    cards = await take_cards(rules_setup.cards_per_player *
+                                             GameCondition._players_count,
+                                             in_advance=count_bot_cards())
                 for i, player in enumerate(GameCondition._players):
                     player.cards = cards[i * rules_setup.cards_per_player:
                                          (i + 1) * rules_setup.cards_per_player]
+                record_deal(((player, player.cards)
+                             for player in GameCondition._players),
+                            replace=True)
 
             await at_round_start_hook()
 
             # Each player discards cards to the common deck
             if GameCondition._players_count == 2:
-                # Discard the bot's card
-                GameCondition._discarded_cards.append((await get_random_card(), None))
-
-                await request_association_hook()
+                # Discard the bot's card received with the players' cards
+                with timings.measure('bot_cards'):
+                    bot_cards = await take_cards(count_bot_cards())
+                for card in bot_cards:
+                    GameCondition._discarded_cards.append(
+                        DiscardedCard(card, BOT_ID))
+                record_discards(0)
+
+                await run_phase('association', request_association_hook,
+                                (GameCondition._leader,))
+                record_association()
 
                 await show_association_hook()
 
                 await show_players_cards_hook()
 
-                await request_players_cards_2_hook()
+                # Each player discards two cards one by one
+                await run_phase('players_cards', request_players_cards_2_hook,
+                                GameCondition._players,
+                                timeout=2 * rules_setup.step_timeout,
+                                progress_hook=show_phase_progress_hook)
 
             else:
-                if GameCondition._players_count == 3:
-                    for card in await get_random_cards(2):
-                        GameCondition._discarded_cards.append((card, None))
+                # Discard the bot's cards received with the players' cards
+                with timings.measure('bot_cards'):
+                    bot_cards = await take_cards(count_bot_cards())
+                for card in bot_cards:
+                    GameCondition._discarded_cards.append(
+                        DiscardedCard(card, BOT_ID))
+                record_discards(0)
 
                 await show_players_cards_hook()
 
-                await request_leader_card_hook()
+                await run_phase('leader_card', request_leader_card_hook,
+                                (GameCondition._leader,))
 
-                await request_association_hook()
+                await run_phase('association', request_association_hook,
+                                (GameCondition._leader,))
+                record_association()
 
                 await show_association_hook()
 
-                await request_players_cards_hook()
+                await run_phase('players_cards', request_players_cards_hook,
+                                get_not_leaders(),
+                                progress_hook=show_phase_progress_hook)
+
+            # Receive the cards of the next round while the players are voting
+            prefetch_cards(count_next_round_cards())
 
-            shuffle(GameCondition._discarded_cards)
+            with timings.measure('shuffle'):
+                GameCondition._random.game.shuffle(GameCondition._discarded_cards)
+            record('reveal', cards=[(str(card), owner) for card, owner
+                                    in GameCondition._discarded_cards])
 
             await show_discarded_cards_hook()
 
             # Each player votes for the target card
             if GameCondition._players_count == 2:
-                await vote_for_target_card_2_hook()
+                voters = list(GameCondition._players)
+                await run_phase('vote', vote_for_target_card_2_hook,
+                                voters,
+                                progress_hook=show_phase_progress_hook)
 
             else:
-                await vote_for_target_card_hook()
+                voters = get_not_leaders()
+                await run_phase('vote', vote_for_target_card_hook,
+                                voters,
+                                progress_hook=show_phase_progress_hook)
+            for player in voters:
+                record('vote', player=player.id, card=player.chosen_card)
 
             # Scoring
-            if GameCondition._players_count == 2:
-                # Count bot's score
-                # noinspection PyTypeChecker
-                match GameCondition._votes_for_card[None]:
-                    case 0:
-                        GameCondition._bot_score += 3
-                    case 1:
-                        GameCondition._players_score += 1
-                        GameCondition._bot_score += 1
-                    case 2:
-                        GameCondition._players_score += 2
-            else:
-                if GameCondition._votes_for_card[GameCondition._leader.id] == 0:
-                    for player in GameCondition._players:
-                        player.score += GameCondition._votes_for_card[player.id]
-                else:
-                    if GameCondition._votes_for_card[GameCondition._leader.id] != GameCondition._players_count:
-                        GameCondition._leader.score += 3
-                    for player in GameCondition._players:
-                        if player != GameCondition._leader:
-                            if GameCondition._discarded_cards[player.chosen_card - 1][1] == \
-                                    GameCondition._leader.id:
-                                player.score += 3
+            scores = {player.id: player.score
+                      for player in GameCondition._players}
+            with timings.measure('scoring'):
+                count_round_scores()
+            record_round_statistics(scores, voters)
+            record('score',
+                   players=[(player.id, player.score)
+                            for player in GameCondition._players],
+                   bot=GameCondition._bot_score,
+                   players_team=GameCondition._players_score)
 
             # Add missed cards
             if GameCondition._players_count >= 3:
-                for player, card in zip(
-                        GameCondition._players,
-                        await get_random_cards(GameCondition._players_count)):
+                with timings.measure('replenish'):
+                    missed_cards = await take_cards(
+                        GameCondition._players_count)
+                for player, card in zip(GameCondition._players, missed_cards):
                     player.cards.append(card)
+                record_deal((player, (card,)) for player, card
+                            in zip(GameCondition._players, missed_cards))
+
+            record('round_ended', round=GameCondition._round_num)
+            flush_journal()
 
             await at_round_end_hook()
+            metrics.rounds_played.inc()
+            if timings.enabled:
+                timings.record('round', perf_counter() - round_started_at)
 
         # Check for victory
         if GameCondition._players_count == 2:
@@ -504,8 +1106,15 @@ async def start_game(
 
         await at_circle_end_hook()
 
+    cancel_cards_prefetches()
     GameCondition._game_took_time = time() - GameCondition._game_started_at
 
+    record('game_ended', took=GameCondition._game_took_time)
+    record_game_statistics()
+    if GameCondition._journal is not None:
+        await GameCondition._journal.close()
+        GameCondition._journal = None
+
     await at_end_hook()
 
 
@@ -520,16 +1129,12 @@ def end_game() -> None:
 def join(player: Player) -> None:
     if GameCondition._game_started:
         raise exceptions.GameIsStarted
-    elif player in GameCondition._players:
-        raise exceptions.PlayerAlreadyJoined(player)
     else:
         GameCondition._players.append(player)
 
 
-def leave(player: Player) -> None:
+def leave(player: Player | int) -> None:
     if GameCondition._game_started:
         raise exceptions.GameIsStarted
-    elif player not in GameCondition._players:
-        raise exceptions.PlayerAlreadyLeft(player)
     else:
         GameCondition._players.remove(player)
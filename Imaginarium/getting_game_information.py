@@ -8,9 +8,12 @@ from Imaginarium.gameplay import GameCondition
 from . import exceptions
 from . import sources
 from . import gameplay
+from . import statistics
+from . import timings
+from . import tracing
 
 
-def get_players() -> MutableSequence[gameplay.Player]:
+def get_players() -> gameplay.Roster:
     return GameCondition._players
 
 
@@ -32,3 +35,30 @@ def get_used_cards() -> MutableSequence[str]:
 
 def get_used_sources() -> MutableSequence[sources.BaseSource]:
     return GameCondition._used_sources
+
+
+def get_phase_progress() -> gameplay.PhaseProgress | None:
+    return GameCondition._phase
+
+
+async def get_leaderboard(limit: int = 10) -> \
+        MutableSequence[statistics.PlayerStatistics]:
+    """Return the players with the most points over all the games,
+    or nothing if the statistics are not kept."""
+    store = gameplay.get_statistics()
+    if store is None:
+        return []
+    return await store.get_leaderboard(limit)
+
+
+def get_timings(overall: bool = False) -> timings.Timings:
+    """Return the histograms of the time spent on phases and hooks.
+
+    :param overall: Whether to return the timings of all the games
+    instead of the current or the last one."""
+    return timings.overall if overall else timings.session
+
+
+def get_sources_summaries() -> dict[str, tracing.SourceSummary]:
+    """Return the summaries of the traced card requests by the sources."""
+    return tracing.summaries
@@ -0,0 +1,234 @@
+"""The append-only journal of the events of a game.
+
+Every game session is written to its own file in the JSON lines format,
+one event per line. Events are buffered in memory and written
+by a background thread at the end of every round,
+so recording an event does not wait for the disk.
+
+The journal can be replayed to reconstruct the state of the game
+at any event offset::
+
+    python -m Imaginarium.replay path/to/session.jsonl --offset 42"""
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from time import time
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    MutableSequence,
+    TypeAlias
+)
+from uuid import uuid4
+
+Event: TypeAlias = dict[str, Any]
+
+logger = logging.getLogger(__name__)
+
+
+class Journal:
+    """The journal of one game session."""
+
+    def __init__(self, path: Path | str) -> None:
+        """Create the journal.
+
+        :param path: The file to which the events are appended."""
+        self.path = Path(path)
+        self.offset: int = 0
+        """The offset of the next event."""
+        self._buffer: MutableSequence[Event] = []
+        # A single thread keeps the batches in order
+        self._writer = ThreadPoolExecutor(max_workers=1,
+                                          thread_name_prefix='journal')
+        self._writes: set[asyncio.Future] = set()
+
+    @classmethod
+    def in_directory(cls, directory: Path | str) -> 'Journal':
+        """Create the journal of a new session in the directory.
+
+        :param directory: The directory which contains the journals."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f'{datetime.now():%Y%m%d-%H%M%S}-{uuid4().hex[:8]}.jsonl'
+
+        return cls(directory / name)
+
+    def record(self, event: str, **data) -> None:
+        """Add the event to the buffer.
+
+        :param event: The kind of the event.
+        :param data: The details of the event.
+        They have to be serializable to JSON."""
+        self._buffer.append({'offset': self.offset,
+                             'time': time(),
+                             'event': event,
+                             **data})
+        self.offset += 1
+
+    def flush(self) -> asyncio.Future | None:
+        """Write the buffered events in the background.
+
+        :return: The future of the write,
+        which does not have to be awaited,
+        or None if there is nothing to write."""
+        if not self._buffer:
+            return None
+
+        events, self._buffer = self._buffer, []
+        write = asyncio.get_running_loop().run_in_executor(
+            self._writer, self._write, events)
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+        return write
+
+    async def close(self) -> None:
+        """Write all the buffered events and stop the writer."""
+        self.flush()
+        if self._writes:
+            await asyncio.wait(self._writes)
+        self._writer.shutdown(wait=False)
+
+    def _write(self, events: Iterable[Event]) -> None:
+        # An event that cannot be serialized does not lose the others
+        lines = []
+        for event in events:
+            try:
+                lines.append(json.dumps(event, ensure_ascii=False) + '\n')
+            except (TypeError, ValueError):
+                logger.exception('The event %s of the journal %s '
+                                 'cannot be written.',
+                                 event.get('offset'), self.path)
+        try:
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(''.join(lines))
+        except OSError:
+            logger.exception('The events of the journal %s cannot be written.',
+                             self.path)
+
+
+def read_events(path: Path | str) -> Iterator[Event]:
+    """Read the events of the journal in order.
+
+    A line that was being written when the process crashed is skipped.
+
+    :param path: The file of the journal."""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                return
+
+
+class GameState:
+    """The state of a game reconstructed from its events."""
+
+    def __init__(self) -> None:
+        self.offset: int | None = None
+        """The offset of the last applied event."""
+        self.players: dict[int, dict[str, Any]] = {}
+        """The map of the players' IDs and their names, cards and score."""
+        self.seed: int | None = None
+        """The seed of the random numbers of the game."""
+        self.settings: dict[str, Any] = {}
+        self.circle_num: int = 0
+        self.round_num: int = 0
+        self.leader: int | None = None
+        self.association: str | None = None
+        self.discarded_cards: MutableSequence[tuple[str, int]] = []
+        """The discarded cards and the IDs of their owners."""
+        self.votes: dict[int, int] = {}
+        """The map of the players' IDs and the numbers of the cards
+        they voted for."""
+        self.bot_score: float = 0
+        self.players_score: float = 0
+        self.phases: MutableSequence[Event] = []
+        """The finished phases in which players made choices."""
+        self.is_ended: bool = False
+
+    def apply(self, event: Event) -> None:
+        """Change the state as the event describes.
+
+        :param event: The event read from the journal."""
+        self.offset = event['offset']
+        kind = event['event']
+
+        if kind == 'game_started':
+            self.seed = event.get('seed')
+            self.settings = event['settings']
+            self.players = {player_id: {'name': name, 'cards': [], 'score': 0}
+                            for player_id, name in event['players']}
+        elif kind == 'circle_started':
+            self.circle_num = event['circle']
+        elif kind == 'round_started':
+            self.round_num = event['round']
+            self.leader = event['leader']
+            self.association = None
+            self.discarded_cards = []
+            self.votes = {}
+        elif kind == 'deal':
+            player = self.players[event['player']]
+            if event.get('replace', False):
+                player['cards'] = list(event['cards'])
+            else:
+                player['cards'].extend(event['cards'])
+        elif kind == 'discard':
+            # The bot has no hand, and in two-person mode
+            # the hand can be kept until the next deal
+            cards = self.players.get(event['player'], {}).get('cards', ())
+            if event['card'] in cards:
+                cards.remove(event['card'])
+            self.discarded_cards.append((event['card'], event['player']))
+        elif kind == 'reveal':
+            self.discarded_cards = [tuple(card) for card in event['cards']]
+        elif kind == 'association':
+            self.association = event['association']
+        elif kind == 'vote':
+            self.votes[event['player']] = event['card']
+        elif kind == 'score':
+            for player_id, score in event['players']:
+                self.players[player_id]['score'] = score
+            self.bot_score = event['bot']
+            self.players_score = event['players_team']
+        elif kind == 'phase':
+            self.phases.append(event)
+        elif kind == 'game_ended':
+            self.is_ended = True
+
+    def as_dict(self) -> dict[str, Any]:
+        return {'offset': self.offset,
+                'seed': self.seed,
+                'settings': self.settings,
+                'circle': self.circle_num,
+                'round': self.round_num,
+                'leader': self.leader,
+                'association': self.association,
+                'players': self.players,
+                'discarded_cards': self.discarded_cards,
+                'votes': self.votes,
+                'bot_score': self.bot_score,
+                'players_score': self.players_score,
+                'phases_count': len(self.phases),
+                'is_ended': self.is_ended}
+
+
+def replay(path: Path | str, offset: int | None = None) -> GameState:
+    """Reconstruct the state of the game from its journal.
+
+    :param path: The file of the journal.
+    :param offset: The offset of the last event that is applied.
+    If it is None, then all the events are applied.
+
+    :return: The state of the game right after the event."""
+    state = GameState()
+    for event in read_events(path):
+        if offset is not None and event['offset'] > offset:
+            break
+        state.apply(event)
+
+    return state
@@ -0,0 +1,330 @@
+"""The metrics of the process in the Prometheus text format.
+
+Metrics are registered once by name, so modules that are reloaded
+receive the same metrics instead of the duplicates::
+
+    cards_received = metrics.counter(
+        'imaginarium_cards_received_total',
+        'The cards received from sources.',
+        ('source',))
+    cards_received.labels('https://vk.com/group').inc()
+
+The metrics can be scraped from the local HTTP server
+started by the serve function."""
+import asyncio
+from time import perf_counter
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    MutableMapping
+)
+
+from . import timings
+
+CONTENT_TYPE: str = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return (str(value).replace('\\', r'\\')
+            .replace('\n', r'\n')
+            .replace('"', r'\"'))
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    labels = ','.join(f'{name}="{_escape(value)}"'
+                      for name, value in zip(names, values))
+    return f'{{{labels}}}' if labels else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if value != value:
+        return 'NaN'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """A metric which values are divided by the values of its labels."""
+    type: str = 'untyped'
+
+    def __init__(self, name: str,
+                 documentation: str,
+                 label_names: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names: tuple[str, ...] = tuple(label_names)
+        self._children: MutableMapping[tuple[str, ...], object] = {}
+        # Show the metrics without labels before they are changed
+        if not self.label_names:
+            self.labels()
+
+    def labels(self, *values: str):
+        """Return the value of the metric for the values of the labels."""
+        values = tuple(str(value) for value in values)
+        try:
+            return self._children[values]
+        except KeyError:
+            if len(values) != len(self.label_names):
+                raise ValueError(
+                    f'The "{self.name}" metric has the labels '
+                    f'{self.label_names}, but {values} are passed.')
+            child = self._children[values] = self._new_child()
+            return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterator[tuple[str, tuple[str, ...], float]]:
+        """Return the suffixes of the names, the values of the labels
+        and the values of the samples of the metric."""
+        raise NotImplementedError
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {_escape(self.documentation)}'
+        yield f'# TYPE {self.name} {self.type}'
+        for suffix, values, value in self._samples():
+            names = self.label_names
+            if suffix == '_bucket':
+                # The last value is the bound of the bucket
+                names = (*names, 'le')
+            yield (f'{self.name}{suffix}{_format_labels(names, values)} '
+                   f'{_format_value(value)}')
+
+
+class _Value:
+    __slots__ = ('value', 'function')
+
+    def __init__(self) -> None:
+        self.value: float = 0
+        self.function: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the value by calling the function when it is scraped."""
+        self.function = function
+
+    def get(self) -> float:
+        return self.value if self.function is None else self.function()
+
+
+class Counter(_Metric):
+    """A value that only increases."""
+    type = 'counter'
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for values, child in tuple(self._children.items()):
+            yield '', values, child.get()
+
+
+class Gauge(Counter):
+    """A value that can go up and down."""
+    type = 'gauge'
+
+    def dec(self, amount: float = 1) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.labels().set_function(function)
+
+
+class _Observations(timings.Histogram):
+    __slots__ = ()
+
+    def observe(self, seconds: float) -> None:
+        self.add(seconds)
+
+    def time(self) -> '_Timer':
+        """Return a context manager that observes the time spent inside it."""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ('observations', 'started_at')
+
+    def __init__(self, observations: _Observations) -> None:
+        self.observations = observations
+
+    def __enter__(self) -> None:
+        self.started_at = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.observations.add(perf_counter() - self.started_at)
+
+
+class Histogram(_Metric):
+    """The distribution of durations in seconds.
+
+    The buckets are the same as the buckets of the game timings."""
+    type = 'histogram'
+
+    def _new_child(self) -> _Observations:
+        return _Observations()
+
+    def observe(self, seconds: float) -> None:
+        self.labels().observe(seconds)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def _histograms(self) -> Iterable[tuple[tuple[str, ...], timings.Histogram]]:
+        return tuple(self._children.items())
+
+    def _samples(self):
+        for values, histogram in self._histograms():
+            cumulative = 0
+            for bound, count in zip(timings.BOUNDS, histogram.buckets):
+                cumulative += count
+                yield '_bucket', (*values, _format_value(bound)), cumulative
+            yield '_bucket', (*values, '+Inf'), histogram.count
+            yield '_sum', values, histogram.total
+            yield '_count', values, histogram.count
+
+
+class TimingsHistogram(Histogram):
+    """The histogram of the overall timings of the game
+    labeled by the names of the measured parts."""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation, ('part',))
+
+    def _histograms(self):
+        return [((part,), histogram)
+                for part, histogram in tuple(timings.overall.items())]
+
+
+class Registry:
+    """The metrics that are scraped together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add the metric or return the registered one with the same name."""
+        return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        """Return all the metrics in the Prometheus text format."""
+        return ''.join(line + '\n'
+                       for metric in tuple(self._metrics.values())
+                       for line in metric.render())
+
+
+registry = Registry()
+
+
+def counter(name: str, documentation: str,
+            label_names: Iterable[str] = ()) -> Counter:
+    return registry.register(Counter(name, documentation, label_names))
+
+
+def gauge(name: str, documentation: str,
+          label_names: Iterable[str] = ()) -> Gauge:
+    return registry.register(Gauge(name, documentation, label_names))
+
+
+def histogram(name: str, documentation: str,
+              label_names: Iterable[str] = ()) -> Histogram:
+    return registry.register(Histogram(name, documentation, label_names))
+
+
+async def _handle_scrape(reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> None:
+    """Answer an HTTP request with the metrics."""
+    try:
+        request_line = await reader.readline()
+        # Skip the headers
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+
+        try:
+            method, target, _ = request_line.decode('latin-1').split()
+        except ValueError:
+            status, body = '400 Bad Request', b''
+        else:
+            if target.split('?')[0] != '/metrics':
+                status, body = '404 Not Found', b''
+            elif method not in ('GET', 'HEAD'):
+                status, body = '405 Method Not Allowed', b''
+            else:
+                status = '200 OK'
+                body = registry.render().encode()
+                if method == 'HEAD':
+                    body = b''
+
+        writer.write(f'HTTP/1.1 {status}\r\n'
+                     f'Content-Type: {CONTENT_TYPE}\r\n'
+                     f'Content-Length: {len(body)}\r\n'
+                     f'Connection: close\r\n'
+                     f'\r\n'.encode() + body)
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = '127.0.0.1', port: int = 9108) -> asyncio.Server:
+    """Start serving the metrics at http://host:port/metrics
+    in the running event loop.
+
+    :param host: The address the server listens on.
+    :param port: The port the server listens on.
+    If it is 0, then a free port is chosen.
+
+    :return: The started server, which has to be closed
+    when the metrics are not needed anymore."""
+    return await asyncio.start_server(_handle_scrape, host, port)
+
+
+# The metrics of the game
+games_started = counter(
+    'imaginarium_games_started_total', 'The games that have been started.')
+rounds_played = counter(
+    'imaginarium_rounds_total', 'The rounds that have been played.')
+games_active = gauge(
+    'imaginarium_games_active', 'The games that are being played.')
+players_joined = gauge(
+    'imaginarium_players', 'The players that have joined the game.')
+cards_prefetched = gauge(
+    'imaginarium_cards_prefetched', 'The cards received in advance.')
+deadlines_pending = gauge(
+    'imaginarium_deadlines_pending', 'The deadlines of phases that have not come.')
+cards_received = counter(
+    'imaginarium_cards_received_total',
+    'The cards received from sources.', ('source',))
+card_errors = counter(
+    'imaginarium_card_errors_total',
+    'The errors of sources while receiving cards.', ('source', 'error'))
+card_seconds = histogram(
+    'imaginarium_card_receiving_seconds',
+    'The time in seconds a card is received from a source.', ('source',))
+card_hedges = counter(
+    'imaginarium_card_hedges_total',
+    'The cards that were raced against the default source '
+    'because the source was too slow.')
+vk_rate_limits = counter(
+    'imaginarium_vk_rate_limits_total',
+    'The Vk API requests retried because of the rate limit.')
+timings_seconds = registry.register(TimingsHistogram(
+    'imaginarium_timing_seconds',
+    'The time in seconds spent on the parts of games '
+    'if the timings are enabled.'))
@@ -0,0 +1,178 @@
+"""The binary protocol of the engine service.
+
+Every message is a frame::
+
+    length: uint32 | kind: uint8 | request_id: uint32 | body
+
+where the length counts the bytes after itself,
+and the body is a value encoded as tagged binary data:
+
+    ======  =========================================
+    Tag     Value
+    ======  =========================================
+    ``N``   None
+    ``T``   True
+    ``F``   False
+    ``i``   int64
+    ``d``   float64
+    ``s``   uint32 length and UTF-8 string
+    ``b``   uint32 length and bytes
+    ``l``   uint32 count and the items of a list
+    ``m``   uint32 count and the keys and values of a dict
+    ======  =========================================
+
+All the numbers are big-endian. Tuples are encoded as lists."""
+import asyncio
+from struct import Struct, error as StructError
+from typing import Any
+
+CALL: int = 1
+"""A client calls an operation. The body is [operation, arguments]."""
+RESULT: int = 2
+"""The service returns the result of the call with the same request ID."""
+ERROR: int = 3
+"""The call with the same request ID failed.
+The body is [the name of the exception, the message]."""
+EVENT: int = 4
+"""The service pushes an event of the game. The body is [event, data]."""
+
+MAX_FRAME_SIZE: int = 16 * 1024 * 1024
+"""The maximum size of a frame in bytes, which limits broken clients."""
+MAX_DEPTH: int = 32
+"""The maximum nesting of the lists and the dicts of a value."""
+
+_header = Struct('>IBI')
+_length = Struct('>I')
+_int = Struct('>q')
+_float = Struct('>d')
+
+
+class ProtocolError(Exception):
+    """The data does not follow the protocol."""
+
+
+def _encode(value: Any, parts: list[bytes]) -> None:
+    # bool is checked before int, since it is a subclass of int
+    if value is None:
+        parts.append(b'N')
+    elif value is True:
+        parts.append(b'T')
+    elif value is False:
+        parts.append(b'F')
+    elif isinstance(value, int):
+        try:
+            parts.append(b'i' + _int.pack(value))
+        except StructError:
+            raise ProtocolError(f'The integer {value} does not fit in 64 bits.') from None
+    elif isinstance(value, float):
+        parts.append(b'd' + _float.pack(value))
+    elif isinstance(value, str):
+        data = value.encode()
+        parts.append(b's' + _length.pack(len(data)))
+        parts.append(data)
+    elif isinstance(value, (bytes, bytearray)):
+        parts.append(b'b' + _length.pack(len(value)))
+        parts.append(bytes(value))
+    elif isinstance(value, (list, tuple)):
+        parts.append(b'l' + _length.pack(len(value)))
+        for item in value:
+            _encode(item, parts)
+    elif isinstance(value, dict):
+        parts.append(b'm' + _length.pack(len(value)))
+        for key, item in value.items():
+            _encode(key, parts)
+            _encode(item, parts)
+    else:
+        raise ProtocolError(
+            f'The value of the type "{type(value).__name__}" cannot be encoded.')
+
+
+def encode(value: Any) -> bytes:
+    """Encode the value as tagged binary data.
+
+    :raise ProtocolError: If the value contains an unsupported type."""
+    parts = []
+    _encode(value, parts)
+    return b''.join(parts)
+
+
+def _decode(data: memoryview, position: int,
+            depth: int = 0) -> tuple[Any, int]:
+    tag = data[position]
+    position += 1
+    match tag:
+        case 78:  # N
+            return None, position
+        case 84:  # T
+            return True, position
+        case 70:  # F
+            return False, position
+        case 105:  # i
+            return _int.unpack_from(data, position)[0], position + 8
+        case 100:  # d
+            return _float.unpack_from(data, position)[0], position + 8
+        case 115 | 98:  # s, b
+            size = _length.unpack_from(data, position)[0]
+            position += 4
+            if position + size > len(data):
+                raise ProtocolError('The data is truncated.')
+            value = bytes(data[position:position + size])
+            return (value.decode() if tag == 115 else value), position + size
+        case 108 | 109 if depth >= MAX_DEPTH:  # l, m
+            raise ProtocolError(f'The value is nested deeper than {MAX_DEPTH}.')
+        case 108:  # l
+            count = _length.unpack_from(data, position)[0]
+            position += 4
+            items = []
+            for _ in range(count):
+                item, position = _decode(data, position, depth + 1)
+                items.append(item)
+            return items, position
+        case 109:  # m
+            count = _length.unpack_from(data, position)[0]
+            position += 4
+            mapping = {}
+            for _ in range(count):
+                key, position = _decode(data, position, depth + 1)
+                mapping[key], position = _decode(data, position, depth + 1)
+            return mapping, position
+        case _:
+            raise ProtocolError(f'Unknown tag {tag} at {position - 1}.')
+
+
+def decode(data: bytes) -> Any:
+    """Decode the value encoded by the encode function.
+
+    :raise ProtocolError: If the data is malformed."""
+    view = memoryview(data)
+    try:
+        value, position = _decode(view, 0)
+    # TypeError is raised by the keys of maps which are lists or maps
+    except (IndexError, ValueError, TypeError, StructError) as e:
+        raise ProtocolError(f'The data is malformed: {e}') from None
+    if position != len(view):
+        raise ProtocolError('There is extra data after the value.')
+
+    return value
+
+
+def pack_frame(kind: int, request_id: int, value: Any) -> bytes:
+    """Return the frame which carries the value."""
+    body = encode(value)
+    return _header.pack(len(body) + 5, kind, request_id) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[int, int, Any]:
+    """Read the next frame.
+
+    :return: The kind, the request ID and the value of the frame.
+
+    :raise asyncio.IncompleteReadError: If the connection is closed.
+    :raise ProtocolError: If the frame is malformed."""
+    header = await reader.readexactly(_header.size)
+    length, kind, request_id = _header.unpack(header)
+    if not 5 <= length <= MAX_FRAME_SIZE:
+        raise ProtocolError(f'The frame size {length} is invalid.')
+
+    body = await reader.readexactly(length - 5)
+    return kind, request_id, decode(body)
@@ -0,0 +1,45 @@
+"""The random numbers of game sessions.
+
+Every game is played with its own seed,
+which is recorded in the journal of the game,
+so the same seed, players and cards reproduce the same game:
+the order of the players, the shuffle of the discarded cards
+and the automatic choices.
+
+The sources receive the cards concurrently with the game,
+in the order in which the network answers,
+so they have their own generators derived from the seed
+and do not change the random numbers of the game.
+
+The random numbers which do not change the game,
+like the sampling of traces, do not use the generators,
+so they do not change the games either."""
+import random
+from secrets import randbits
+
+
+def new_seed() -> int:
+    """Return a seed which is unpredictable and different for every call.
+
+    It fits in a signed 64-bit integer, so it can be kept anywhere."""
+    return randbits(63)
+
+
+class Session:
+    """The random numbers of a game session.
+
+    :param seed: The seed of the session.
+    If it is None, then a new seed is generated."""
+
+    def __init__(self, seed: int | None = None) -> None:
+        self.seed: int = new_seed() if seed is None else seed
+        self.game: random.Random = random.Random(self.seed)
+        """The generator of the order of the players, the shuffles
+        of the discarded cards and the automatic choices."""
+        self.sources: random.Random = self.derive('sources')
+        """The generator of the choice of the source of every card."""
+
+    def derive(self, name: str) -> random.Random:
+        """Return a new generator which is derived from the seed and the name,
+        so its random numbers do not change the other generators."""
+        return random.Random(f'{self.seed}:{name}')
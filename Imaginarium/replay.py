@@ -0,0 +1,23 @@
+"""Print the state of a game reconstructed from its journal."""
+import json
+from argparse import ArgumentParser
+from typing import Iterable
+
+from .journal import replay
+
+
+def main(args: Iterable[str] | None = None) -> None:
+    parser = ArgumentParser(
+        prog='python -m Imaginarium.replay',
+        description='Reconstruct the state of a game from its journal.')
+    parser.add_argument('path', help='The file of the journal.')
+    parser.add_argument('-o', '--offset', type=int, default=None,
+                        help='The offset of the last applied event.')
+    options = parser.parse_args(args)
+
+    state = replay(options.path, options.offset)
+    print(json.dumps(state.as_dict(), ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,3 +9,19 @@ included_types: Collection[str] = ('photo',)
 excluded_types: Collection[str] = ()
 card_receiving_timeout: float = 5
 """The time in seconds for which the card can be received."""
+quorum: float | None = None
+"""The part of players after whose choices the rest of the players
+have only quorum_grace_timeout seconds left.
+If it is None, then the time of a step is not shortened."""
+quorum_grace_timeout: float = 15
+"""The time in seconds the rest of the players have
+after the quorum has made the choice."""
+journal_directory: str | None = None
+"""The directory in which the journals of games are kept.
+If it is None, then games are not journaled."""
+statistics_path: str | None = None
+"""The SQLite file in which the statistics of players are kept.
+If it is None, then the statistics are not kept."""
+seed: int | None = None
+"""The seed of the random numbers of games.
+If it is None, then every game gets a new seed."""
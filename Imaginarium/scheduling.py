@@ -0,0 +1,121 @@
+import asyncio
+from heapq import heappush, heappop
+from itertools import count
+from typing import MutableSequence
+
+
+class _Entry:
+    """A deadline in the heap of the scheduler."""
+    __slots__ = ('when', 'order', 'deadline', 'active')
+
+    def __init__(self, when: float, order: int, deadline: asyncio.Future) -> None:
+        self.when = when
+        self.order = order
+        self.deadline = deadline
+        self.active = True
+
+    def __lt__(self, other: '_Entry') -> bool:
+        return (self.when, self.order) < (other.when, other.order)
+
+
+class DeadlineScheduler:
+    """Resolves deadlines of game phases using a single timer.
+
+    Deadlines are kept in a heap,
+    and only the earliest one has a timer in the event loop,
+    so the count of timers does not depend on
+    the count of players waiting for the deadlines."""
+
+    def __init__(self) -> None:
+        self._entries: MutableSequence[_Entry] = []
+        self._active_entries: dict[asyncio.Future, _Entry] = {}
+        self._orders = count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        """Return the count of deadlines that have not been resolved yet."""
+        return len(self._active_entries)
+
+    def schedule(self, delay: float) -> asyncio.Future:
+        """Create a deadline.
+
+        :param delay: The time in seconds after which the deadline comes.
+
+        :return: A future which result is set to None when the deadline comes.
+        Everyone who waits for the deadline can wait for the same future."""
+        deadline = asyncio.get_running_loop().create_future()
+        self._push(deadline, delay)
+
+        return deadline
+
+    def reschedule(self, deadline: asyncio.Future, delay: float) -> None:
+        """Move the deadline that has not come yet.
+
+        :param deadline: The future returned by the schedule method.
+        :param delay: The time in seconds from now after which
+        the deadline comes."""
+        entry = self._active_entries.get(deadline)
+        if entry is not None:
+            entry.active = False
+            self._push(deadline, delay)
+
+    def cancel(self, deadline: asyncio.Future | None) -> None:
+        """Cancel the deadline if it has not come yet.
+
+        :param deadline: The future returned by the schedule method."""
+        entry = self._active_entries.pop(deadline, None)
+        if entry is not None:
+            entry.active = False
+            deadline.cancel()
+            self._arm()
+
+    def remaining(self, deadline: asyncio.Future) -> float:
+        """Return the time in seconds left before the deadline."""
+        entry = self._active_entries.get(deadline)
+        if entry is None:
+            return 0
+        return max(entry.when - asyncio.get_running_loop().time(), 0)
+
+    def _push(self, deadline: asyncio.Future, delay: float) -> None:
+        entry = _Entry(asyncio.get_running_loop().time() + delay,
+                       next(self._orders),
+                       deadline)
+        heappush(self._entries, entry)
+        self._active_entries[deadline] = entry
+        self._arm()
+
+    def _arm(self) -> None:
+        """Schedule the timer for the earliest active deadline."""
+        # Forget the moved and cancelled deadlines
+        while self._entries and not self._entries[0].active:
+            heappop(self._entries)
+
+        if not self._entries:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            return
+
+        when = self._entries[0].when
+        if self._timer is None or self._timer.when() != when:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = asyncio.get_running_loop().call_at(
+                when, self._fire, when)
+
+    def _fire(self, when: float) -> None:
+        """Resolve all the deadlines that have come in one sweep.
+
+        :param when: The time the timer was scheduled for."""
+        self._timer = None
+        # The loop can call the timer a bit earlier than it was scheduled
+        now = max(asyncio.get_running_loop().time(), when)
+        while self._entries and self._entries[0].when <= now:
+            entry = heappop(self._entries)
+            if entry.active:
+                entry.active = False
+                del self._active_entries[entry.deadline]
+                if not entry.deadline.done():
+                    entry.deadline.set_result(None)
+
+        self._arm()
@@ -0,0 +1,93 @@
+from typing import (
+    NamedTuple,
+    Sequence
+)
+
+import numpy as np
+
+NO_CARD: int = -1
+"""The vote of a player who did not vote in a round."""
+BOT_OWNER: int = -1
+"""The owner of a card that was discarded by the bot."""
+NO_OWNER: int = -2
+"""The owner of a missing card that is used to align rounds."""
+
+_bot_score_deltas = np.array((3, 1, 0))
+"""The bot's score in two-person mode by the votes for its card."""
+_players_score_deltas = np.array((0, 1, 2))
+"""The players' score in two-person mode by the votes for the bot's card."""
+
+
+class ScoreDeltas(NamedTuple):
+    """The points received in rounds.
+
+    :param players: The points of each player in each round.
+    :param bot: The bot's points in each round in two-person mode.
+    :param players_team: The players' points in each round
+    in two-person mode."""
+    players: np.ndarray
+    bot: np.ndarray
+    players_team: np.ndarray
+
+
+def count_score_deltas(votes: Sequence[Sequence[int]] | np.ndarray,
+                       owners: Sequence[Sequence[int]] | np.ndarray,
+                       leaders: Sequence[int] | np.ndarray,
+                       players_counts: Sequence[int] | np.ndarray) -> ScoreDeltas:
+    """Count the points received by players in a batch of rounds at once.
+
+    Every round is a row of the arrays, so rounds of different games
+    can be counted together if they are aligned to the same size.
+
+    :param votes: The indexes of the discarded cards each player voted for.
+    The index is NO_CARD if the player did not vote.
+    :param owners: The indexes of the players who discarded each card.
+    The index is BOT_OWNER if the card was discarded by the bot
+    and NO_OWNER if there is no such card in the round.
+    :param leaders: The index of the leader of each round.
+    :param players_counts: The count of players in each round.
+
+    :return: The points received by the players and the bot.
+
+    .. note:: The rules are the same as in the game:
+    in two-person mode only the votes for the bot's card matter,
+    otherwise if nobody has guessed the leader's card,
+    the players receive a point for each vote for their cards,
+    and if somebody has guessed it,
+    the leader and the guessed players receive 3 points."""
+    votes = np.atleast_2d(np.asarray(votes, dtype=np.intp))
+    owners = np.atleast_2d(np.asarray(owners, dtype=np.intp))
+    leaders = np.asarray(leaders, dtype=np.intp).reshape(-1)
+    players_counts = np.asarray(players_counts, dtype=np.intp).reshape(-1)
+    rounds_count, players_count = votes.shape
+
+    # Replace the votes with the owners of the voted cards
+    is_voted = (votes >= 0) & (votes < owners.shape[1])
+    voted_owners = np.take_along_axis(
+        owners, np.where(is_voted, votes, 0), axis=1)
+    voted_owners = np.where(is_voted, voted_owners, NO_OWNER)
+
+    players_indexes = np.arange(players_count)
+    votes_for_players = (voted_owners[:, :, np.newaxis] ==
+                         players_indexes).sum(axis=1)
+    leaders_votes = votes_for_players[np.arange(rounds_count), leaders]
+
+    is_leader = players_indexes == leaders[:, np.newaxis]
+    has_guessed = (voted_owners == leaders[:, np.newaxis]) & ~is_leader
+    leader_points = (3 * is_leader *
+                     (leaders_votes != players_counts)[:, np.newaxis])
+    players_deltas = np.where((leaders_votes == 0)[:, np.newaxis],
+                              votes_for_players,
+                              leader_points + 3 * has_guessed)
+
+    # Count the points of two-person mode
+    is_two_person = players_counts == 2
+    bot_votes = (voted_owners == BOT_OWNER).sum(axis=1)
+    is_counted = is_two_person & (bot_votes < len(_bot_score_deltas))
+    bot_votes = np.minimum(bot_votes, len(_bot_score_deltas) - 1)
+    bot_deltas = np.where(is_counted, _bot_score_deltas[bot_votes], 0)
+    players_team_deltas = np.where(is_counted,
+                                   _players_score_deltas[bot_votes], 0)
+    players_deltas = np.where(is_two_person[:, np.newaxis], 0, players_deltas)
+
+    return ScoreDeltas(players_deltas, bot_deltas, players_team_deltas)
@@ -0,0 +1,40 @@
+"""Run the engine as a service for frontend processes."""
+import asyncio
+from argparse import ArgumentParser
+from typing import Iterable
+
+from . import setting_up_game
+from .service import EngineService
+
+
+async def serve(path: str) -> None:
+    service = EngineService()
+    await service.start(path)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(args: Iterable[str] | None = None) -> None:
+    parser = ArgumentParser(
+        prog='python -m Imaginarium.serve',
+        description='Serve the operations of the game over a Unix domain socket.')
+    parser.add_argument('-s', '--socket', default='imaginarium.sock',
+                        help='The path of the socket.')
+    parser.add_argument('--journals', default=None,
+                        help='The directory in which the journals of games are kept.')
+    parser.add_argument('--statistics', default=None,
+                        help='The SQLite file in which the statistics of players are kept.')
+    options = parser.parse_args(args)
+
+    setting_up_game.set_journal_directory(options.journals)
+    setting_up_game.set_statistics_path(options.statistics)
+    try:
+        asyncio.run(serve(options.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
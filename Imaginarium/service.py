@@ -0,0 +1,660 @@
+"""The engine as a service shared by several frontend processes.
+
+The service runs the game in its own process and serves its operations
+over a Unix domain socket with the protocol of the protocol module,
+so the frontends share the sources, the cards received in advance
+and the rate limits of the APIs instead of having their own ones::
+
+    python -m Imaginarium.serve --socket /tmp/imaginarium.sock
+
+A frontend calls the operations by EngineClient
+and receives the events of the game if it has subscribed to them.
+When the game requests choices, the players make them
+by the set_association, discard and vote operations
+before the deadline of the phase.
+The choices of the players who are late are made randomly.
+
+.. note:: The game is kept in GameCondition,
+so the service plays one game at a time for all the frontends,
+and the start of another game is rejected until the game ends.
+None of the frontends of the project uses the service yet."""
+import asyncio
+import inspect
+from itertools import count
+from os import PathLike
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    MutableMapping,
+    TypeAlias
+)
+
+from . import exceptions
+from . import gameplay
+from . import protocol
+from . import setting_up_game
+from . import timings
+from . import tracing
+from .card import Card, DiscardedCard
+from .gameplay import GameCondition, Player
+
+Operation: TypeAlias = Callable[..., Any]
+
+operations: dict[str, Operation] = {}
+"""The operations of the service by their names."""
+subscribers: set[asyncio.StreamWriter] = set()
+"""The connections of the frontends that receive the events of the game."""
+max_subscriber_buffer: int = 4 * 1024 * 1024
+"""The size of unsent events in bytes
+after which a frontend is disconnected as too slow."""
+
+_requested_choice: str | None = None
+"""The kind of the choices the game is waiting for."""
+_choices_made: asyncio.Future | None = None
+"""The future which is resolved when all the players have made the choice."""
+
+
+def operation(function: Operation) -> Operation:
+    """Register the function as the operation with the same name."""
+    operations[function.__name__] = function
+    return function
+
+
+def publish(event: str, data: Any = None) -> None:
+    """Send the event to all the subscribed frontends
+    without waiting for them.
+
+    :param event: The name of the event.
+    :param data: The details of the event."""
+    if not subscribers:
+        return
+
+    frame = protocol.pack_frame(protocol.EVENT, 0, [event, data])
+    for writer in tuple(subscribers):
+        if writer.transport.get_write_buffer_size() > max_subscriber_buffer:
+            subscribers.discard(writer)
+            writer.close()
+        else:
+            writer.write(frame)
+
+
+def encode_card(card: Card) -> list[str | None]:
+    return [card.url, card.source, card.type]
+
+
+def get_player(player_id: int) -> Player:
+    """Return the player of the game by the ID.
+
+    :raise PlayerAlreadyLeft: If the player is not in the game."""
+    player = GameCondition._players.get(player_id)
+    if player is None:
+        raise exceptions.PlayerAlreadyLeft(player_id)
+    return player
+
+
+# Setting up the game
+@operation
+def ping() -> None:
+    """Do nothing, which measures the latency of the service."""
+
+
+@operation
+def join(player_id: int, name: str | None = None) -> None:
+    gameplay.join(Player(player_id, name))
+
+
+@operation
+def leave(player_id: int) -> None:
+    gameplay.leave(player_id)
+
+
+@operation
+def shuffle_players_order() -> None:
+    setting_up_game.shuffle_players_order()
+
+
+@operation
+async def add_used_source(link: str) -> None:
+    await setting_up_game.add_used_source(link)
+
+
+@operation
+def remove_used_source(link: str) -> None:
+    for source in GameCondition._used_sources:
+        if str(source) == link:
+            setting_up_game.remove_used_source(source)
+            return
+    raise exceptions.InvalidSource(f'The "{link}" source is not used.')
+
+
+@operation
+def set_winning_score(score: float) -> None:
+    setting_up_game.set_winning_score(score)
+
+
+@operation
+def set_step_timeout(minutes: float) -> None:
+    setting_up_game.set_step_timeout(minutes)
+
+
+@operation
+def set_quorum(quorum: float | None, grace_minutes: float = None) -> None:
+    setting_up_game.set_quorum(quorum, grace_minutes)
+
+
+@operation
+def set_seed(seed: int | None) -> None:
+    setting_up_game.set_seed(seed)
+
+
+# Cards
+@operation
+def prefetch_cards(cards_count: int) -> None:
+    """Start receiving the cards in advance."""
+    gameplay.prefetch_cards(cards_count)
+
+
+@operation
+async def take_cards(cards_count: int) -> list[list[str | None]]:
+    """Take the cards received in advance and receive the missing ones.
+
+    :return: The URLs, the sources and the types of the cards."""
+    return [encode_card(card)
+            for card in await gameplay.take_cards(cards_count)]
+
+
+# Getting information
+@operation
+def get_state() -> dict[str, Any]:
+    """Return the state of the game which frontends show."""
+    phase = GameCondition._phase
+    leader = GameCondition._leader
+    return {
+        'started': bool(GameCondition._game_started),
+        'seed': GameCondition._seed,
+        'circle': GameCondition._circle_num,
+        'round': GameCondition._round_num,
+        'leader': None if leader is None else leader.id,
+        'association': GameCondition._round_association,
+        'players': [{'id': player.id,
+                     'name': player.name,
+                     'score': player.score,
+                     'cards': [card.url for card in player.cards]}
+                    for player in GameCondition._players],
+        'discarded_cards': [[card.url, owner] for card, owner
+                            in GameCondition._discarded_cards or ()],
+        'bot_score': GameCondition._bot_score,
+        'players_score': GameCondition._players_score,
+        'phase': None if phase is None else [phase.answered_count,
+                                             phase.players_count]}
+
+
+@operation
+def get_players() -> list[list[int | str]]:
+    return [[player.id, player.name] for player in GameCondition._players]
+
+
+@operation
+def get_used_sources() -> list[str]:
+    return [str(source) for source in GameCondition._used_sources]
+
+
+@operation
+def get_phase_progress() -> list[int] | None:
+    """Return the count of the players who have made the choice
+    and the count of all the players of the phase,
+    or None if players are not making choices."""
+    phase = GameCondition._phase
+    if phase is None:
+        return None
+    return [phase.answered_count, phase.players_count]
+
+
+@operation
+async def get_leaderboard(limit: int = 10) -> list[dict[str, Any]]:
+    statistics = gameplay.get_statistics()
+    if statistics is None:
+        return []
+    return [{**player._asdict(),
+             'guess_accuracy': player.guess_accuracy,
+             'average_decision_time': player.average_decision_time}
+            for player in await statistics.get_leaderboard(limit)]
+
+
+@operation
+def get_timings(overall: bool = False) -> dict[str, dict[str, Any]]:
+    return (timings.overall if overall else timings.session).as_dict()
+
+
+@operation
+def get_sources_summaries() -> dict[str, dict[str, Any]]:
+    return tracing.get_summaries()
+
+
+# Playing the game
+def _notification_hook(event: str) -> Callable[[], Any]:
+    async def hook() -> None:
+        publish(event, get_state())
+
+    return hook
+
+
+async def _show_phase_progress_hook() -> None:
+    publish('phase_progress', get_phase_progress())
+
+
+def _request_hook(choice: str,
+                  choose_automatically: Callable[[Player], None]
+                  ) -> Callable[[], Any]:
+    """Return the hook that requests the choices from the frontends
+    and waits until they are made or the time of the phase is up.
+
+    :param choice: The kind of the choices.
+    :param choose_automatically: The function that makes the choice
+    for a player who has not made it in time."""
+
+    async def hook() -> None:
+        global _requested_choice, _choices_made
+
+        phase = GameCondition._phase
+        _requested_choice = choice
+        _choices_made = asyncio.get_running_loop().create_future()
+        publish(f'request_{choice}', {
+            'players': list(phase.pending),
+            'timeout': GameCondition._deadlines.remaining(phase.deadline),
+            'state': get_state()})
+        try:
+            if phase.pending:
+                await asyncio.wait((_choices_made, phase.deadline),
+                                   return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            _requested_choice = None
+            _choices_made = None
+
+        for player_id in tuple(phase.pending):
+            player = GameCondition._players.get(player_id)
+            if player is not None:
+                choose_automatically(player)
+
+    return hook
+
+
+def _check_choice(choices: Iterable[str], player_id: int) -> Player:
+    """Return the player if the game is waiting for the player's choice.
+
+    :raise ChoiceIsNotExpected: If it is not."""
+    phase = GameCondition._phase
+    if (_requested_choice not in choices or phase is None or
+            player_id not in phase.pending):
+        raise exceptions.ChoiceIsNotExpected
+    return get_player(player_id)
+
+
+def _answer(player: Player) -> None:
+    gameplay.mark_answered(player)
+    if GameCondition._phase.is_completed and not _choices_made.done():
+        _choices_made.set_result(None)
+
+
+def _discarded_by(player: Player) -> list[Card]:
+    return [card for card, owner in GameCondition._discarded_cards
+            if owner == player.id]
+
+
+def _discard(player: Player, number: int) -> bool:
+    """Discard the player's card.
+
+    :return: Whether the player has discarded all the cards of the phase."""
+    if GameCondition._players_count == 2:
+        # The hand is replaced in the next round, so both cards stay in it
+        card = player.cards[number - 1]
+        discarded = _discarded_by(player)
+        if card in discarded:
+            raise exceptions.ChoiceIsNotExpected(
+                'The card has already been discarded.')
+        GameCondition._discarded_cards.append(DiscardedCard(card, player.id))
+        return len(discarded) == 1
+    else:
+        GameCondition._discarded_cards.append(
+            DiscardedCard(player.cards.pop(number - 1), player.id))
+        return True
+
+
+def _vote(player: Player, number: int) -> None:
+    owner = GameCondition._discarded_cards[number - 1].owner
+    GameCondition._votes_for_card[owner] += 1
+    player.chosen_card = number
+
+
+@operation
+def set_association(player_id: int, association: str) -> None:
+    """Set the association of the round as the leader.
+
+    :raise ChoiceIsNotExpected: If the player is not the leader
+    or the association is not requested."""
+    player = _check_choice(('association',), player_id)
+    GameCondition._round_association = association
+    _answer(player)
+
+
+@operation
+def discard(player_id: int, number: int) -> None:
+    """Discard the player's card.
+
+    :param number: The number of the card in the player's hand from 1.
+
+    :raise ChoiceIsNotExpected: If the cards are not requested
+    from the player or the number is invalid."""
+    player = _check_choice(('leader_card', 'players_cards'), player_id)
+    if not 1 <= number <= len(player.cards):
+        raise exceptions.ChoiceIsNotExpected(f'There is no card {number}.')
+    if _discard(player, number):
+        _answer(player)
+
+
+@operation
+def vote(player_id: int, number: int) -> None:
+    """Vote for the discarded card.
+
+    :param number: The number of the discarded card from 1.
+
+    :raise ChoiceIsNotExpected: If the vote is not requested
+    from the player or the number is invalid."""
+    player = _check_choice(('vote',), player_id)
+    if not 1 <= number <= len(GameCondition._discarded_cards):
+        raise exceptions.ChoiceIsNotExpected(f'There is no card {number}.')
+    if GameCondition._discarded_cards[number - 1].owner == player.id:
+        raise exceptions.ChoiceIsNotExpected(
+            'You cannot vote for your own card.')
+    _vote(player, number)
+    _answer(player)
+
+
+def _associate_automatically(player: Player) -> None:
+    GameCondition._round_association = r'¯\_(ツ)_/¯'
+
+
+def _discard_automatically(player: Player) -> None:
+    _discard(player, GameCondition._random.game.randrange(len(player.cards)) + 1)
+
+
+def _vote_automatically(player: Player) -> None:
+    _vote(player, GameCondition._random.game.choice(
+        [number for number, (_, owner)
+         in enumerate(GameCondition._discarded_cards, start=1)
+         if owner != player.id]))
+
+
+def _discard_2_automatically(player: Player) -> None:
+    # The player may have discarded one of the two cards in time
+    for _ in range(2 - len(_discarded_by(player))):
+        card = GameCondition._random.game.choice(
+            [card for card in player.cards
+             if card not in _discarded_by(player)])
+        GameCondition._discarded_cards.append(DiscardedCard(card, player.id))
+
+
+hooks: MutableMapping[str, Callable[[], Any]] = {
+    'at_start_hook': _notification_hook('game_started'),
+    'at_circle_start_hook': _notification_hook('circle_started'),
+    'at_round_start_hook': _notification_hook('round_started'),
+    'request_association_hook': _request_hook(
+        'association', _associate_automatically),
+    'show_association_hook': _notification_hook('association_shown'),
+    'request_players_cards_2_hook': _request_hook(
+        'players_cards', _discard_2_automatically),
+    'request_leader_card_hook': _request_hook(
+        'leader_card', _discard_automatically),
+    'request_players_cards_hook': _request_hook(
+        'players_cards', _discard_automatically),
+    'show_players_cards_hook': _notification_hook('players_cards_shown'),
+    'show_discarded_cards_hook': _notification_hook('discarded_cards_shown'),
+    'vote_for_target_card_2_hook': _request_hook(
+        'vote', _vote_automatically),
+    'vote_for_target_card_hook': _request_hook(
+        'vote', _vote_automatically),
+    'at_round_end_hook': _notification_hook('round_ended'),
+    'at_circle_end_hook': _notification_hook('circle_ended'),
+    'at_end_hook': _notification_hook('game_ended'),
+    'show_phase_progress_hook': _show_phase_progress_hook,
+}
+"""The hooks of the game which publish its events to the frontends."""
+
+
+@operation
+def start_game() -> Awaitable[None]:
+    """Play the game.
+
+    :return: When the game has ended.
+
+    :raise GameIsStarted: If the service is already playing a game,
+    which is checked at once so the frontend does not wait for it."""
+    if GameCondition._game_started:
+        raise exceptions.GameIsStarted(
+            'The service plays one game at a time, '
+            'and the current game has not ended yet.')
+    return gameplay.start_game(**hooks)
+
+
+@operation
+def end_game() -> None:
+    gameplay.end_game()
+
+
+class EngineService:
+    """The server of the operations over a Unix domain socket."""
+
+    def __init__(self) -> None:
+        self._server: asyncio.AbstractServer | None = None
+        self._calls: set[asyncio.Task] = set()
+        self._clients: dict[asyncio.StreamWriter, asyncio.Task] = {}
+        """The connections of the frontends and the tasks serving them."""
+
+    async def start(self, path: str | PathLike) -> None:
+        """Start serving the operations at the path of the socket."""
+        self._server = await asyncio.start_unix_server(self._serve_client, path)
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting the frontends and cancel the unfinished calls."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for call in tuple(self._calls):
+            call.cancel()
+        clients = tuple(self._clients.values())
+        for writer in tuple(self._clients):
+            writer.close()
+        await asyncio.gather(*clients, return_exceptions=True)
+
+    async def _serve_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                kind, request_id, body = await protocol.read_frame(reader)
+                if kind != protocol.CALL:
+                    raise protocol.ProtocolError(f'Unexpected frame {kind}.')
+                name, args = body
+                self._call(writer, request_id, name, args)
+        except (asyncio.IncompleteReadError, ConnectionError,
+                protocol.ProtocolError, ValueError, TypeError):
+            pass
+        finally:
+            subscribers.discard(writer)
+            del self._clients[writer]
+            writer.close()
+
+    def _call(self, writer: asyncio.StreamWriter,
+              request_id: int, name: str, args: list) -> None:
+        """Call the operation and send its result.
+
+        The operations that do not wait are answered immediately,
+        in the order of the calls, and the waiting ones in background."""
+        if name == 'subscribe':
+            subscribers.add(writer)
+            self._respond(writer, request_id, None)
+            return
+
+        function = operations.get(name)
+        if function is None:
+            self._fail(writer, request_id,
+                       LookupError(f'There is no "{name}" operation.'))
+            return
+
+        try:
+            result = function(*args)
+        except Exception as e:
+            self._fail(writer, request_id, e)
+            return
+
+        if inspect.isawaitable(result):
+            call = asyncio.create_task(
+                self._finish_call(writer, request_id, result))
+            self._calls.add(call)
+            call.add_done_callback(self._calls.discard)
+        else:
+            self._respond(writer, request_id, result)
+
+    async def _finish_call(self, writer: asyncio.StreamWriter,
+                           request_id: int, result) -> None:
+        try:
+            result = await result
+        except Exception as e:
+            self._fail(writer, request_id, e)
+        else:
+            self._respond(writer, request_id, result)
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter,
+                 request_id: int, result: Any) -> None:
+        if writer.is_closing():
+            return
+        try:
+            frame = protocol.pack_frame(protocol.RESULT, request_id, result)
+        except protocol.ProtocolError as e:
+            frame = protocol.pack_frame(protocol.ERROR, request_id,
+                                        [type(e).__name__, str(e)])
+        writer.write(frame)
+
+    @staticmethod
+    def _fail(writer: asyncio.StreamWriter,
+              request_id: int, error: Exception) -> None:
+        if not writer.is_closing():
+            writer.write(protocol.pack_frame(
+                protocol.ERROR, request_id, [type(error).__name__, str(error)]))
+
+
+class ServiceError(Exception):
+    """An error of the service which is not an error of the game.
+
+    :param name: The name of the exception raised in the service."""
+
+    def __init__(self, name: str, message: str) -> None:
+        self.name = name
+        super().__init__(f'{name}: {message}')
+
+
+def _remote_exception(name: str, message: str) -> Exception:
+    """Return the exception of the game with the name
+    or ServiceError if there is no such exception."""
+    cls = getattr(exceptions, name, None)
+    if isinstance(cls, type) and issubclass(cls, exceptions.ImaginariumException):
+        # The constructors of the exceptions build their own messages
+        error = cls.__new__(cls)
+        Exception.__init__(error, message)
+        return error
+    return ServiceError(name, message)
+
+
+class EngineClient:
+    """The connection of a frontend to the service::
+
+        client = await EngineClient.connect('/tmp/imaginarium.sock')
+        await client.call('join', 42, 'Alice')
+        await client.subscribe()
+        async for event, data in client.events():
+            ..."""
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._request_ids = count(1)
+        self._calls: dict[int, asyncio.Future] = {}
+        self._events: asyncio.Queue[tuple[str, Any] | None] = asyncio.Queue()
+        """The received events, which end with None
+        when the connection is lost."""
+        self._receiving = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, path: str | PathLike) -> 'EngineClient':
+        """Connect to the service listening at the path of the socket."""
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def call(self, operation_name: str, *args) -> Any:
+        """Call the operation of the service and return its result.
+
+        :raise ImaginariumException: If the game raised the exception.
+        :raise ServiceError: If the service failed otherwise.
+        :raise ConnectionError: If the connection is lost."""
+        if self._receiving.done():
+            raise ConnectionError('The connection to the service is closed.')
+
+        request_id = next(self._request_ids) & 0xFFFFFFFF
+        future = self._calls[request_id] = \
+            asyncio.get_running_loop().create_future()
+        try:
+            self._writer.write(protocol.pack_frame(
+                protocol.CALL, request_id, [operation_name, list(args)]))
+            return await future
+        finally:
+            self._calls.pop(request_id, None)
+
+    async def subscribe(self) -> None:
+        """Receive the events of the game."""
+        await self.call('subscribe')
+
+    async def events(self) -> AsyncIterator[tuple[str, Any]]:
+        """Iterate over the names and the details of the events
+        until the connection is lost."""
+        while (event := await self._events.get()) is not None:
+            yield event
+
+    async def close(self) -> None:
+        self._writer.close()
+        self._receiving.cancel()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                kind, request_id, body = await protocol.read_frame(self._reader)
+                if kind == protocol.EVENT:
+                    self._events.put_nowait(tuple(body))
+                    continue
+
+                future = self._calls.get(request_id)
+                if future is None or future.done():
+                    continue
+                if kind == protocol.RESULT:
+                    future.set_result(body)
+                else:
+                    future.set_exception(_remote_exception(*body))
+        except (asyncio.IncompleteReadError, ConnectionError,
+                protocol.ProtocolError):
+            pass
+        finally:
+            self._events.put_nowait(None)
+            for future in self._calls.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(
+                        'The connection to the service is lost.'))
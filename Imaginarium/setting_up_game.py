@@ -1,5 +1,3 @@
-from random import shuffle
-
 from .gameplay import GameCondition
 
 from . import sources
@@ -18,6 +16,47 @@ def set_step_timeout(minutes: float) -> None:
     rules_setup.step_timeout = minutes * 60
 
 
+def set_quorum(quorum: float | None, grace_minutes: float = None) -> None:
+    """Set the part of players after whose choices
+    the step is shortened for the rest of the players.
+
+    :param quorum: The part of players from 0 to 1,
+    or None to not shorten steps.
+    :param grace_minutes: Time the rest of the players have
+    after the quorum has made the choice."""
+    rules_setup.quorum = quorum
+    if grace_minutes is not None:
+        rules_setup.quorum_grace_timeout = grace_minutes * 60
+
+
+def set_journal_directory(directory: str | None) -> None:
+    """Set the directory in which the journals of games are kept.
+
+    :param directory: The path to the directory,
+    or None to not journal games."""
+    rules_setup.journal_directory = directory
+
+
+def set_statistics_path(path: str | None) -> None:
+    """Set the SQLite file in which the statistics of players are kept.
+
+    :param path: The path to the file,
+    or None to not keep the statistics."""
+    rules_setup.statistics_path = path
+
+
+def set_seed(seed: int | None) -> None:
+    """Set the seed of the random numbers of games,
+    so the games with the same players and cards are the same.
+
+    The order of players shuffled after that is reproduced as well.
+
+    :param seed: The seed, or None to play every game with a new seed."""
+    rules_setup.seed = seed
+    if seed is not None:
+        gameplay.start_random_session(seed)
+
+
 def reset_used_cards() -> None:
     """Reset cards that were used in the game."""
     GameCondition._used_cards = set()
@@ -34,6 +73,7 @@ async def add_used_source(source: str) -> None:
     :raises InvalidSource: If the source is invalid for some reason."""
     source = gameplay.create_source_object(source)
     if await source.is_valid():
+        gameplay.seed_source(source)
         GameCondition._used_sources.append(source)
 
 
@@ -49,4 +89,4 @@ def shuffle_players_order() -> None:
     if GameCondition._game_started:
         raise exceptions.GameIsStarted
     else:
-        shuffle(GameCondition._players)
+        GameCondition._players.shuffle()
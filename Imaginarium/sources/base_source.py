@@ -1,10 +1,12 @@
 import abc
+import random
 from typing import (
     Collection,
     Any
 )
 
 from .. import rules_setup
+from ..card import Card
 
 
 class BaseSource(abc.ABC):
@@ -24,6 +26,9 @@ class BaseSource(abc.ABC):
         self._link: str = link
         self._included_types: Collection = included_types
         self._excluded_types: Collection = excluded_types
+        self.rng: random.Random = random.Random()
+        """The random numbers of the cards of the source,
+        which the game derives from its seed."""
 
     def __eq__(self, other: Any) -> bool:
         try:
@@ -61,7 +66,7 @@ class BaseSource(abc.ABC):
         .. note:: The source is invalid if it does not exist or is closed."""
 
     @abc.abstractmethod
-    async def get_random_card(self) -> str:
+    async def get_random_card(self) -> Card:
         """Get a random card from the source if it is available
         and the type of the card is not excluded.
 
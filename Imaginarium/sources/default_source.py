@@ -4,6 +4,8 @@ import aiohttp
 
 from . import BaseSource
 from .. import rules_setup
+from .. import tracing
+from ..card import Card
 
 
 class DefaultSource(BaseSource):
@@ -22,11 +24,13 @@ class DefaultSource(BaseSource):
     async def is_valid(self) -> True:
         return True
 
-    async def get_random_card(self) -> str:
+    async def get_random_card(self) -> Card:
         """Return a random image from the site: https://api.rand.by/image
 
-        :return: Link to an image."""
+        :return: A card with an image."""
         async with aiohttp.ClientSession() as session:
             async with session.get(self._link) as response:
                 response_json = await response.json()
-                return response_json['urls']['raw']
+                # The body has already been read, so it is not read again
+                tracing.count_api_call(len(await response.read()))
+                return Card(response_json['urls']['raw'], self._link, 'photo')
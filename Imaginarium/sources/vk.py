@@ -1,5 +1,5 @@
+import json
 from asyncio import sleep
-from random import randrange, shuffle
 from os import environ
 from typing import (
     Mapping,
@@ -16,6 +16,9 @@ from aiovk2.exceptions import VkException
 from aiovk2.api import Request
 
 from . import BaseSource
+from .. import metrics
+from .. import tracing
+from ..card import Card
 from ..exceptions import InvalidSource, NoAnyCards
 
 load_dotenv()
@@ -42,6 +45,7 @@ async def async_handle_vk_exception(func: Callable[[None], Awaitable[Any]]) \
     except VkException as e:
         match e.args[0]['error_code']:
             case 6:
+                metrics.vk_rate_limits.inc()
                 await sleep(1)
                 return await async_handle_vk_exception(func)
             case _:
@@ -72,10 +76,12 @@ class VkRequest(Request):
 
         :raise InvalidSource: If the VkException has occurred."""
         try:
-            return await super().__call__(**method_args)
+            response = await super().__call__(**method_args)
         except VkException as e:
+            tracing.count_api_call()
             match e.args[0]['error_code']:
                 case 6:
+                    metrics.vk_rate_limits.inc()
                     await sleep(1)
                     return await self.__call__(**method_args)
                 case _:
@@ -83,6 +89,12 @@ class VkRequest(Request):
                         f'The source is unavailable due to the Vk API side issues.'
                     ) from e
 
+        # The response is measured only if the card is traced
+        if tracing.current() is not None:
+            tracing.count_api_call(len(json.dumps(response).encode()))
+
+        return response
+
 
 class VkAPI(aiovk2.API):
     """A subclass which overrides the Request class methods."""
@@ -137,11 +149,11 @@ class Vk(BaseSource):
 
         return True
 
-    async def get_random_card(self) -> str:
+    async def get_random_card(self) -> Card:
         """Return a random post from the specified group
         and extract its random suitable attachment.
 
-        :return: Link to the attachment.
+        :return: A card with the attachment.
 
         :raises NoAnyCards: If there are no posts in the specified group.
 
@@ -182,8 +194,9 @@ class Vk(BaseSource):
         await self.is_valid()
 
         # Get a random post from the specified group
+        offset = self.rng.randrange(await self.get_cards_count())
         post = await vk_api.wall.get(domain=self._domain,
-                                     offset=randrange(await self.get_cards_count()),
+                                     offset=offset,
                                      count=1)
 
         try:
@@ -192,10 +205,11 @@ class Vk(BaseSource):
         # so the error will never be raised,
         # but I'll leave it here just in case.
         except (KeyError, IndexError):
+            tracing.count_attempt()
             return await self.get_random_card()
 
         # Shuffle attachments order to get the first random suitable attachment
-        shuffle(attachments)
+        self.rng.shuffle(attachments)
 
         # Get the first suitable attachment
         for attachment in attachments:
@@ -203,6 +217,9 @@ class Vk(BaseSource):
                 if self._included_types and attachment['type'] not in self._included_types:
                     continue
 
-                return await extract_content_from_attachment(attachment)
+                return Card(await extract_content_from_attachment(attachment),
+                            self._link,
+                            attachment['type'])
 
+        tracing.count_attempt()
         return await self.get_random_card()
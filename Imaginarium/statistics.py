@@ -0,0 +1,204 @@
+"""The statistics of players kept between games.
+
+The statistics are stored in SQLite as aggregates per player,
+which are updated at the end of every round,
+so the size of the store and the time of the leaderboard query
+do not depend on the count of the played rounds."""
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Iterable,
+    MutableSequence,
+    NamedTuple
+)
+
+
+class RoundRecord(NamedTuple):
+    """What a player did in a round.
+
+    :param player_id: The ID of the player.
+    :param name: The name of the player.
+    :param points: The points the player received.
+    :param votes: The count of the player's votes.
+    :param guesses: The count of the player's votes for the target card.
+    :param decisions: The count of the choices the player made in time.
+    :param decision_time: The time in seconds the player spent on them."""
+    player_id: int
+    name: str
+    points: float
+    votes: int
+    guesses: int
+    decisions: int
+    decision_time: float
+
+
+class PlayerStatistics(NamedTuple):
+    """The aggregates of a player over all the games."""
+    player_id: int
+    name: str
+    games: int
+    wins: int
+    rounds: int
+    points: float
+    votes: int
+    guesses: int
+    decisions: int
+    decision_time: float
+
+    @property
+    def guess_accuracy(self) -> float:
+        """The part of the player's votes which were for the target card."""
+        return self.guesses / self.votes if self.votes else 0
+
+    @property
+    def average_decision_time(self) -> float:
+        """The average time in seconds the player spends on a choice."""
+        return self.decision_time / self.decisions if self.decisions else 0
+
+
+_schema = '''
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    points REAL NOT NULL DEFAULT 0,
+    votes INTEGER NOT NULL DEFAULT 0,
+    guesses INTEGER NOT NULL DEFAULT 0,
+    decisions INTEGER NOT NULL DEFAULT 0,
+    decision_time REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS players_by_points ON players (points DESC);
+'''
+
+_record_round_query = '''
+INSERT INTO players (player_id, name, rounds, points,
+                     votes, guesses, decisions, decision_time)
+VALUES (?, ?, 1, ?, ?, ?, ?, ?)
+ON CONFLICT (player_id) DO UPDATE SET
+    name = excluded.name,
+    rounds = rounds + 1,
+    points = points + excluded.points,
+    votes = votes + excluded.votes,
+    guesses = guesses + excluded.guesses,
+    decisions = decisions + excluded.decisions,
+    decision_time = decision_time + excluded.decision_time
+'''
+
+_record_game_query = '''
+UPDATE players SET games = games + 1, wins = wins + ? WHERE player_id = ?
+'''
+
+_leaderboard_query = f'''
+SELECT {', '.join(PlayerStatistics._fields)} FROM players
+ORDER BY points DESC LIMIT ?
+'''
+
+_player_query = f'''
+SELECT {', '.join(PlayerStatistics._fields)} FROM players WHERE player_id = ?
+'''
+
+
+class StatisticsStore:
+    """The SQLite store of the statistics of players.
+
+    All the queries are made in order by a background thread,
+    so the game does not wait for the disk."""
+
+    def __init__(self, path: Path | str) -> None:
+        """Open the store.
+
+        :param path: The file of the database.
+        It is created if it does not exist."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.executescript(_schema)
+        # A single thread keeps the queries in order
+        self._worker = ThreadPoolExecutor(max_workers=1,
+                                          thread_name_prefix='statistics')
+        self._writes: set[asyncio.Future] = set()
+        self._leaderboards: dict[int, MutableSequence[PlayerStatistics]] = {}
+        """The leaderboards by their lengths
+        which were queried after the last update."""
+        self._version: int = 0
+        """The count of the updates."""
+
+    def record_round(self, records: Iterable[RoundRecord]) -> None:
+        """Add the results of a round to the aggregates in the background.
+
+        :param records: What each player did in the round."""
+        self._write(self._record_round, list(records))
+
+    def record_game(self, players_ids: Iterable[int],
+                    winners_ids: Iterable[int]) -> None:
+        """Count the game for the players in the background.
+
+        :param players_ids: The IDs of the players of the game.
+        :param winners_ids: The IDs of the players who won the game."""
+        winners_ids = set(winners_ids)
+        self._write(self._record_game,
+                    [(player_id in winners_ids, player_id)
+                     for player_id in players_ids])
+
+    async def get_leaderboard(self, limit: int = 10) -> \
+            MutableSequence[PlayerStatistics]:
+        """Return the players with the most points.
+
+        The leaderboard is cached until the statistics are updated.
+
+        :param limit: The maximum count of players."""
+        try:
+            return self._leaderboards[limit]
+        except KeyError:
+            version = self._version
+            leaderboard = await self._read(self._query_leaderboard, limit)
+            # Do not cache the leaderboard if it was updated meanwhile
+            if version == self._version:
+                self._leaderboards[limit] = leaderboard
+
+            return leaderboard
+
+    async def get_player(self, player_id: int) -> PlayerStatistics | None:
+        """Return the statistics of the player
+        or None if the player has not played yet."""
+        return await self._read(self._query_player, player_id)
+
+    async def close(self) -> None:
+        """Wait for the updates and close the store."""
+        if self._writes:
+            await asyncio.wait(self._writes)
+        await self._read(self._connection.close)
+        self._worker.shutdown(wait=False)
+
+    def _write(self, func, *args) -> None:
+        self._version += 1
+        self._leaderboards.clear()
+        write = asyncio.get_running_loop().run_in_executor(
+            self._worker, func, *args)
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+    def _read(self, func, *args) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(
+            self._worker, func, *args)
+
+    def _record_round(self, records: Iterable[RoundRecord]) -> None:
+        with self._connection:
+            self._connection.executemany(_record_round_query, records)
+
+    def _record_game(self, games: Iterable[tuple[bool, int]]) -> None:
+        with self._connection:
+            self._connection.executemany(_record_game_query, games)
+
+    def _query_leaderboard(self, limit: int) -> \
+            MutableSequence[PlayerStatistics]:
+        return [PlayerStatistics(*row) for row in
+                self._connection.execute(_leaderboard_query, (limit,))]
+
+    def _query_player(self, player_id: int) -> PlayerStatistics | None:
+        row = self._connection.execute(_player_query, (player_id,)).fetchone()
+        return None if row is None else PlayerStatistics(*row)
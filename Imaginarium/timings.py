@@ -0,0 +1,167 @@
+"""The histograms of the time spent on the phases of games and hooks.
+
+Timings are recorded only if enabled is True.
+Otherwise measure returns a shared context manager that does nothing,
+so the instrumented code costs a function call."""
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Iterator,
+    MutableSequence
+)
+
+enabled: bool = False
+"""Whether the timings are recorded."""
+
+BOUNDS: tuple[float, ...] = tuple(0.0001 * 2 ** i for i in range(25))
+"""The upper bounds of the buckets of histograms in seconds,
+from 0.1 milliseconds to about an hour."""
+
+
+class Histogram:
+    """The distribution of durations in exponential buckets."""
+    __slots__ = ('buckets', 'count', 'total', 'min', 'max')
+
+    def __init__(self) -> None:
+        self.buckets: MutableSequence[int] = [0] * (len(BOUNDS) + 1)
+        """The counts of durations by the buckets.
+        The last bucket contains durations longer than all the bounds."""
+        self.count: int = 0
+        self.total: float = 0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def add(self, seconds: float) -> None:
+        self.buckets[bisect_left(BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket that contains the quantile.
+
+        :param q: The quantile from 0 to 1."""
+        if not self.count:
+            return 0
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BOUNDS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        return {'count': self.count,
+                'total': self.total,
+                'mean': self.mean,
+                'min': self.min,
+                'max': self.max,
+                'p50': self.quantile(0.5),
+                'p90': self.quantile(0.9),
+                'p99': self.quantile(0.99)}
+
+
+class Timings:
+    """The histograms by the names of the measured parts."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[str, Histogram] = {}
+
+    def __getitem__(self, name: str) -> Histogram:
+        return self._histograms[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._histograms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._histograms)
+
+    def __len__(self) -> int:
+        return len(self._histograms)
+
+    def items(self) -> Iterator[tuple[str, Histogram]]:
+        return iter(self._histograms.items())
+
+    def add(self, name: str, seconds: float) -> None:
+        try:
+            histogram = self._histograms[name]
+        except KeyError:
+            histogram = self._histograms[name] = Histogram()
+        histogram.add(seconds)
+
+    def clear(self) -> None:
+        self._histograms.clear()
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        return {name: histogram.as_dict()
+                for name, histogram in self._histograms.items()}
+
+
+session = Timings()
+"""The timings of the current or the last game."""
+overall = Timings()
+"""The timings of all the games since the start."""
+
+
+def record(name: str, seconds: float) -> None:
+    """Add the duration to the session and overall histograms."""
+    session.add(name, seconds)
+    overall.add(name, seconds)
+
+
+class _Measure:
+    __slots__ = ('name', 'started_at')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started_at = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        record(self.name, perf_counter() - self.started_at)
+
+
+_nothing = nullcontext()
+
+
+def measure(name: str) -> ContextManager[None]:
+    """Return a context manager that records the time spent inside it.
+
+    :param name: The name of the histogram."""
+    if enabled:
+        return _Measure(name)
+    return _nothing
+
+
+def timed_hook(hook: Callable[[], Awaitable[None]],
+               name: str) -> Callable[[], Awaitable[None]]:
+    """Return the hook that records the time of each its call,
+    or the same hook if the timings are disabled.
+
+    :param hook: The hook of the game.
+    :param name: The name of the histogram."""
+    if not enabled:
+        return hook
+
+    @wraps(hook)
+    async def inner() -> None:
+        with _Measure(name):
+            await hook()
+
+    return inner
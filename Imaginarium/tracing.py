@@ -0,0 +1,209 @@
+"""The traces of receiving cards from sources.
+
+A part of the card requests, which is set by sample_rate, is traced.
+The trace of a request is kept in a context variable,
+so sources and the tasks they start can count their attempts
+and API calls without passing the trace around.
+The finished traces are aggregated into summaries per source."""
+import asyncio
+import random
+from collections import deque
+from contextvars import ContextVar
+from time import perf_counter
+from typing import (
+    Any,
+    MutableSequence
+)
+
+from . import timings
+
+sample_rate: float = 0
+"""The part of the card requests from 0 to 1 that are traced."""
+recent_traces_count: int = 1000
+"""The count of the last traces that are kept."""
+
+
+class CardTrace:
+    """The trace of a card request.
+
+    :param source: The source the card was requested from.
+    :param served_by: The source the card was received from.
+    :param hedged: Whether the default source was raced with the source
+    because the source was too slow.
+    :param attempts: The count of attempts to receive a card.
+    :param api_calls: The count of requests to the APIs of sources.
+    :param bytes: The size of the responses of the APIs.
+    :param duration: The time in seconds the request took.
+    :param outcome: "card" if the card was received,
+    "timeout", "cancelled" or the name of the exception otherwise."""
+    __slots__ = ('source', 'served_by', 'hedged', 'attempts', 'api_calls',
+                 'bytes', 'started_at', 'duration', 'outcome')
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.served_by: str | None = None
+        self.hedged: bool = False
+        self.attempts: int = 1
+        self.api_calls: int = 0
+        self.bytes: int = 0
+        self.started_at: float = perf_counter()
+        self.duration: float | None = None
+        self.outcome: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__
+                if name != 'started_at'}
+
+
+class SourceSummary:
+    """The aggregates of the traces of the requests to a source."""
+    __slots__ = ('requests', 'cards', 'errors', 'timeouts', 'cancelled',
+                 'hedged', 'hedges_won', 'attempts', 'api_calls', 'bytes',
+                 'durations')
+
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.cards: int = 0
+        self.errors: int = 0
+        self.timeouts: int = 0
+        self.cancelled: int = 0
+        self.hedged: int = 0
+        """The requests in which the default source was raced."""
+        self.hedges_won: int = 0
+        """The hedged requests in which the default source was faster."""
+        self.attempts: int = 0
+        self.api_calls: int = 0
+        self.bytes: int = 0
+        self.durations = timings.Histogram()
+
+    def add(self, trace: CardTrace) -> None:
+        self.requests += 1
+        match trace.outcome:
+            case 'card':
+                self.cards += 1
+            case 'timeout':
+                self.timeouts += 1
+            case 'cancelled':
+                self.cancelled += 1
+            case _:
+                self.errors += 1
+        if trace.hedged:
+            self.hedged += 1
+            if trace.served_by is not None and trace.served_by != trace.source:
+                self.hedges_won += 1
+        self.attempts += trace.attempts
+        self.api_calls += trace.api_calls
+        self.bytes += trace.bytes
+        self.durations.add(trace.duration)
+
+    @property
+    def yield_rate(self) -> float:
+        """The part of the requests in which a card was received."""
+        return self.cards / self.requests if self.requests else 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {'requests': self.requests,
+                'cards': self.cards,
+                'errors': self.errors,
+                'timeouts': self.timeouts,
+                'cancelled': self.cancelled,
+                'hedged': self.hedged,
+                'hedges_won': self.hedges_won,
+                'attempts': self.attempts,
+                'api_calls': self.api_calls,
+                'bytes': self.bytes,
+                'yield_rate': self.yield_rate,
+                'duration': self.durations.as_dict()}
+
+
+summaries: dict[str, SourceSummary] = {}
+"""The summaries of the traces by the sources."""
+recent_traces: MutableSequence[CardTrace] = deque(maxlen=recent_traces_count)
+
+_current: ContextVar[CardTrace | None] = ContextVar('card_trace', default=None)
+
+
+def current() -> CardTrace | None:
+    """Return the trace of the current card request if it is traced."""
+    return _current.get()
+
+
+def count_attempt() -> None:
+    """Count another attempt to receive the card if it is traced."""
+    trace = _current.get()
+    if trace is not None:
+        trace.attempts += 1
+
+
+def count_api_call(size: int = 0) -> None:
+    """Count a request to the API of a source if the card is traced.
+
+    :param size: The size of the response in bytes."""
+    trace = _current.get()
+    if trace is not None:
+        trace.api_calls += 1
+        trace.bytes += size
+
+
+class trace_card:
+    """A context manager that traces the card request inside it
+    if it is sampled.
+
+    A request made inside another traced request is counted
+    as another attempt of that request."""
+    __slots__ = ('source', 'trace', 'token')
+
+    def __init__(self, source: Any) -> None:
+        """:param source: The source the card is requested from."""
+        self.source = source
+        self.trace: CardTrace | None = None
+        self.token = None
+
+    def __enter__(self) -> CardTrace | None:
+        trace = _current.get()
+        if trace is not None:
+            trace.attempts += 1
+            return trace
+        if not sample_rate or random.random() >= sample_rate:
+            return None
+
+        self.trace = CardTrace(str(self.source))
+        self.token = _current.set(self.trace)
+        return self.trace
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        trace = self.trace
+        if trace is None:
+            return
+        _current.reset(self.token)
+
+        trace.duration = perf_counter() - trace.started_at
+        if exc_type is None:
+            trace.outcome = 'card'
+            if trace.served_by is None:
+                trace.served_by = trace.source
+        elif issubclass(exc_type, TimeoutError):
+            trace.outcome = 'timeout'
+        elif issubclass(exc_type, asyncio.CancelledError):
+            trace.outcome = 'cancelled'
+        else:
+            trace.outcome = exc_type.__name__
+
+        try:
+            summary = summaries[trace.source]
+        except KeyError:
+            summary = summaries[trace.source] = SourceSummary()
+        summary.add(trace)
+        recent_traces.append(trace)
+
+
+def get_summaries() -> dict[str, dict[str, Any]]:
+    """Return the summaries of the traces by the sources."""
+    return {source: summary.as_dict()
+            for source, summary in summaries.items()}
+
+
+def reset() -> None:
+    """Forget all the traces."""
+    summaries.clear()
+    recent_traces.clear()
@@ -0,0 +1,3 @@
+"""Benchmarks of the Imaginarium engine, the sources and the Discord bot.
+
+Run them from the project folder with "python -m benchmarks"."""
@@ -0,0 +1,41 @@
+import os
+import sys
+from argparse import ArgumentParser
+
+from .harness import project_path, run
+
+# The Discord bot modules are imported as top-level modules
+sys.path.append(str(project_path / 'bots' / 'discord_bot'))
+# Sources can be imported without real tokens
+os.environ.setdefault('VK_PARSER_TOKEN', 'benchmark')
+
+from . import engine, engine_service, sources, player_statistics, discord_bot  # noqa: E402, F401
+
+
+def main():
+    parser = ArgumentParser(
+        prog='python -m benchmarks',
+        description='Run the benchmarks and print the results as JSON.')
+    parser.add_argument('-o', '--output',
+                        help='The file the JSON report is written to '
+                             'instead of the standard output.')
+    parser.add_argument('-k', '--only', action='append', default=[],
+                        help='Run only the benchmarks whose names '
+                             'contain the substring. Can be repeated.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='The seed of random numbers of each scenario.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='The count of timed samples of each scenario.')
+    parser.add_argument('--number', type=int, default=10,
+                        help='The count of iterations in each sample.')
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='The latency of local fake servers in seconds.')
+    parser.add_argument('--winning-score', type=float, default=30,
+                        help='The score to win the games played '
+                             'by the engine benchmarks.')
+
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
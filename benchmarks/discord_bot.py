@@ -0,0 +1,691 @@
+import asyncio
+import importlib
+import itertools
+import random
+from functools import wraps
+
+from Imaginarium import rules_setup
+from Imaginarium.card import Card, DiscardedCard
+from Imaginarium.gameplay import GameCondition
+
+from .harness import benchmark
+
+messages_languages = ('en', 'ru', 'uk', 'de')
+"""The languages of messages, the last one is not supported
+to measure the fallback to the default language."""
+
+
+class FakeUser:
+    """A Discord user which does not require the connection."""
+
+    def __init__(self, user_id: int) -> None:
+        self.id = user_id
+        self.bot = False
+        self.mention = f'<@{user_id}>'
+
+    def __eq__(self, other):
+        return self.id == getattr(other, 'id', other)
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeSentMessage:
+    _ids = itertools.count(1)
+
+    def __init__(self, channel) -> None:
+        self.id = next(self._ids)
+        self.channel = channel
+
+    async def add_reaction(self, reaction) -> None:
+        pass
+
+
+class FakeRecipient(FakeUser):
+    """A Discord user with its own private channel."""
+
+    def __init__(self, user_id: int) -> None:
+        import discord
+
+        super().__init__(user_id)
+        self.channel = discord.Object(user_id)
+
+    async def send(self, *args, **kwargs) -> FakeSentMessage:
+        return FakeSentMessage(self.channel)
+
+
+def fake_message(author: FakeRecipient, content: str):
+    """Create a message event from the user in the user's private channel."""
+    import discord
+
+    message = discord.Message.__new__(discord.Message)
+    message.author = author
+    message.channel = author.channel
+    message.content = content
+    return message
+
+
+@benchmark('discord.messages_text', language=messages_languages)
+async def translations(options, language):
+    """Translate the most frequent gameplay messages."""
+    mt = importlib.import_module('messages_text')
+    cards = [Card(f'https://images.example/{i}.jpg') for i in range(6)]
+
+    async def iteration():
+        for _ in range(100):
+            mt.game_has_started(message_language=language)
+            mt.choose_card(cards, message_language=language)
+            mt.your_chosen_card(cards[0], message_language=language)
+            mt.card_selected_automatically(cards[0], message_language=language)
+
+    yield iteration
+
+
+@benchmark('discord.messages_text_import')
+async def messages_text_import(options):
+    """Import the messages of the bot from scratch,
+    as the bot does when it starts, and translate one message."""
+    import sys
+    import tracemalloc
+
+    def forget_messages_text():
+        for name in tuple(sys.modules):
+            if name == 'messages_text' or name.startswith('messages_text.'):
+                del sys.modules[name]
+
+    modules = {name: module for name, module in sys.modules.items()
+               if name == 'messages_text' or name.startswith('messages_text.')}
+
+    async def iteration():
+        forget_messages_text()
+        tracemalloc.start()
+        try:
+            mt = importlib.import_module('messages_text')
+            mt.game_has_started()
+            allocated, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {'allocated_kib': allocated // 1024,
+                'modules_imported': sum(
+                    name.startswith('messages_text.') for name in sys.modules)}
+
+    try:
+        yield iteration
+    finally:
+        forget_messages_text()
+        sys.modules.update(modules)
+
+
+@benchmark('discord.messages_text_overhead', calling=('translated', 'direct'),
+           language_passed=(True, False))
+async def translation_overhead(options, calling, language_passed):
+    """Translate a message without arguments a thousand times
+    through the translated function or by calling the English text directly,
+    with the passed language or with the default one."""
+    mt = importlib.import_module('messages_text')
+    english_game_has_started = mt.English.game_has_started
+
+    async def iteration():
+        if calling == 'direct':
+            for _ in range(1000):
+                english_game_has_started()
+        elif language_passed:
+            for _ in range(1000):
+                mt.game_has_started(message_language='en')
+        else:
+            for _ in range(1000):
+                mt.game_has_started()
+
+    yield iteration
+
+
+@benchmark('discord.messages_components', discarded_cards_count=(6, 12),
+           building=('generated', 'cached'))
+async def components(options, discarded_cards_count, building):
+    """Generate the buttons of the cards for each player
+    every time or take the cached layouts."""
+    mc = importlib.import_module('messages_components')
+    discarded_cards = GameCondition._discarded_cards
+    try:
+        GameCondition._discarded_cards = [
+            DiscardedCard(Card(f'https://images.example/{i}.jpg'), i)
+            for i in range(discarded_cards_count)]
+
+        async def iteration():
+            if building == 'generated':
+                for _ in range(100):
+                    mc.generate_buttons(range(1, rules_setup.cards_per_player + 1))
+                    mc.generate_buttons(range(1, discarded_cards_count + 1))
+            else:
+                for _ in range(100):
+                    mc.players_cards()
+                    mc.discarded_cards()
+
+        yield iteration
+    finally:
+        GameCondition._discarded_cards = discarded_cards
+
+
+@benchmark('discord.wait_for_reply', players_count=(10, 50))
+async def wait_for_reply(options, players_count):
+    """Wait for a reply of each player at the same time
+    and dispatch the replies in a random order."""
+    import discord
+
+    discord_gameplay = importlib.import_module('gameplay')
+    router = importlib.import_module('interaction_router').InteractionRouter()
+    players = [FakeRecipient(i) for i in range(1, players_count + 1)]
+
+    def message_check(player):
+        return lambda message: (message.author == player and
+                                message.content.isdigit())
+
+    async def iteration():
+        waiters = [asyncio.create_task(discord_gameplay.wait_for_reply(
+            recipient=player,
+            message_text='Choose the card',
+            message_check=message_check(player),
+            reaction_check=lambda reaction: False,
+            button_check=lambda interaction: False,
+            timeout=10,
+            router=router)) for player in players]
+        # Let the waiters send their messages and start listening
+        while len(router) < players_count:
+            await asyncio.sleep(0)
+
+        for player in random.sample(players, len(players)):
+            router.dispatch_message(fake_message(player, '1'))
+        await asyncio.gather(*waiters)
+
+    yield iteration
+
+
+@benchmark('discord.dispatch_event', pending_count=(10, 50, 500),
+           listening=('wait_for', 'router'))
+async def dispatch_event(options, pending_count, listening):
+    """Dispatch a hundred messages which none of the pending requests
+    is waiting for, while the requests listen to the events
+    with the listeners of the client as they used to
+    or with the interaction router."""
+    import discord
+
+    interaction_router = importlib.import_module('interaction_router')
+    bot = discord.Client(loop=asyncio.get_running_loop())
+    router = interaction_router.InteractionRouter()
+    players = [FakeRecipient(i) for i in range(1, pending_count + 1)]
+    stranger = FakeRecipient(0)
+    waiters = []
+
+    def message_check(player):
+        return lambda message: (message.author == player and
+                                message.content.isdigit())
+
+    for player in players:
+        sent_message = FakeSentMessage(player.channel)
+        if listening == 'router':
+            waiters.append(router.wait(sent_message,
+                                       user_id=player.id,
+                                       message_check=message_check(player),
+                                       reaction_check=lambda reaction: False,
+                                       button_check=lambda interaction: False))
+        else:
+            def wrapped_check(event, sent_message=sent_message, player=player):
+                return (sent_message.channel == event.channel and
+                        message_check(player)(event))
+
+            for event in ('message', 'reaction_add', 'button_click'):
+                waiters.append(asyncio.ensure_future(
+                    bot.wait_for(event, check=wrapped_check)))
+    # Let the client register its listeners
+    await asyncio.sleep(0)
+
+    async def iteration():
+        for _ in range(100):
+            if listening == 'router':
+                router.dispatch_message(fake_message(stranger, '1'))
+            else:
+                bot.dispatch('message', fake_message(stranger, '1'))
+
+    try:
+        yield iteration
+    finally:
+        for waiter in waiters:
+            if listening == 'router':
+                router.cancel(waiter)
+            else:
+                waiter.cancel()
+
+
+class FakeInteraction:
+    """A click of a button with the label."""
+
+    def __init__(self, author: FakeUser, label: str) -> None:
+        self.author = author
+        self.user = author
+        self.component = FakeButton(label)
+
+
+class FakeButton:
+    def __init__(self, label: str) -> None:
+        self.label = label
+
+
+def not_bot_check_decorator(get_author):
+    """The stacked check of the replies of the bot's users,
+    which the reply specs replaced."""
+    def decorator(func):
+        @wraps(func)
+        def inner(reply):
+            if not get_author(reply).bot:
+                return func(reply)
+            return False
+        return inner
+    return decorator
+
+
+def digit_check_decorator(get_text):
+    """The stacked check of the replies which are numbers."""
+    def decorator(func):
+        @wraps(func)
+        def inner(reply):
+            if get_text(reply).isdigit():
+                return func(reply)
+            return False
+        return inner
+    return decorator
+
+
+def in_range_of_cards_check_decorator(get_text):
+    """The stacked check of the numbers of the players' cards."""
+    def decorator(func):
+        stop = rules_setup.cards_per_player + 1
+
+        @wraps(func)
+        def inner(reply):
+            if int(get_text(reply)) in range(1, stop):
+                return func(reply)
+            return False
+        return inner
+    return decorator
+
+
+def not_leader_check_decorator(get_author):
+    """The stacked check of the replies of the players except the leader."""
+    def decorator(func):
+        leader = GameCondition._leader
+
+        @wraps(func)
+        def inner(reply):
+            if get_author(reply).id != leader.id:
+                return func(reply)
+            return False
+        return inner
+    return decorator
+
+
+def selected_card_check_decorator(get_author, get_text):
+    """The stacked check of the replies which choose a card."""
+    def decorator(func):
+        func = in_range_of_cards_check_decorator(get_text)(func)
+        func = digit_check_decorator(get_text)(func)
+        return not_bot_check_decorator(get_author)(func)
+    return decorator
+
+
+def message_author(message):
+    return message.author
+
+
+def message_text(message):
+    return message.content
+
+
+def button_author(interaction):
+    return interaction.author
+
+
+def button_text(interaction):
+    return interaction.component.label
+
+
+@benchmark('discord.reply_checks', checks=('decorators', 'spec'),
+           kind=('message', 'button'))
+async def reply_checks(options, checks, kind):
+    """Check a thousand votes of 6 players, a half of which are invalid,
+    with the stacked check decorators or with a compiled reply spec."""
+    players = [FakeRecipient(i) for i in range(1, 7)]
+    leader = players[0]
+    discarded_cards = GameCondition._discarded_cards
+    leader_of_round = GameCondition._leader
+    try:
+        GameCondition._discarded_cards = [
+            DiscardedCard(Card(f'https://images.example/{i}.jpg'), player.id)
+            for i, player in enumerate(players)]
+        GameCondition._leader = leader
+
+        if checks == 'spec':
+            reply_spec = importlib.import_module('reply_spec')
+            own_cards = {player.id: (number,) for number, player
+                         in enumerate(players, start=1)}
+            message_check, button_check = reply_spec.ReplySpec(
+                excluded_users=(leader.id,),
+                numbers=range(1, len(players) + 1),
+                excluded_numbers_by_users=own_cards).compile()
+        else:
+            @selected_card_check_decorator(message_author, message_text)
+            @not_leader_check_decorator(message_author)
+            def message_check(message) -> bool:
+                return (GameCondition._discarded_cards[int(message.content) - 1].owner !=
+                        message.author.id)
+
+            @selected_card_check_decorator(button_author, button_text)
+            @not_leader_check_decorator(button_author)
+            def button_check(interaction) -> bool:
+                return (GameCondition._discarded_cards[int(interaction.component.label) - 1].owner !=
+                        interaction.user.id)
+
+        texts = ('1', '2', '3', 'x', '42', '5')
+        if kind == 'message':
+            check = message_check
+            events = [fake_message(players[i % 6], texts[i % 5])
+                      for i in range(1000)]
+        else:
+            check = button_check
+            events = [FakeInteraction(players[i % 6], texts[i % 5])
+                      for i in range(1000)]
+
+        async def iteration():
+            return {'passed': sum(map(check, events))}
+
+        yield iteration
+    finally:
+        GameCondition._discarded_cards = discarded_cards
+        GameCondition._leader = leader_of_round
+
+
+class FakeDestination:
+    """A user or a channel which sends one message at a time
+    and takes a millisecond to send it, like a route of Discord."""
+
+    def __init__(self, destination_id: int) -> None:
+        self.id = destination_id
+        self.sent = 0
+        self._route = asyncio.Lock()
+
+    async def send(self, *args, **kwargs) -> FakeSentMessage:
+        async with self._route:
+            await asyncio.sleep(0.001)
+            self.sent += 1
+            return FakeSentMessage(self)
+
+
+@benchmark('discord.outbound', players_count=(6, 20),
+           sending=('direct', 'outbound'))
+async def outbound(options, players_count, sending):
+    """Send a round of messages: two announcements to the channel,
+    the confirmations of the previous phase to each player
+    and then the prompts of the next phase,
+    directly as they used to be sent or through the outbound queues,
+    and measure the time after which the last player gets the prompt."""
+    outbound_module = importlib.import_module('outbound')
+
+    async def iteration():
+        queues = outbound_module.Outbound(global_budget=(10 ** 6, 1.),
+                                          route_budget=(10 ** 6, 1.))
+        channel = FakeDestination(0)
+        players = [FakeDestination(i) for i in range(1, players_count + 1)]
+        started_at = asyncio.get_running_loop().time()
+        prompted_after = []
+
+        async def prompt(player):
+            if sending == 'direct':
+                await player.send('Choose the card', components=[])
+            else:
+                await queues.send(player, 'Choose the card',
+                                  priority=outbound_module.PROMPT,
+                                  components=[])
+            prompted_after.append(
+                asyncio.get_running_loop().time() - started_at)
+
+        sends = []
+        for text in ('The round has started', 'The association'):
+            if sending == 'direct':
+                sends.append(channel.send(text))
+            else:
+                queues.post(channel, text)
+        for player in players:
+            for text in ('Your chosen card', 'Your vote'):
+                if sending == 'direct':
+                    sends.append(player.send(text))
+                else:
+                    queues.post(player, text,
+                                priority=outbound_module.CONFIRMATION)
+        sends += map(prompt, players)
+
+        await asyncio.gather(*sends)
+        await queues.join()
+        return {'last_prompt_ms': round(max(prompted_after) * 1000, 1),
+                'messages_sent': sum(destination.sent for destination
+                                     in (channel, *players))}
+
+    yield iteration
+
+
+class FakeCalls:
+    """The calls of the API of Discord counted by their kinds."""
+
+    def __init__(self) -> None:
+        self.counts = {'send': 0, 'edit': 0, 'respond': 0}
+
+    def destination(self, destination_id: int) -> 'CountedDestination':
+        return CountedDestination(destination_id, self)
+
+
+class CountedMessage(FakeSentMessage):
+    def __init__(self, channel, calls: FakeCalls) -> None:
+        super().__init__(channel)
+        self.calls = calls
+
+    async def edit(self, **kwargs) -> None:
+        self.calls.counts['edit'] += 1
+
+
+class CountedDestination:
+    def __init__(self, destination_id: int, calls: FakeCalls) -> None:
+        self.id = destination_id
+        self.calls = calls
+
+    async def send(self, *args, **kwargs) -> CountedMessage:
+        self.calls.counts['send'] += 1
+        return CountedMessage(self, self.calls)
+
+
+class CountedInteraction:
+    def __init__(self, calls: FakeCalls) -> None:
+        self.calls = calls
+
+    async def respond(self, **kwargs) -> None:
+        self.calls.counts['respond'] += 1
+
+
+@benchmark('discord.panel', reply=('button', 'message'),
+           showing=('messages', 'panel'))
+async def panel(options, reply, showing):
+    """Play 5 rounds with 6 players, each of whom is prompted
+    to choose a card and to vote and confirms the choices,
+    with new messages as they used to be sent
+    or with the panels of the players, and count the calls of the API."""
+    outbound_module = importlib.import_module('outbound')
+    panels = importlib.import_module('panels')
+    rounds_count, players_count = 5, 6
+    buttons = [['1', '2', '3', '4', '5', '6']]
+
+    async def iteration():
+        calls = FakeCalls()
+        queues = outbound_module.Outbound(global_budget=(10 ** 6, 1.),
+                                          route_budget=(10 ** 6, 1.))
+        players = [calls.destination(i) for i in range(1, players_count + 1)]
+        players_panels = [panels.Panel(player, debounce=0.001, outbound=queues)
+                          for player in players]
+
+        async def phase(player, player_panel, prompt, confirmation):
+            interaction = CountedInteraction(calls) if reply == 'button' else None
+            if showing == 'messages':
+                await queues.send(player, prompt,
+                                  priority=outbound_module.PROMPT,
+                                  components=buttons)
+                if interaction is not None:
+                    await interaction.respond(type=6)
+                queues.post(player, confirmation,
+                            priority=outbound_module.CONFIRMATION)
+            else:
+                await player_panel.show(prompt, components=buttons)
+                player_panel.update(confirmation, interaction=interaction)
+            # Let the other players answer
+            await asyncio.sleep(0.002)
+
+        for _ in range(rounds_count):
+            for prompt in ('Choose the card', 'Vote for the card'):
+                await asyncio.gather(*(
+                    phase(player, player_panel, prompt, 'Your chosen card')
+                    for player, player_panel in zip(players, players_panels)))
+        await asyncio.sleep(0.002)
+        await queues.join()
+
+        calls_count = sum(calls.counts.values())
+        return {**calls.counts,
+                'calls_per_player_per_round': round(
+                    calls_count / players_count / rounds_count, 2),
+                'limited_calls_per_player_per_round': round(
+                    (calls_count - calls.counts['respond']) /
+                    players_count / rounds_count, 2)}
+
+    yield iteration
+
+
+class SlowRecipient(FakeRecipient):
+    """A Discord user who answers the message as soon as it is received,
+    while each call of the API takes a millisecond."""
+
+    def __init__(self, user_id: int, router) -> None:
+        super().__init__(user_id)
+        self.router = router
+        self.reactions_added = 0
+
+    async def send(self, *args, **kwargs) -> FakeSentMessage:
+        await asyncio.sleep(0.001)
+        sent_message = FakeSentMessage(self.channel)
+        sent_message.add_reaction = self.add_reaction
+        asyncio.get_running_loop().call_soon(
+            self.router.dispatch_message, fake_message(self, '1'))
+        return sent_message
+
+    async def add_reaction(self, reaction) -> None:
+        await asyncio.sleep(0.001)
+        self.reactions_added += 1
+
+
+@benchmark('discord.time_to_interactive', choices=('reactions', 'buttons'))
+async def time_to_interactive(options, choices):
+    """Prompt a player to choose one of 6 cards with reactions or buttons,
+    while the player answers as soon as the prompt is received."""
+    discord_gameplay = importlib.import_module('gameplay')
+    router = importlib.import_module('interaction_router').InteractionRouter()
+    queues = importlib.import_module('outbound').Outbound(
+        global_budget=(10 ** 6, 1.), route_budget=(10 ** 6, 1.))
+    player = SlowRecipient(1, router)
+    numbers = [f'{number}\N{COMBINING ENCLOSING KEYCAP}' for number in '123456']
+
+    async def iteration():
+        await discord_gameplay.wait_for_reply(
+            recipient=player,
+            message_text='Choose the card',
+            reactions=numbers,
+            buttons=[['1', '2', '3', '4', '5', '6']] if choices == 'buttons' else None,
+            message_check=lambda message: message.content.isdigit(),
+            reaction_check=lambda reaction: False,
+            button_check=lambda interaction: False,
+            timeout=10,
+            router=router,
+            outbound=queues)
+        # Let the cancelled reactions finish
+        await asyncio.sleep(0)
+        return {'reactions_added': player.reactions_added}
+
+    yield iteration
+
+
+@benchmark('discord.users_languages', storing=('memory', 'file'))
+async def users_languages(options, storing):
+    """Look up the languages of 6 players a thousand times,
+    as the hooks of a game do, while 20000 users chose their languages
+    and the recently used languages are kept for 10000 users."""
+    import tempfile
+    from pathlib import Path
+
+    languages_store = importlib.import_module('messages_text.languages_store')
+    store = languages_store.UsersLanguages(capacity=10000)
+    with tempfile.TemporaryDirectory() as directory:
+        if storing == 'file':
+            store.open(Path(directory) / 'users_languages.sqlite3')
+        try:
+            for user_id in range(20000):
+                store[user_id] = messages_languages[user_id % 3]
+            store.flush(wait=True)
+            players = [FakeUser(user_id) for user_id in range(0, 20000, 3333)]
+
+            async def iteration():
+                for _ in range(1000):
+                    for player in players:
+                        store[player]
+                return {'kept_in_memory': len(store)}
+
+            yield iteration
+        finally:
+            store.close()
+
+
+class FakePrivateInteraction(FakeInteraction):
+    """The click of a button in the private channel of the user
+    with the data the relay passes."""
+    _ids = itertools.count(1)
+
+    def __init__(self, author: FakeRecipient, label: str) -> None:
+        super().__init__(author, label)
+        self.raw_data = {'id': str(next(self._ids)), 'token': 'token'}
+        self.message = FakeSentMessage(author.channel)
+        self.component.custom_id = label
+
+
+@benchmark('discord.relay', processes_count=(2, 4))
+async def relay(options, processes_count):
+    """Forward a hundred direct messages and a hundred clicks of buttons,
+    which no process waits for, from the process of the first shard
+    to the other processes through the relay."""
+    relay_module = importlib.import_module('relay')
+    hub = relay_module.Relay(importlib.import_module(
+        'interaction_router').InteractionRouter())
+    peers = [relay_module.Relay(importlib.import_module(
+        'interaction_router').InteractionRouter())
+        for _ in range(processes_count - 1)]
+    try:
+        port = await hub.serve('127.0.0.1', 0, 'secret')
+        for peer in peers:
+            await peer.connect('127.0.0.1', port, 'secret', http=None,
+                               retry_interval=0.01)
+        while hub.peers_count < len(peers):
+            await asyncio.sleep(0.01)
+        player = FakeRecipient(1)
+        message = fake_message(player, '1')
+        message.id = 1
+
+        async def iteration():
+            for _ in range(100):
+                hub.forward_message(message)
+                await hub.forward_button_click(
+                    FakePrivateInteraction(player, '1'))
+
+        yield iteration
+    finally:
+        for peer in (hub, *peers):
+            await peer.close()
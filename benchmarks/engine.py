@@ -0,0 +1,431 @@
+import asyncio
+import os
+import random
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import AsyncIterator
+
+from aiohttp import ClientSession
+
+from Imaginarium import gameplay, metrics, rules_setup, timings
+from Imaginarium.card import DiscardedCard
+from Imaginarium.gameplay import GameCondition
+from Imaginarium.journal import read_events
+from Imaginarium.scheduling import DeadlineScheduler
+
+from .fakes import InstantSource, LocalSource, random_image_server
+from .harness import benchmark
+
+
+thinking_time: float = 0
+"""The time in seconds each player thinks before the vote."""
+
+
+def deep_sizeof(obj, seen: set[int] | None = None) -> int:
+    """Return the size in bytes of the object and all objects it refers to
+    through containers, instance dictionaries and slots."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, type):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen)
+                    for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), seen)
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, '__slots__', ()):
+            if hasattr(obj, slot) and slot not in ('__dict__', '__weakref__'):
+                size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+@asynccontextmanager
+async def engine_sources(latency: float = 0) -> AsyncIterator[None]:
+    """Replace the sources of the game with the local ones.
+
+    :param latency: The time in seconds each card is received."""
+    server = random_image_server(latency=latency)
+    default_source = gameplay.default_source
+    used_sources = GameCondition._used_sources
+    try:
+        gameplay.default_source = LocalSource(await server.start() + '/image')
+        GameCondition._used_sources = [InstantSource(latency=latency)]
+        yield
+    finally:
+        gameplay.default_source = default_source
+        GameCondition._used_sources = used_sources
+        await server.close()
+
+
+def _discard(player: gameplay.Player, cards_count: int = 1) -> None:
+    for _ in range(cards_count):
+        card = player.cards.pop(
+            GameCondition._random.game.randrange(len(player.cards)))
+        GameCondition._discarded_cards.append(DiscardedCard(card, player.id))
+    gameplay.mark_answered(player)
+
+
+def _vote(player: gameplay.Player) -> None:
+    card = GameCondition._random.game.choice(
+        [i for i, (_, owner)
+         in enumerate(GameCondition._discarded_cards, start=1)
+         if owner != player.id])
+    GameCondition._votes_for_card[GameCondition._discarded_cards[card - 1].owner] += 1
+    player.chosen_card = card
+    gameplay.mark_answered(player)
+
+
+async def request_association_hook():
+    GameCondition._round_association = 'association'
+    gameplay.mark_answered(GameCondition._leader)
+
+
+async def request_players_cards_2_hook():
+    for player in GameCondition._players:
+        _discard(player, 2)
+
+
+async def request_leader_card_hook():
+    _discard(GameCondition._leader)
+
+
+async def request_players_cards_hook():
+    for player in GameCondition._players:
+        if player != GameCondition._leader:
+            _discard(player)
+
+
+async def vote_for_target_card_2_hook():
+    if thinking_time:
+        await asyncio.sleep(thinking_time)
+    for player in GameCondition._players:
+        _vote(player)
+
+
+async def vote_for_target_card_hook():
+    if thinking_time:
+        await asyncio.sleep(thinking_time)
+    for player in GameCondition._players:
+        if player != GameCondition._leader:
+            _vote(player)
+
+
+fake_hooks = {
+    'request_association_hook': request_association_hook,
+    'request_players_cards_2_hook': request_players_cards_2_hook,
+    'request_leader_card_hook': request_leader_card_hook,
+    'request_players_cards_hook': request_players_cards_hook,
+    'vote_for_target_card_2_hook': vote_for_target_card_2_hook,
+    'vote_for_target_card_hook': vote_for_target_card_hook,
+}
+"""Hooks which make the players' choices instantly and randomly
+with the random numbers of the game."""
+
+
+@benchmark('engine.start_game', players_count=(2, 3, 6, 12))
+async def start_game(options, players_count):
+    """Play a whole game with instant players and sources."""
+    players = GameCondition._players
+    winning_score = rules_setup.winning_score
+    async with engine_sources():
+        try:
+            GameCondition._players = gameplay.Roster(
+                gameplay.Player(i) for i in range(1, players_count + 1))
+            rules_setup.winning_score = options.winning_score
+
+            async def iteration():
+                await gameplay.start_game(**fake_hooks)
+
+            yield iteration
+        finally:
+            GameCondition._players = players
+            rules_setup.winning_score = winning_score
+
+
+@benchmark('engine.start_game_journaled', players_count=(2, 3, 6, 12))
+async def start_game_journaled(options, players_count):
+    """Play a whole game with instant players and sources
+    while its events are written to a journal."""
+    players = GameCondition._players
+    winning_score = rules_setup.winning_score
+    journal_directory = rules_setup.journal_directory
+    with TemporaryDirectory() as directory:
+        async with engine_sources():
+            try:
+                GameCondition._players = gameplay.Roster(
+                    gameplay.Player(i) for i in range(1, players_count + 1))
+                rules_setup.winning_score = options.winning_score
+                rules_setup.journal_directory = directory
+
+                async def iteration():
+                    await gameplay.start_game(**fake_hooks)
+                    journals = list(Path(directory).iterdir())
+                    return {'events_per_game': sum(
+                        1 for _ in read_events(max(journals, key=os.path.getmtime)))}
+
+                yield iteration
+            finally:
+                GameCondition._players = players
+                rules_setup.winning_score = winning_score
+                rules_setup.journal_directory = journal_directory
+
+
+def _game_events(path) -> list[dict]:
+    """Return the events of the journal without the durations,
+    which differ from game to game."""
+    events = []
+    for event in read_events(path):
+        event = {key: value for key, value in event.items()
+                 if key not in ('time', 'took')}
+        if event['event'] == 'phase':
+            event['answered'] = [player_id for player_id, _ in event['answered']]
+        events.append(event)
+    return events
+
+
+@benchmark('engine.start_game_seeded', players_count=(2, 3, 6, 12))
+async def start_game_seeded(options, players_count):
+    """Play whole games with the same seed and check
+    that their journals are the same."""
+    players = GameCondition._players
+    winning_score = rules_setup.winning_score
+    journal_directory = rules_setup.journal_directory
+    with TemporaryDirectory() as directory:
+        async with engine_sources():
+            try:
+                rules_setup.winning_score = options.winning_score
+                rules_setup.journal_directory = directory
+                first_game = None
+
+                async def iteration():
+                    nonlocal first_game
+                    GameCondition._players = gameplay.Roster(
+                        gameplay.Player(i) for i in range(1, players_count + 1))
+                    # The names of the cards depend on the count of the received ones
+                    GameCondition._used_sources = [InstantSource()]
+                    await gameplay.start_game(**fake_hooks)
+
+                    journal = max(Path(directory).iterdir(), key=os.path.getmtime)
+                    game = _game_events(journal)
+                    journal.unlink()
+                    if first_game is None:
+                        first_game = game
+                    return {'seed': GameCondition._seed,
+                            'events_per_game': len(game),
+                            'identical': game == first_game}
+
+                yield iteration
+            finally:
+                GameCondition._players = players
+                rules_setup.winning_score = winning_score
+                rules_setup.journal_directory = journal_directory
+
+
+@benchmark('engine.start_game_with_latency', players_count=(2, 3, 6))
+async def start_game_with_latency(options, players_count):
+    """Play a whole game in which cards are received with the latency
+    and players think as long before they vote."""
+    global thinking_time
+
+    players = GameCondition._players
+    winning_score = rules_setup.winning_score
+    async with engine_sources(latency=options.latency):
+        try:
+            GameCondition._players = gameplay.Roster(
+                gameplay.Player(i) for i in range(1, players_count + 1))
+            rules_setup.winning_score = options.winning_score
+            thinking_time = options.latency
+
+            async def iteration():
+                await gameplay.start_game(**fake_hooks)
+
+            yield iteration
+        finally:
+            GameCondition._players = players
+            rules_setup.winning_score = winning_score
+            thinking_time = 0
+
+
+@benchmark('engine.join_leave', players_count=(10, 1000, 10000))
+async def join_leave(options, players_count):
+    """Join and leave a player of the large lobby."""
+    players = GameCondition._players
+    try:
+        GameCondition._players = gameplay.Roster(
+            gameplay.Player(i) for i in range(1, players_count + 1))
+        player = gameplay.Player(0)
+
+        async def iteration():
+            for _ in range(100):
+                gameplay.join(player)
+                gameplay.leave(player.id)
+
+        yield iteration
+    finally:
+        GameCondition._players = players
+
+
+@benchmark('engine.game_memory', players_count=(3, 6, 12))
+async def game_memory(options, players_count):
+    """Measure the memory which is taken by the state of a game
+    at the end of its first round."""
+    players = GameCondition._players
+    async with engine_sources():
+        try:
+            GameCondition._players = gameplay.Roster(
+                gameplay.Player(i) for i in range(1, players_count + 1))
+
+            async def iteration():
+                state_size = 0
+
+                async def at_round_end_hook():
+                    nonlocal state_size
+                    state_size = deep_sizeof((GameCondition._players,
+                                              GameCondition._discarded_cards,
+                                              GameCondition._votes_for_card))
+                    gameplay.end_game()
+
+                await gameplay.start_game(at_round_end_hook=at_round_end_hook,
+                                          **fake_hooks)
+                return {'bytes_per_game': state_size}
+
+            yield iteration
+        finally:
+            GameCondition._players = players
+
+
+@benchmark('engine.phase_deadline', players_count=(10, 100, 1000))
+async def phase_deadline(options, players_count):
+    """Let all the players of a phase miss its deadline."""
+    scheduler = DeadlineScheduler()
+
+    async def player_choice(deadline):
+        await deadline
+
+    async def iteration():
+        deadline = scheduler.schedule(0)
+        await asyncio.gather(*(player_choice(deadline)
+                               for _ in range(players_count)))
+
+    yield iteration
+
+
+@benchmark('engine.afk_phase', players_count=(3, 6, 12), quorum=(None, 0.5))
+async def afk_phase(options, players_count, quorum):
+    """Let one player of a phase miss its deadline
+    while the rest of the players answer after thinking."""
+    players = gameplay.Roster(gameplay.Player(i)
+                              for i in range(1, players_count + 1))
+    afk_player = players[0]
+    step_timeout = rules_setup.step_timeout
+    rules_quorum = rules_setup.quorum
+    quorum_grace_timeout = rules_setup.quorum_grace_timeout
+
+    async def player_choice(player):
+        if player is afk_player:
+            await GameCondition._phase_deadline
+        else:
+            await asyncio.sleep(random.uniform(0, 0.02))
+            gameplay.mark_answered(player)
+
+    async def hook():
+        await asyncio.gather(*(player_choice(player) for player in players))
+
+    async def iteration():
+        await gameplay.run_phase('afk', hook, players)
+
+    try:
+        rules_setup.step_timeout = 0.5
+        rules_setup.quorum = quorum
+        rules_setup.quorum_grace_timeout = 0.05
+        yield iteration
+    finally:
+        rules_setup.step_timeout = step_timeout
+        rules_setup.quorum = rules_quorum
+        rules_setup.quorum_grace_timeout = quorum_grace_timeout
+
+
+@benchmark('engine.start_game_timed', players_count=(3, 12), enabled=(False, True))
+async def start_game_timed(options, players_count, enabled):
+    """Play a whole game with instant players and sources
+    while the timings of its phases are recorded or disabled."""
+    players = GameCondition._players
+    winning_score = rules_setup.winning_score
+    timings_enabled = timings.enabled
+    async with engine_sources():
+        try:
+            GameCondition._players = gameplay.Roster(
+                gameplay.Player(i) for i in range(1, players_count + 1))
+            rules_setup.winning_score = options.winning_score
+            timings.enabled = enabled
+
+            async def iteration():
+                await gameplay.start_game(**fake_hooks)
+                return {name: round(histogram.mean, 6)
+                        for name, histogram in timings.session.items()}
+
+            yield iteration
+        finally:
+            GameCondition._players = players
+            rules_setup.winning_score = winning_score
+            timings.enabled = timings_enabled
+
+
+@benchmark('engine.timings_measure', enabled=(False, True))
+async def timings_measure(options, enabled):
+    """Measure a thousand empty blocks."""
+    timings_enabled = timings.enabled
+    try:
+        timings.enabled = enabled
+
+        async def iteration():
+            for _ in range(1000):
+                with timings.measure('benchmark'):
+                    pass
+
+        yield iteration
+    finally:
+        timings.enabled = timings_enabled
+        timings.session.clear()
+        timings.overall.clear()
+
+
+@benchmark('engine.metrics_scrape')
+async def metrics_scrape(options):
+    """Scrape the metrics over local HTTP after a game."""
+    players = GameCondition._players
+    winning_score = rules_setup.winning_score
+    timings_enabled = timings.enabled
+    async with engine_sources():
+        try:
+            GameCondition._players = gameplay.Roster(
+                gameplay.Player(i) for i in range(1, 7))
+            rules_setup.winning_score = options.winning_score
+            timings.enabled = True
+            await gameplay.start_game(**fake_hooks)
+        finally:
+            GameCondition._players = players
+            rules_setup.winning_score = winning_score
+            timings.enabled = timings_enabled
+
+    server = await metrics.serve(port=0)
+    url = 'http://127.0.0.1:{}/metrics'.format(
+        server.sockets[0].getsockname()[1])
+    try:
+        async with ClientSession() as session:
+            async def iteration():
+                async with session.get(url) as response:
+                    return {'bytes': len(await response.read())}
+
+            yield iteration
+    finally:
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,135 @@
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import AsyncIterator, Iterable
+
+from Imaginarium import gameplay, protocol, rules_setup
+from Imaginarium.card import Card
+from Imaginarium.gameplay import GameCondition
+from Imaginarium.service import EngineClient, EngineService, get_state
+
+from .engine import engine_sources
+from .harness import benchmark
+
+
+@asynccontextmanager
+async def running_service() -> AsyncIterator[str]:
+    """Serve the engine in the same process.
+
+    :return: The path of the socket."""
+    service = EngineService()
+    with TemporaryDirectory() as directory:
+        path = str(Path(directory) / 'engine.sock')
+        await service.start(path)
+        try:
+            yield path
+        finally:
+            await service.close()
+
+
+async def play_as_frontend(client: EngineClient,
+                           players_ids: Iterable[int]) -> None:
+    """Make the first possible choices of the players
+    until the game ends."""
+    players_ids = set(players_ids)
+    async for event, data in client.events():
+        if event == 'game_ended':
+            return
+        if not event.startswith('request_'):
+            continue
+
+        state = data['state']
+        for player_id in players_ids.intersection(data['players']):
+            match event:
+                case 'request_association':
+                    await client.call('set_association', player_id, 'association')
+                case 'request_leader_card' | 'request_players_cards':
+                    await client.call('discard', player_id, 1)
+                    if len(state['players']) == 2:
+                        await client.call('discard', player_id, 2)
+                case 'request_vote':
+                    await client.call('vote', player_id, next(
+                        number for number, (_, owner)
+                        in enumerate(state['discarded_cards'], start=1)
+                        if owner != player_id))
+
+
+@benchmark('service.call', operation=('ping', 'get_state'))
+async def call(options, operation):
+    """Call an operation of the service a hundred times
+    while a game of 6 players is set up."""
+    players = GameCondition._players
+    try:
+        GameCondition._players = gameplay.Roster(
+            gameplay.Player(i) for i in range(1, 7))
+        async with running_service() as path:
+            client = await EngineClient.connect(path)
+
+            async def iteration():
+                for _ in range(100):
+                    await client.call(operation)
+
+            try:
+                yield iteration
+            finally:
+                await client.close()
+    finally:
+        GameCondition._players = players
+
+
+@benchmark('service.protocol', players_count=(6, 12))
+async def protocol_state(options, players_count):
+    """Encode and decode the state of a game a hundred times."""
+    players = GameCondition._players
+    try:
+        GameCondition._players = gameplay.Roster(
+            gameplay.Player(i) for i in range(1, players_count + 1))
+        cards = [Card(f'https://example.com/{i}.jpg')
+                 for i in range(6 * players_count)]
+        for i, player in enumerate(GameCondition._players):
+            player.cards = cards[6 * i:6 * (i + 1)]
+
+        async def iteration():
+            for _ in range(100):
+                frame = protocol.pack_frame(protocol.EVENT, 0, get_state())
+                # Skip the header of the frame
+                protocol.decode(frame[9:])
+            return {'frame_bytes': len(frame)}
+
+        yield iteration
+    finally:
+        GameCondition._players = players
+
+
+@benchmark('service.start_game', players_count=(3, 6), frontends_count=(1, 3))
+async def start_game(options, players_count, frontends_count):
+    """Play a whole game whose players make choices
+    through the frontends connected to the service."""
+    winning_score = rules_setup.winning_score
+    players = GameCondition._players
+    async with engine_sources(), running_service() as path:
+        try:
+            rules_setup.winning_score = options.winning_score
+            client = await EngineClient.connect(path)
+            frontends = [await EngineClient.connect(path)
+                         for _ in range(frontends_count)]
+            for frontend in frontends:
+                await frontend.subscribe()
+
+            async def iteration():
+                GameCondition._players = gameplay.Roster()
+                for player_id in range(1, players_count + 1):
+                    await client.call('join', player_id)
+                playing = [asyncio.create_task(play_as_frontend(
+                    frontend, range(i + 1, players_count + 1, frontends_count)))
+                    for i, frontend in enumerate(frontends)]
+                await client.call('start_game')
+                await asyncio.gather(*playing)
+
+            yield iteration
+        finally:
+            for frontend in (client, *frontends):
+                await frontend.close()
+            rules_setup.winning_score = winning_score
+            GameCondition._players = players
@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+import random
+from typing import (
+    Any,
+    Callable,
+    Mapping
+)
+
+from aiohttp import web
+
+from Imaginarium import sources
+from Imaginarium.card import Card
+
+
+class FakeServer:
+    """Local HTTP server which replies to requests with the specified latency.
+
+    :param routes: The map of paths and functions which
+    receive the request parameters and return a JSON response.
+    :param latency: The time in seconds the server waits before the reply."""
+
+    def __init__(self,
+                 routes: Mapping[str, Callable[[Mapping[str, str]], Any]],
+                 latency: float = 0) -> None:
+        self.routes = routes
+        self.latency = latency
+        self.requests_count = 0
+
+        self._runner: web.AppRunner | None = None
+        self.url: str | None = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests_count += 1
+        params = dict(request.query)
+        if request.method == 'POST':
+            params.update(await request.post())
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        return web.json_response(self.routes[request.path](params))
+
+    async def start(self) -> str:
+        """Start the server and return its URL."""
+        app = web.Application()
+        for path in self.routes:
+            app.router.add_route('*', path, self._handle)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+
+        host, port = self._runner.addresses[0][:2]
+        self.url = f'http://{host}:{port}'
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def random_image_server(latency: float = 0) -> FakeServer:
+    """Create a server which imitates the default source API."""
+    counter = itertools.count()
+
+    return FakeServer(
+        {'/image': lambda params: {
+            'urls': {'raw': f'https://images.example/{next(counter)}.jpg'}}},
+        latency=latency)
+
+
+def vk_server(posts_count: int = 1000,
+              unsuitable_posts_ratio: float = 0.2,
+              seed: int = 0,
+              latency: float = 0) -> FakeServer:
+    """Create a server which imitates the methods of the Vk API
+    which are used by the Vk source.
+
+    :param posts_count: The count of posts in every group.
+    :param unsuitable_posts_ratio: The part of posts which contain
+    only videos, so the source has to retry.
+    :param seed: The seed of posts contents.
+    :param latency: The time in seconds the server waits before the reply."""
+    rng = random.Random(seed)
+
+    def wall_get(params: Mapping[str, str]) -> Any:
+        offset = int(params.get('offset', 0))
+        if rng.random() < unsuitable_posts_ratio:
+            attachment = {'type': 'video',
+                          'video': {'owner_id': -1, 'id': offset}}
+        else:
+            attachment = {'type': 'photo',
+                          'photo': {'sizes': [
+                              {'url': f'https://vk.example/{offset}_s.jpg'},
+                              {'url': f'https://vk.example/{offset}.jpg'}]}}
+
+        return {'response': {'count': posts_count,
+                             'items': [{'attachments': [attachment]}]}}
+
+    def video_get(params: Mapping[str, str]) -> Any:
+        return {'response': {'items': [
+            {'player': f'https://vk.example/video{params["video_id"]}'}]}}
+
+    return FakeServer({'/method/wall.get': wall_get,
+                       '/method/video.get': video_get},
+                      latency=latency)
+
+
+class LocalSource(sources.DefaultSource):
+    """The default source which receives cards from the local server."""
+
+    def __init__(self, url: str, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self._link = url
+
+
+class InstantSource(sources.BaseSource):
+    """A source which returns generated cards without any I/O.
+
+    :param latency: The time in seconds the source waits
+    before it returns a card."""
+
+    def __init__(self, link: str = 'https://instant.example', *args,
+                 latency: float = 0, **kwargs) -> None:
+        super().__init__(link, *args, **kwargs)
+
+        self.latency = latency
+        self._counter = itertools.count()
+
+    async def get_cards_count(self) -> float:
+        return float('inf')
+
+    async def is_valid(self) -> True:
+        return True
+
+    async def get_random_card(self) -> Card:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return Card(f'{self._link}/{next(self._counter)}.jpg', self._link, 'photo')
@@ -0,0 +1,161 @@
+import asyncio
+import gc
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import traceback
+from argparse import Namespace
+from pathlib import Path
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    MutableSequence
+)
+
+project_path = Path(__file__).parent.parent.resolve()
+
+Iteration = Callable[[], Awaitable[Any]]
+Scenario = Callable[..., AsyncIterator[Iteration]]
+
+
+class Benchmark:
+    """A benchmark scenario with the fixed parameters.
+
+    :param name: The name of the scenario.
+    :param scenario: An asynchronous generator that prepares
+    the scenario, yields a coroutine function
+    which is called and timed on every iteration
+    and cleans up after the last iteration.
+    If the coroutine function returns a dictionary,
+    the last returned one is added to the results as metrics.
+    :param params: The keyword arguments passed to the scenario."""
+
+    def __init__(self, name: str,
+                 scenario: Scenario,
+                 params: dict[str, Any]) -> None:
+        self.name = name
+        self.scenario = scenario
+        self.params = params
+
+    @property
+    def full_name(self) -> str:
+        if self.params:
+            params = ','.join(f'{k}={v}' for k, v in self.params.items())
+            return f'{self.name}[{params}]'
+        else:
+            return self.name
+
+    async def run(self, options: Namespace) -> dict[str, Any]:
+        """Run the scenario and return its timings in seconds.
+
+        :param options: The command line options of the benchmarks."""
+        # The game is imported after the environment of the sources is set
+        from Imaginarium import rules_setup
+
+        random.seed(options.seed)
+        result = {'name': self.full_name,
+                  'params': self.params}
+
+        # Every game of the scenario is played with the same seed
+        seed = rules_setup.seed
+        rules_setup.seed = options.seed
+        scenario = self.scenario(options, **self.params)
+        try:
+            iteration = await scenario.__anext__()
+
+            # Warm up caches, connections, etc.
+            await iteration()
+
+            samples = []
+            metrics = None
+            gc.collect()
+            for _ in range(options.repeat):
+                started_at = perf_counter()
+                for _ in range(options.number):
+                    metrics = await iteration()
+                samples.append((perf_counter() - started_at) / options.number)
+        except Exception as e:
+            result['error'] = ''.join(
+                traceback.format_exception_only(type(e), e)).strip()
+            return result
+        finally:
+            await scenario.aclose()
+            rules_setup.seed = seed
+
+        result.update({
+            'repeat': options.repeat,
+            'number': options.number,
+            'min': min(samples),
+            'median': statistics.median(samples),
+            'mean': statistics.mean(samples),
+            'max': max(samples),
+            'stdev': statistics.stdev(samples) if len(samples) > 1 else 0,
+        })
+        if isinstance(metrics, dict):
+            result['metrics'] = metrics
+        return result
+
+
+benchmarks: MutableSequence[Benchmark] = []
+
+
+def benchmark(name: str, **params_values) -> Callable[[Scenario], Scenario]:
+    """Register the scenario for each combination of the parameters.
+
+    :param name: The name of the scenario.
+    :param params_values: The sequences of values of each parameter."""
+
+    def decorator(scenario: Scenario) -> Scenario:
+        for values in itertools.product(*params_values.values()):
+            benchmarks.append(Benchmark(
+                name, scenario, dict(zip(params_values.keys(), values))))
+        return scenario
+
+    return decorator
+
+
+def get_commit() -> str | None:
+    """Return the hash of the current commit if it can be found."""
+    try:
+        return subprocess.run(('git', 'rev-parse', 'HEAD'),
+                              cwd=project_path,
+                              capture_output=True,
+                              text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(options: Namespace) -> dict[str, Any]:
+    """Run the benchmarks matching the options
+    and return a JSON-serializable report."""
+    results = []
+    for b in benchmarks:
+        if options.only and not any(o in b.full_name for o in options.only):
+            continue
+        result = await b.run(options)
+        results.append(result)
+        print(json.dumps(result), file=sys.stderr)
+
+    return {'commit': get_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': options.seed,
+            'results': results}
+
+
+def run(options: Namespace) -> None:
+    report = asyncio.run(run_benchmarks(options))
+
+    if options.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
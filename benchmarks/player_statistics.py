@@ -0,0 +1,60 @@
+import random
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from Imaginarium.statistics import RoundRecord, StatisticsStore
+
+from .harness import benchmark
+
+
+def _random_round(players_ids) -> list[RoundRecord]:
+    return [RoundRecord(player_id, f'Player {player_id}',
+                        random.randint(0, 6), 1, random.randint(0, 1),
+                        2, random.uniform(1, 60))
+            for player_id in players_ids]
+
+
+async def _filled_store(directory: str, players_count: int) -> StatisticsStore:
+    """Return the store with a round played by each of the players."""
+    store = StatisticsStore(Path(directory) / 'statistics.sqlite3')
+    for start in range(0, players_count, 1000):
+        store.record_round(_random_round(
+            range(start, min(start + 1000, players_count))))
+    await store.get_player(0)
+
+    return store
+
+
+@benchmark('statistics.record_round', players_count=(1000, 100000))
+async def record_round(options, players_count):
+    """Add a round of 6 players to the statistics of many players."""
+    with TemporaryDirectory() as directory:
+        store = await _filled_store(directory, players_count)
+        try:
+            async def iteration():
+                store.record_round(_random_round(
+                    random.sample(range(players_count), 6)))
+                # Wait for the write in the background
+                await store.get_player(0)
+
+            yield iteration
+        finally:
+            await store.close()
+
+
+@benchmark('statistics.leaderboard',
+           players_count=(1000, 100000), cached=(False, True))
+async def leaderboard(options, players_count, cached):
+    """Query the leaderboard of many players
+    after every round or between rounds."""
+    with TemporaryDirectory() as directory:
+        store = await _filled_store(directory, players_count)
+        try:
+            async def iteration():
+                if not cached:
+                    store.record_round(_random_round((0,)))
+                await store.get_leaderboard(10)
+
+            yield iteration
+        finally:
+            await store.close()
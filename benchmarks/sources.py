@@ -0,0 +1,83 @@
+import aiohttp
+from aiovk2.drivers import HttpDriver
+
+from Imaginarium import gameplay, sources, tracing
+from Imaginarium.gameplay import GameCondition
+
+from .fakes import LocalSource, random_image_server, vk_server
+from .harness import benchmark
+
+
+def _traced_summary(source) -> dict | None:
+    """Return the summary of the traces of the source per request."""
+    summary = tracing.summaries.get(str(source))
+    if summary is None:
+        return None
+    return {'requests': summary.requests,
+            'attempts_per_request': summary.attempts / summary.requests,
+            'api_calls_per_request': summary.api_calls / summary.requests,
+            'bytes_per_request': summary.bytes / summary.requests,
+            'yield_rate': summary.yield_rate}
+
+
+@benchmark('sources.get_random_cards',
+           cards_count=(1, 6, 36), sample_rate=(0, 1))
+async def get_random_cards(options, cards_count, sample_rate):
+    """Receive cards from the default source served by a local server
+    while the requests are traced or not."""
+    server = random_image_server(latency=options.latency)
+    default_source = gameplay.default_source
+    used_sources = GameCondition._used_sources
+    tracing_sample_rate = tracing.sample_rate
+    try:
+        gameplay.default_source = LocalSource(await server.start() + '/image')
+        GameCondition._used_sources = []
+        tracing.sample_rate = sample_rate
+        tracing.reset()
+
+        async def iteration():
+            await gameplay.get_random_cards(cards_count)
+            return _traced_summary(gameplay.default_source)
+
+        yield iteration
+    finally:
+        gameplay.default_source = default_source
+        GameCondition._used_sources = used_sources
+        tracing.sample_rate = tracing_sample_rate
+        tracing.reset()
+        await server.close()
+
+
+@benchmark('sources.vk.get_random_card',
+           unsuitable_posts_ratio=(0, 0.5), sample_rate=(0, 1))
+async def vk_get_random_card(options, unsuitable_posts_ratio, sample_rate):
+    """Receive cards from a Vk group served by a local server
+    while the requests are traced or not."""
+    server = vk_server(unsuitable_posts_ratio=unsuitable_posts_ratio,
+                       seed=options.seed,
+                       latency=options.latency)
+    vk_session = sources.vk.vk_api._session
+    driver = vk_session.driver
+    tracing_sample_rate = tracing.sample_rate
+    try:
+        tracing.sample_rate = sample_rate
+        tracing.reset()
+        vk_session.REQUEST_URL = await server.start() + '/method/'
+        vk_session.driver = HttpDriver(session=aiohttp.ClientSession())
+        source = sources.Vk('https://vk.com/benchmark')
+
+        async def iteration():
+            with tracing.trace_card(source):
+                await source.get_random_card()
+            return _traced_summary(source)
+
+        yield iteration
+    finally:
+        tracing.sample_rate = tracing_sample_rate
+        tracing.reset()
+        if vk_session.driver is not driver:
+            await vk_session.driver.close()
+        vk_session.driver = driver
+        # Use the Vk API URL of the session class again
+        vars(vk_session).pop('REQUEST_URL', None)
+        await server.close()
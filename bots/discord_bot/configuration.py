@@ -1,5 +1,26 @@
 PREFIX = '.'
 DOWNLOADS_PATH = r'.\saved_files'
+JOURNALS_PATH: str | None = r'.\journals'
+STATISTICS_PATH: str | None = r'.\statistics.sqlite3'
+LANGUAGES_PATH: str | None = r'.\users_languages.sqlite3'
+TIMINGS_ENABLED = True
+TRACING_SAMPLE_RATE = 0.1
+SEED: int | None = None
+# The counts of messages and the periods in seconds
+GLOBAL_SENDS_BUDGET: tuple[int, float] = (50, 1.)
+ROUTE_SENDS_BUDGET: tuple[int, float] = (5, 5.)
+# The time in seconds after which the panels of the players are updated
+PANEL_DEBOUNCE = 0.5
+METRICS_ADDRESS: tuple[str, int] | None = ('127.0.0.1', 9108)
+# The count of the shards or None to use the count recommended by Discord
+SHARD_COUNT: int | None = None
+# The count of the processes between which the shards are split.
+# The process of each next group of the shards serves its metrics
+# at the next port after the metrics of the previous one
+SHARDS_PROCESSES = 1
+# The address at which the process of the first shard
+# relays the direct messages to the other processes
+RELAY_ADDRESS: tuple[str, int] | None = ('127.0.0.1', 9120)
 COGS_NAMES = ('gameplay',
               'getting_game_information',
               'listeners',
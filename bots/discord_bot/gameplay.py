@@ -1,7 +1,9 @@
 import asyncio
-from functools import wraps, partial
+from collections import defaultdict
+from functools import partial
 from io import BytesIO
-from random import randrange, randint
+from os import environ
+from time import perf_counter
 from typing import (
     TypeAlias,
     Iterable,
@@ -15,15 +17,39 @@ from aiohttp import ClientSession
 from discord.ext import commands
 
 import Imaginarium
+import configuration as config
 import messages_components as mc
 import messages_text as mt
+from interaction_router import InteractionRouter, router as interactions_router
+from outbound import Outbound, PROMPT, outbound
+import panels
+from panels import Panel, panel_of
+from relay import RelayedInteraction, RelayedMessage, relay
+from shards import RELAY_SECRET_VARIABLE
+from reply_spec import ReplyChecks, ReplySpec
 from Imaginarium.gameplay import GameCondition
+from Imaginarium.card import DiscardedCard
 from messages_text import users_languages as ul
 
 
+send_seconds = Imaginarium.metrics.histogram(
+    'discord_send_seconds',
+    'The time in seconds a direct message is sent to a player.')
+send_errors = Imaginarium.metrics.counter(
+    'discord_send_errors_total',
+    'The direct messages that could not be sent to players.', ('error',))
+replies = Imaginarium.metrics.counter(
+    'discord_replies_total',
+    'The replies to the requests of the bot by their kinds.', ('kind',))
+reply_seconds = Imaginarium.metrics.histogram(
+    'discord_reply_seconds',
+    'The time in seconds players take to reply to the requests.')
+
+
 class Player(Imaginarium.gameplay.Player, discord.abc.User):
     """Class that inherits from "Imaginarium.gameplay.Player"
     and is used to work with players in discord bot."""
+    __slots__ = ('_user', '_preferred_language')
 
     def __init__(self, user: discord.Member) -> None:
         """Initialize the player.
@@ -72,12 +98,19 @@ class Player(Imaginarium.gameplay.Player, discord.abc.User):
 
     async def send(self, *args, **kwargs) -> discord.Message:
         """Send a message to the member that is the player."""
-        return await self._user.send(*args, **kwargs)
+        try:
+            with send_seconds.time():
+                return await self._user.send(*args, **kwargs)
+        except discord.DiscordException as e:
+            send_errors.labels(type(e).__name__).inc()
+            raise
 
 
 DiscordReply: TypeAlias = (discord.Message |
                            discord.Reaction |
-                           discord_components.Interaction)
+                           discord_components.Interaction |
+                           RelayedMessage |
+                           RelayedInteraction)
 
 
 class Reply:
@@ -97,17 +130,26 @@ class Reply:
         self.discord_reply: DiscordReply = discord_reply
         self.text: str = ''
         match discord_reply:
-            case discord.Message():
+            case discord.Message() | RelayedMessage():
                 self.text = self.discord_reply.content
             case discord.Reaction():
                 self.text = self.discord_reply.emoji
-            case discord_components.Interaction():
+            case discord_components.Interaction() | RelayedInteraction():
                 self.text = self.discord_reply.component.label
             case _:
                 raise AttributeError(
                     f'The "reply" argument is an unknown type. '
                     f'It must be one of the following: '
-                    f'discord.Message, discord.Reaction, discord_components.Interaction')
+                    f'discord.Message, discord.Reaction, discord_components.Interaction '
+                    f'or the ones relayed from another process')
+
+    @property
+    def interaction(self) -> discord_components.Interaction | RelayedInteraction | None:
+        """The click of the button if the reply was given with it."""
+        if isinstance(self.discord_reply,
+                      (discord_components.Interaction, RelayedInteraction)):
+            return self.discord_reply
+        return None
 
     def __repr__(self):
         return self.discord_reply.__repr__()
@@ -137,6 +179,28 @@ ReactionAlias: TypeAlias = (discord.Reaction |
                             str)
 
 
+async def add_reactions(message: discord.Message,
+                        reactions: Iterable[ReactionAlias],
+                        concurrency: int = 3) -> None:
+    """Add the reactions to the message at the same time.
+
+    :param message: The message to which the reactions are added.
+    :param reactions: The reactions in the order they are shown.
+    :param concurrency: The count of the reactions which are being added
+    at the same time.
+
+    .. note:: Discord shows the reactions in the order they were added,
+    which may differ from the order of the reactions
+    if more than one of them are added at the same time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def add_reaction(reaction):
+        async with semaphore:
+            await message.add_reaction(reaction)
+
+    await asyncio.gather(*map(add_reaction, reactions))
+
+
 async def wait_for_reply(
         recipient: discord.abc.Messageable | Player,
         message_text: str = None,
@@ -146,7 +210,11 @@ async def wait_for_reply(
         reaction_check: Callable[[discord.Reaction], bool] = None,
         button_check: Callable[[discord_components.Interaction], bool] = None,
         timeout: float = None,
-        bot: discord.Client = None) -> Reply:
+        deadline: asyncio.Future = None,
+        checks: ReplyChecks = None,
+        router: InteractionRouter = interactions_router,
+        outbound: Outbound = outbound,
+        panel: Panel = None) -> Reply:
     """Wait for a reply from the recipient.
 
     Send a message to the recipient and wait for a correct reply
@@ -154,14 +222,29 @@ async def wait_for_reply(
 
     :param recipient: Discord member or channel that will receive the message.
     :param message_text: Text that will be sent to the recipient.
-    :param reactions: Reactions that will be added to the message.
+    :param reactions: Reactions that will be added to the message,
+    if it has no buttons.
     :param buttons: Buttons that will be added to the message.
     :param message_check: Function that checks if the message is correct.
+    If it is None, then messages are not expected.
     :param reaction_check: Function that checks if the reaction is correct.
+    If it is None, then reactions are not expected.
     :param button_check: Function that checks if the button is correct.
+    If it is None, then buttons are not expected.
     :param timeout: Time in seconds after which the function will
     raise asyncio.TimeoutError.
-    :param bot: Discord client that will be used to wait for a reply.
+    :param deadline: Future after which resolving the function will
+    raise asyncio.TimeoutError.
+    If both timeout and deadline are None,
+    then the deadline of the current game phase is used, if there is one.
+    :param checks: The compiled checks of messages and buttons,
+    which replace message_check and button_check.
+    :param router: The router that passes the replies to the request.
+    :param outbound: The queues through which the message is sent.
+    :param panel: The panel of the recipient which shows the message
+    instead of a new message.
+    The click of a button of the panel is not answered,
+    so it has to be answered with the update of the panel.
 
     :return: Text of the message, label of the button or
     emoji of the reaction.
@@ -173,59 +256,71 @@ async def wait_for_reply(
     That is, if the message was sent to the channel,
     then only messages from the same channel will be expected,
     and if the message was sent directly to the user,
-    then messages in a private channel with this user will be expected."""
-    if bot is None:
-        # noinspection PyUnresolvedReferences
-        bot = wait_for_reply.bot
-    if timeout is None:
-        timeout = Imaginarium.rules_setup.step_timeout
-
-    sent_message = await recipient.send(message_text, components=buttons)
-    for reaction in reactions:
-        await sent_message.add_reaction(reaction)
-
-    def wrapped_message_check(message: discord.Message) -> bool:
-        return True if all((
-            sent_message.channel == message.channel,
-            message_check(message))) else False
-
-    def wrapped_reaction_check(reaction: discord.Reaction) -> bool:
-        return True if all((
-            sent_message.channel == reaction.message.channel,
-            reaction_check(reaction))) else False
-
-    def wrapped_button_check(button: discord_components.Interaction) -> bool:
-        return True if all((
-            sent_message.channel == button.message.channel,
-            button_check(button))) else False
-
-    async def wait_for_message():
-        return await bot.wait_for(event='message',
-                                  check=wrapped_message_check)
-
-    async def wait_for_reaction_add():
-        return (await bot.wait_for(event='reaction_add',
-                                   check=wrapped_reaction_check))[0]
-
-    async def wait_for_button_click():
-        return await bot.wait_for(event='button_click',
-                                  check=wrapped_button_check)
-
-    tasks = (
-        wait_for_message(),
-        wait_for_reaction_add(),
-        wait_for_button_click())
-    tasks = [asyncio.create_task(c) for c in tasks]
-    done, pending = await asyncio.wait(
-        tasks,
-        timeout=timeout,
-        return_when=asyncio.FIRST_COMPLETED)
-    for task in pending:
-        task.cancel()
-
-    if done:
-        return Reply(done.pop().result())
+    then only the user's messages in the private channel will be expected.
+    Reactions and buttons are expected only on the sent message,
+    but messages are expected as soon as the function is called,
+    and the reply is waited for while the reactions are being added."""
+    if checks is not None:
+        message_check, button_check = checks
+    if timeout is None and deadline is None:
+        deadline = GameCondition._phase_deadline
+        if deadline is None:
+            timeout = Imaginarium.rules_setup.step_timeout
+
+    if deadline is not None and deadline.done():
+        raise asyncio.TimeoutError(
+            'Time is up and no correct reply was received.'
+        )
+
+    # The waiter is registered before the message is sent,
+    # so the replies given before it arrives are not missed
+    if isinstance(recipient, discord.abc.User):
+        # The bot's own messages in a private channel are not checked
+        reply = router.wait(user_id=recipient.id,
+                            message_check=message_check,
+                            reaction_check=reaction_check,
+                            button_check=button_check)
     else:
+        reply = router.wait(channel_id=recipient.id,
+                            message_check=message_check,
+                            reaction_check=reaction_check,
+                            button_check=button_check)
+    adding_reactions = None
+    try:
+        if panel is not None:
+            sent_message = await panel.show(message_text, components=buttons)
+        else:
+            # The prompt goes before the messages queued to the recipient
+            sent_message = await outbound.send(recipient, message_text,
+                                               priority=PROMPT, components=buttons)
+        router.attach(reply, sent_message)
+        waiting_started_at = perf_counter()
+
+        # The buttons already offer the choices
+        if reactions and not buttons:
+            # The reply can be given while the reactions are being added
+            adding_reactions = asyncio.create_task(
+                add_reactions(sent_message, reactions))
+
+        # Wait for the shared deadline instead of scheduling an own timer
+        await asyncio.wait(
+            (reply,) if deadline is None else (reply, deadline),
+            timeout=timeout,
+            return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        router.cancel(reply)
+        if adding_reactions is not None:
+            adding_reactions.cancel()
+
+    if reply.done() and not reply.cancelled():
+        reply = Reply(reply.result())
+        replies.labels(type(reply.discord_reply).__name__).inc()
+        if reply.interaction is not None and panel is None:
+            await reply.interaction.respond(type=6)
+        reply_seconds.observe(perf_counter() - waiting_started_at)
+        return reply
+    else:
+        replies.labels('Timeout').inc()
         raise asyncio.TimeoutError(
             'Time is up and no correct reply was received.'
         )
@@ -261,238 +356,24 @@ def try_until(action: Callable[[], Any], check: Callable[[Any], bool]):
             return result
 
 
-MessageCheck: TypeAlias = Callable[[discord.Message], bool]
-ButtonCheck: TypeAlias = Callable[[discord_components.Interaction], bool]
-
-
-def not_bot_message_check_decorator(func: MessageCheck) -> MessageCheck:
-    """Decorator that checks if the message author is not a bot."""
-
-    @wraps(func)
-    def inner(message):
-        if not message.author.bot:
-            return func(message)
-        return False
-
-    return inner
-
-
-def not_bot_button_check_decorator(func: ButtonCheck) -> ButtonCheck:
-    """Decorator that checks if the button author is not a bot."""
-
-    @wraps(func)
-    def inner(interaction):
-        if not interaction.author.bot:
-            return func(interaction)
-        return False
-
-    return inner
-
-
-def digit_message_check_decorator(func: MessageCheck) -> MessageCheck:
-    """Decorator that checks if the message content is a digit."""
-
-    @wraps(func)
-    def inner(message):
-        if message.content.isdigit():
-            return func(message)
-        return False
-
-    return inner
-
-
-def digit_button_check_decorator(func: ButtonCheck) -> ButtonCheck:
-    """Decorator that checks if the button label is a digit."""
-
-    @wraps(func)
-    def inner(interaction):
-        if interaction.component.label.isdigit():
-            return func(interaction)
-        return False
-
-    return inner
-
-
-def in_range_of_cards_message_check_decorator(func: MessageCheck = None,
-                                              *,
-                                              start: int = 1,
-                                              stop: int = None,
-                                              step: int = 1) \
-        -> MessageCheck | Callable[[], MessageCheck]:
-    """Decorator that checks if the message content is a digit
-    that is in range of cards count."""
-    if func is None:
-        return lambda func: in_range_of_cards_message_check_decorator(
-            func,
-            start=start,
-            stop=stop,
-            step=step)
-
-    if stop is None:
-        stop = Imaginarium.rules_setup.cards_per_player + 1
-
-    @wraps(func)
-    def inner(message):
-        if int(message.content) in range(start, stop, step):
-            return func(message)
-
-        return False
-
-    return inner
-
-
-def in_range_of_cards_button_check_decorator(func: ButtonCheck = None,
-                                             *,
-                                             start: int = 1,
-                                             stop: int = None,
-                                             step: int = 1) \
-        -> ButtonCheck | Callable[[], ButtonCheck]:
-    """Decorator that checks if the button label is a digit
-    that is in range of cards count."""
-    if func is None:
-        return lambda func: in_range_of_cards_button_check_decorator(func,
-                                                                     start=start,
-                                                                     stop=stop,
-                                                                     step=step)
-
-    if stop is None:
-        stop = Imaginarium.rules_setup.cards_per_player + 1
-
-    @wraps(func)
-    def inner(interaction):
-        if int(interaction.component.label) in range(start, stop, step):
-            return func(interaction)
-        return False
-
-    return inner
-
-
-def leader_message_check_decorator(func: MessageCheck = None,
-                                   *,
-                                   leader: Player = None) \
-        -> MessageCheck | Callable[[], MessageCheck]:
-    """Decorator that checks if the message author is the leader."""
-    if func is None:
-        return lambda func: leader_message_check_decorator(func,
-                                                           leader=leader)
-
-    if leader is None:
-        leader = GameCondition._leader
-
-    @wraps(func)
-    def inner(message):
-        if message.author == leader:
-            return func(message)
-        return False
-
-    return inner
-
-
-def leader_button_check_decorator(func: ButtonCheck = None,
-                                  *,
-                                  leader: Player = None) \
-        -> ButtonCheck | Callable[[], ButtonCheck]:
-    """Decorator that checks if the button author is the leader."""
-    if func is None:
-        return lambda func: leader_button_check_decorator(func,
-                                                          leader=leader)
-
-    if leader is None:
-        leader = GameCondition._leader
-
-    @wraps(func)
-    def inner(interaction):
-        if interaction.author == leader:
-            return func(interaction)
-        return False
-
-    return inner
-
-
-def not_leader_message_check_decorator(func: MessageCheck = None,
-                                       *,
-                                       leader: Player = None) \
-        -> MessageCheck | Callable[[], MessageCheck]:
-    """Decorator that checks if the message author is not the leader."""
-    if func is None:
-        return lambda func: not_leader_message_check_decorator(func,
-                                                               leader=leader)
-
-    if leader is None:
-        leader = GameCondition._leader
-
-    @wraps(func)
-    def inner(message):
-        if message.author != leader:
-            return func(message)
-        return False
-
-    return inner
-
-
-def not_leader_button_check_decorator(func: ButtonCheck = None,
-                                      *,
-                                      leader: Player = None):
-    """Decorator that checks if the button author is not the leader."""
-    if func is None:
-        return lambda func: not_leader_button_check_decorator(func,
-                                                              leader=leader)
-
-    if leader is None:
-        leader = GameCondition._leader
-
-    @wraps(func)
-    def inner(interaction):
-        if interaction.author.id != leader.id:
-            return func(interaction)
-        return False
-
-    return inner
-
-
-def selected_card_message_check_decorator(func: MessageCheck) -> MessageCheck:
-    """Decorator that checks if the message content can be interpreted
-    as a selected card."""
-    func = in_range_of_cards_message_check_decorator(func)
-    func = digit_message_check_decorator(func)
-    func = not_bot_message_check_decorator(func)
-
-    return func
-
-
-def selected_card_button_check_decorator(func: ButtonCheck) -> ButtonCheck:
-    """Decorator that checks if the button label can be interpreted
-    as a selected card."""
-    func = in_range_of_cards_button_check_decorator(func)
-    func = digit_button_check_decorator(func)
-    func = not_bot_button_check_decorator(func)
-
-    return func
-
-
 async def at_start_hook():
     """Send a message to the channel that the game has started."""
-    await Gameplay.start.ctx.send(mt.game_has_started())
+    panels.clear()
+    # The hooks look up the languages of the players in memory
+    await ul.load(GameCondition._players)
+    outbound.post(Gameplay.start.ctx.channel, mt.game_has_started())
 
 
 async def at_round_start_hook():
     """Send a message to the channel that the round has started."""
-    await Gameplay.start.ctx.send(mt.round_has_started())
+    outbound.post(Gameplay.start.ctx.channel, mt.round_has_started())
 
 
 # noinspection PyTypeChecker
 async def request_association_hook():
     """Do not continue the game until the association is specified."""
-
-    @not_bot_message_check_decorator
-    @leader_message_check_decorator
-    def message_check(message: discord.Message) -> bool:
-        return True
-
-    @not_bot_button_check_decorator
-    @leader_button_check_decorator
-    def button_check(message: discord_components.Interaction) -> bool:
-        return True
+    checks = ReplySpec(users=(GameCondition._leader.id,)).compile()
+    panel = panel_of(GameCondition._leader)
 
     try:
         association = \
@@ -500,18 +381,21 @@ async def request_association_hook():
                 recipient=GameCondition._leader,
                 message_text=mt.inform_association(message_language=ul[GameCondition._leader]),
                 buttons=mc.confirm_association(message_language=ul[GameCondition._leader]),
-                message_check=message_check,
-                button_check=button_check)
-        if isinstance(association.discord_reply, discord_components.Interaction):
+                checks=checks,
+                panel=panel)
+        Imaginarium.gameplay.mark_answered(GameCondition._leader)
+        # Remove the button, which is not needed anymore
+        panel.update(
+            mt.inform_association(message_language=ul[GameCondition._leader]),
+            interaction=association.interaction)
+        if association.interaction is not None:
             association = r'¯\_(ツ)_/¯'
     except asyncio.TimeoutError:
         association = r'¯\_(ツ)_/¯'
 
-        await GameCondition._leader.send(
-            mt.association_selected_automatically(
-                association=association,
-                message_language=ul[GameCondition._leader])
-        )
+        panel.update(mt.association_selected_automatically(
+            association=association,
+            message_language=ul[GameCondition._leader]))
 
     GameCondition._round_association = association
 
@@ -519,35 +403,20 @@ async def request_association_hook():
 async def show_association_hook():
     """Send the association to the channel."""
     if GameCondition._round_association:
-        await Gameplay.start.ctx.send(mt.round_association())
+        outbound.post(Gameplay.start.ctx.channel, mt.round_association())
 
 
 async def request_players_cards_2_hook():
     """Request each player to choose 2 cards to discard in two-player mode
     or choose the cards automatically if the player's time is up."""
-    # Remember discarded card to not allow the player to choose it again.
-    discarded_card = None
-
-    @selected_card_message_check_decorator
-    def message_check(message: discord.Message) -> bool:
-        num = int(message.content)
-
-        # Check the number is not equal to the previous discarded card
-        if num != discarded_card:
-            return True
-        return False
-
-    @selected_card_button_check_decorator
-    def button_check(interaction: discord_components.Interaction) -> bool:
-        num = int(interaction.component.label)
-
-        # Check the number is not equal to the previous discarded card
-        if num != discarded_card:
-            return True
-        return False
+    cards_numbers = range(1, Imaginarium.rules_setup.cards_per_player + 1)
+    first_card_checks = ReplySpec(numbers=cards_numbers).compile()
 
     async def request_card_from_one_player(player):
-        nonlocal discarded_card
+        # Remember discarded card to not allow the player to choose it again.
+        discarded_card = None
+        checks = first_card_checks
+        panel = panel_of(player)
 
         for message in (
                 mt.choose_first_card(
@@ -557,30 +426,36 @@ async def request_players_cards_2_hook():
                     player.cards,
                     message_language=ul[player])):
             try:
-                card = int(await wait_for_reply(
+                reply = await wait_for_reply(
                     recipient=player,
                     message_text=message,
-                    message_check=message_check,
-                    button_check=button_check,
-                    buttons=mc.players_cards()))
+                    checks=checks,
+                    buttons=mc.players_cards(),
+                    panel=panel)
             except asyncio.TimeoutError:
                 card = try_until(
-                    partial(randrange, Imaginarium.rules_setup.cards_per_player),
+                    partial(GameCondition._random.game.randrange,
+                            Imaginarium.rules_setup.cards_per_player),
                     lambda num: num != discarded_card)
-                await player.send(
-                    mt.card_selected_automatically(
-                        player.cards[card - 1],
-                        message_language=ul[player]))
-            else:
-                await player.send(mt.your_chosen_card(
+                panel.update(mt.card_selected_automatically(
                     player.cards[card - 1],
                     message_language=ul[player]))
+            else:
+                card = int(reply)
+                panel.update(mt.your_chosen_card(
+                    player.cards[card - 1],
+                    message_language=ul[player]),
+                    interaction=reply.interaction)
 
-            GameCondition._discarded_cards.append((player.cards[card - 1],
-                                                   player.id))
+            GameCondition._discarded_cards.append(
+                DiscardedCard(player.cards[card - 1], player.id))
 
             # Set the first discarded card
             discarded_card = card
+            checks = ReplySpec(numbers=cards_numbers,
+                               excluded_numbers=(discarded_card,)).compile()
+
+        Imaginarium.gameplay.mark_answered(player)
 
     tasks = []
     for player in GameCondition._players:
@@ -591,78 +466,73 @@ async def request_players_cards_2_hook():
 
 async def request_leader_card_hook():
     """Request the leader to choose a card to discard."""
-
-    @selected_card_message_check_decorator
-    @leader_message_check_decorator
-    def message_check(message: discord.Message) -> bool:
-        return True
-
-    @selected_card_button_check_decorator
-    @leader_button_check_decorator
-    def button_check(interaction: discord_components.Interaction) -> bool:
-        return True
+    checks = ReplySpec(
+        users=(GameCondition._leader.id,),
+        numbers=range(1, Imaginarium.rules_setup.cards_per_player + 1)).compile()
+    panel = panel_of(GameCondition._leader)
 
     try:
-        card = int(await wait_for_reply(
+        reply = await wait_for_reply(
             recipient=GameCondition._leader,
             message_text=mt.choose_your_leaders_card(
                 message_language=ul[GameCondition._leader]),
-            message_check=message_check,
-            button_check=button_check,
-            buttons=mc.players_cards()))
+            checks=checks,
+            buttons=mc.players_cards(),
+            panel=panel)
     except asyncio.TimeoutError:
-        card = randrange(Imaginarium.rules_setup.cards_per_player)
-        await GameCondition._leader.send(
-            mt.card_selected_automatically(
-                GameCondition._leader.cards[card - 1],
-                message_language=ul[GameCondition._leader]))
-    else:
-        await GameCondition._leader.send(mt.your_chosen_card(
+        card = GameCondition._random.game.randrange(
+            Imaginarium.rules_setup.cards_per_player)
+        panel.update(mt.card_selected_automatically(
             GameCondition._leader.cards[card - 1],
             message_language=ul[GameCondition._leader]))
+    else:
+        card = int(reply)
+        Imaginarium.gameplay.mark_answered(GameCondition._leader)
+        panel.update(mt.your_chosen_card(
+            GameCondition._leader.cards[card - 1],
+            message_language=ul[GameCondition._leader]),
+            interaction=reply.interaction)
 
     GameCondition._discarded_cards.append(
-        (GameCondition._leader.cards.pop(card - 1),
-         GameCondition._leader.id))
+        DiscardedCard(GameCondition._leader.cards.pop(card - 1),
+                      GameCondition._leader.id))
 
 
 async def request_players_cards_hook():
     """Request each player except the leader to choose a card to discard
     or choose the card automatically if the player's time is up."""
-
-    @selected_card_message_check_decorator
-    @not_leader_message_check_decorator
-    def message_check(message: discord.Message) -> bool:
-        return True
-
-    @selected_card_button_check_decorator
-    @not_leader_button_check_decorator
-    def button_check(message: discord.Message) -> bool:
-        return True
+    checks = ReplySpec(
+        excluded_users=(GameCondition._leader.id,),
+        numbers=range(1, Imaginarium.rules_setup.cards_per_player + 1)).compile()
 
     async def request_cards_from_one_player(player):
+        panel = panel_of(player)
         try:
-            card = int(await wait_for_reply(
+            reply = await wait_for_reply(
                 recipient=player,
                 message_text=mt.choose_card(
                     player.cards,
                     message_language=ul[player]),
-                message_check=message_check,
-                button_check=button_check,
-                buttons=mc.players_cards()))
+                checks=checks,
+                buttons=mc.players_cards(),
+                panel=panel)
         except asyncio.TimeoutError:
-            card = randrange(Imaginarium.rules_setup.cards_per_player)
-            await player.send(
-                mt.card_selected_automatically(
-                    player.cards[card - 1],
-                    message_language=ul[player]))
-        else:
-            await player.send(mt.your_chosen_card(
+            card = GameCondition._random.game.randrange(
+                Imaginarium.rules_setup.cards_per_player)
+            panel.update(mt.card_selected_automatically(
                 player.cards[card - 1],
                 message_language=ul[player]))
+        else:
+            card = int(reply)
+            panel.update(mt.your_chosen_card(
+                player.cards[card - 1],
+                message_language=ul[player]),
+                interaction=reply.interaction)
 
-        GameCondition._discarded_cards.append((player.cards.pop(card - 1),
-                                               player.id))
+        GameCondition._discarded_cards.append(
+            DiscardedCard(player.cards.pop(card - 1), player.id))
+
+        Imaginarium.gameplay.mark_answered(player)
 
     tasks = []
     for player in GameCondition._players:
@@ -675,133 +545,142 @@ async def request_players_cards_hook():
 def select_target_card_automatically(player: Player) -> int:
     """Select a card that was not discarded by the player himself."""
     return try_until(
-        partial(randint, 1, GameCondition._players_count),
-        lambda num: GameCondition._discarded_cards[num - 1][1] != player.id)
+        partial(GameCondition._random.game.randint,
+                1, GameCondition._players_count),
+        lambda num: GameCondition._discarded_cards[num - 1].owner != player.id)
 
 
-# noinspection DuplicatedCode
-async def vote_for_target_card_2_hook():
-    """Request each player to vote for the bot's card in two-player mode."""
+def compile_vote_checks(excluded_users: Iterable[int] = ()) -> ReplyChecks:
+    """Compile the checks of the votes for the discarded cards,
+    which do not allow players to vote for their own cards.
 
-    @selected_card_message_check_decorator
-    def message_check(message: discord.Message) -> bool:
-        if GameCondition._discarded_cards[int(message.content) - 1][1] != \
-                message.author.id:
-            return True
-        return False
-
-    @selected_card_button_check_decorator
-    def button_check(interaction: discord_components.Interaction) -> bool:
-        if GameCondition._discarded_cards[int(interaction.component.label) - 1][1] != \
-                interaction.user.id:
-            return True
-        return False
-
-    async def one_player_vote_for_target_card(player):
-        try:
-            card = int(
-                await wait_for_reply(
-                    recipient=player,
-                    message_text=mt.choose_enemy_card(
-                        message_language=ul[player]),
-                    message_check=message_check,
-                    button_check=button_check,
-                    buttons=mc.discarded_cards()))
-        except asyncio.TimeoutError:
-            card = select_target_card_automatically(player)
-            await player.send(
-                mt.card_selected_automatically(
-                    GameCondition._discarded_cards[card - 1][0],
-                    message_language=ul[player]))
-        else:
-            await player.send(mt.your_chosen_card(
-                GameCondition._discarded_cards[card - 1][0],
-                message_language=ul[player]))
+    :param excluded_users: The IDs of the users who cannot vote."""
+    own_cards = defaultdict(list)
+    for number, (_, owner) in enumerate(GameCondition._discarded_cards, start=1):
+        own_cards[owner].append(number)
 
-        GameCondition._votes_for_card[
-            GameCondition._discarded_cards[card - 1][1]] += 1
+    return ReplySpec(excluded_users=excluded_users,
+                     numbers=range(1, len(GameCondition._discarded_cards) + 1),
+                     excluded_numbers_by_users=own_cards).compile()
 
-        player.chosen_card = card
+
+async def vote_for_target_card(player: Player, checks: ReplyChecks) -> None:
+    """Request the player to vote for the card
+    or choose the card automatically if the player's time is up."""
+    panel = panel_of(player)
+    try:
+        reply = await wait_for_reply(
+            recipient=player,
+            message_text=mt.choose_enemy_card(
+                message_language=ul[player]),
+            checks=checks,
+            buttons=mc.discarded_cards(),
+            panel=panel)
+    except asyncio.TimeoutError:
+        card = select_target_card_automatically(player)
+        panel.update(mt.card_selected_automatically(
+            GameCondition._discarded_cards[card - 1].card,
+            message_language=ul[player]))
+    else:
+        card = int(reply)
+        panel.update(mt.your_chosen_card(
+            GameCondition._discarded_cards[card - 1].card,
+            message_language=ul[player]),
+            interaction=reply.interaction)
+
+    GameCondition._votes_for_card[
+        GameCondition._discarded_cards[card - 1].owner] += 1
+
+    player.chosen_card = card
+
+    Imaginarium.gameplay.mark_answered(player)
+
+
+async def vote_for_target_card_2_hook():
+    """Request each player to vote for the bot's card in two-player mode."""
+    checks = compile_vote_checks()
 
     tasks = []
     for player in GameCondition._players:
-        tasks.append(one_player_vote_for_target_card(player))
+        tasks.append(vote_for_target_card(player, checks))
 
     await asyncio.gather(*tasks)
 
 
-# noinspection DuplicatedCode
 async def vote_for_target_card_hook():
     """Request each player to vote for the leader's card."""
-
-    @selected_card_message_check_decorator
-    @not_leader_message_check_decorator
-    def message_check(message: discord.Message) -> bool:
-        if GameCondition._discarded_cards[int(message.content) - 1][1] != \
-                message.author.id:
-            return True
-        return False
-
-    @selected_card_button_check_decorator
-    @not_leader_button_check_decorator
-    def button_check(interaction: discord_components.Interaction) -> bool:
-        if GameCondition._discarded_cards[int(interaction.component.label) - 1][1] != \
-                interaction.user.id:
-            return True
-        return False
-
-    async def one_player_vote_for_target_card(player):
-        try:
-            card = int(await wait_for_reply(
-                recipient=player,
-                message_text=mt.choose_enemy_card(
-                    message_language=ul[player]),
-                message_check=message_check,
-                button_check=button_check,
-                buttons=mc.discarded_cards()))
-        except asyncio.TimeoutError:
-            card = select_target_card_automatically(player)
-            await player.send(
-                mt.card_selected_automatically(
-                    GameCondition._discarded_cards[card - 1][0],
-                    message_language=ul[player]))
-        else:
-            await player.send(mt.your_chosen_card(
-                GameCondition._discarded_cards[card - 1][0],
-                message_language=ul[player]))
-
-        GameCondition._votes_for_card[
-            GameCondition._discarded_cards[card - 1][1]] += 1
-
-        player.chosen_card = card
+    checks = compile_vote_checks(excluded_users=(GameCondition._leader.id,))
 
     tasks = []
     for player in GameCondition._players:
         if player != GameCondition._leader:
-            tasks.append(one_player_vote_for_target_card(player))
+            tasks.append(vote_for_target_card(player, checks))
 
     await asyncio.gather(*tasks)
 
 
+async def show_phase_progress_hook():
+    """Send the count of players who have made the choice to the channel."""
+    outbound.post(Gameplay.start.ctx.channel, mt.phase_progress())
+
+
 async def at_end_hook():
     """Announce the results of the game."""
-    await Gameplay.start.ctx.send(mt.game_took_time())
+    outbound.post(Gameplay.start.ctx.channel, mt.game_took_time())
 
     if GameCondition._players_count == 2:
         if GameCondition._bot_score > GameCondition._players_score:
-            await Gameplay.start.ctx.send(mt.loss_score())
+            outbound.post(Gameplay.start.ctx.channel, mt.loss_score())
         elif GameCondition._bot_score < GameCondition._players_score:
-            await Gameplay.start.ctx.send(mt.win_score())
+            outbound.post(Gameplay.start.ctx.channel, mt.win_score())
         else:
-            await Gameplay.start.ctx.send(mt.draw_score())
+            outbound.post(Gameplay.start.ctx.channel, mt.draw_score())
     else:
-        await Gameplay.start.ctx.send(mt.winning_rating())
+        outbound.post(Gameplay.start.ctx.channel, mt.winning_rating())
 
 
 class Gameplay(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    def cog_unload(self):
+        self.bot.loop.create_task(relay.close())
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # The relay is needed only if the shards are split between processes,
+        # and the event is dispatched again after reconnections
+        if (self.bot.shard_ids is None or config.RELAY_ADDRESS is None or
+                relay.is_running):
+            return
+        secret = environ[RELAY_SECRET_VARIABLE]
+        if 0 in self.bot.shard_ids:
+            await relay.serve(*config.RELAY_ADDRESS, secret)
+        else:
+            await relay.connect(*config.RELAY_ADDRESS, secret, self.bot.http)
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        interactions_router.dispatch_message(message)
+        # Only the process of the first shard receives the direct messages
+        if relay.is_hub and message.guild is None and not message.author.bot:
+            relay.forward_message(message)
+
+    @commands.Cog.listener()
+    async def on_reaction_add(self, reaction, user):
+        interactions_router.dispatch_reaction(reaction)
+
+    @commands.Cog.listener()
+    async def on_button_click(self, interaction):
+        # The clicks the requests wait for are answered by the requests
+        if interactions_router.dispatch_button_click(interaction):
+            return
+        if (relay.is_hub and 'guild_id' not in interaction.raw_data and
+                await relay.forward_button_click(interaction)):
+            return
+        # Ignore the "This interaction failed" error
+        await interaction.respond(type=6)
+
     @commands.command()
     async def join(self, ctx):
         """Join the game."""
@@ -846,7 +725,8 @@ class Gameplay(commands.Cog):
                 request_players_cards_hook=request_players_cards_hook,
                 vote_for_target_card_2_hook=vote_for_target_card_2_hook,
                 vote_for_target_card_hook=vote_for_target_card_hook,
-                at_end_hook=at_end_hook)
+                at_end_hook=at_end_hook,
+                show_phase_progress_hook=show_phase_progress_hook)
         except Imaginarium.exceptions.GameIsStarted:
             await ctx.send(mt.game_already_started())
         except Imaginarium.exceptions.NoAnyUsedSources:
@@ -866,6 +746,12 @@ class Gameplay(commands.Cog):
 
 
 def setup(bot):
-    wait_for_reply.bot = bot
+    Imaginarium.setting_up_game.set_journal_directory(config.JOURNALS_PATH)
+    Imaginarium.setting_up_game.set_statistics_path(config.STATISTICS_PATH)
+    Imaginarium.timings.enabled = config.TIMINGS_ENABLED
+    Imaginarium.tracing.sample_rate = config.TRACING_SAMPLE_RATE
+    Imaginarium.setting_up_game.set_seed(config.SEED)
+    outbound.set_budgets(config.GLOBAL_SENDS_BUDGET, config.ROUTE_SENDS_BUDGET)
+    panels.debounce = config.PANEL_DEBOUNCE
 
     bot.add_cog(cog=Gameplay(bot))
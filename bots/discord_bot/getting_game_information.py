@@ -36,6 +36,17 @@ class GettingGameInformation(commands.Cog):
             await ctx.author.send(mt.players_score(
                 message_language=ul[ctx.author]))
 
+    @commands.command()
+    async def get_leaderboard(self, ctx):
+        leaders = await Imaginarium.getting_game_information.get_leaderboard()
+        if leaders:
+            await ctx.author.send(mt.leaderboard(
+                leaders,
+                message_language=ul[ctx.author]))
+        else:
+            await ctx.author.send(mt.no_any_statistics(
+                message_language=ul[ctx.author]))
+
     @commands.command()
     async def get_used_cards(self, ctx):
         if Imaginarium.getting_game_information.get_used_cards():
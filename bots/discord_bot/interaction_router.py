@@ -0,0 +1,222 @@
+"""The routing of the users' replies to the requests of the bot.
+
+Every request registers a waiter in the router,
+which indexes the waiters by the channel and the author of messages
+and by the messages to which reactions and buttons belong.
+The listeners pass each event only to the waiters
+it can be addressed to, so the cost of an event does not depend
+on the count of the requests waiting for replies.
+
+A waiter can be registered before its message is sent,
+so the replies given before the message arrives are not missed,
+and attached to the message when it is sent."""
+import asyncio
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    MutableMapping,
+    MutableSequence
+)
+
+Check = Callable[[Any], bool]
+
+
+class Waiter:
+    """A request waiting for a reply.
+
+    :param future: The future which result is set to the reply.
+    :param channel_id: The ID of the channel in which
+    the request was sent, or None if it is the private channel
+    of the user.
+    :param message_id: The ID of the message of the request,
+    or None if it was not sent yet.
+    :param user_id: The ID of the only user whose messages are checked,
+    or None if the messages of everyone are checked.
+    :param message_check: The check of the replies with messages
+    or None if they are not expected.
+    :param reaction_check: The check of the replies with reactions
+    or None if they are not expected.
+    :param button_check: The check of the replies with buttons
+    or None if they are not expected."""
+    __slots__ = ('future', 'channel_id', 'message_id', 'user_id',
+                 'message_check', 'reaction_check', 'button_check')
+
+    def __init__(self, future: asyncio.Future,
+                 channel_id: int | None,
+                 message_id: int | None,
+                 user_id: int | None,
+                 message_check: Check | None,
+                 reaction_check: Check | None,
+                 button_check: Check | None) -> None:
+        self.future = future
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.user_id = user_id
+        self.message_check = message_check
+        self.reaction_check = reaction_check
+        self.button_check = button_check
+
+
+def _add(index: MutableMapping[Hashable, MutableSequence[Waiter]],
+         key: Hashable, waiter: Waiter) -> None:
+    try:
+        index[key].append(waiter)
+    except KeyError:
+        index[key] = [waiter]
+
+
+def _remove(index: MutableMapping[Hashable, MutableSequence[Waiter]],
+            key: Hashable, waiter: Waiter) -> None:
+    waiters = index.get(key)
+    if waiters is not None:
+        waiters.remove(waiter)
+        if not waiters:
+            del index[key]
+
+
+class InteractionRouter:
+    """Resolves the waiters of the replies by the incoming events."""
+
+    def __init__(self) -> None:
+        self._waiters: dict[asyncio.Future, Waiter] = {}
+        self._by_channel: dict[tuple[int | None, int | None], list[Waiter]] = {}
+        """The waiters of messages by the IDs of the channels,
+        which are None for the private channels of the authors,
+        and the IDs of the authors, which are None
+        if the messages of everyone are checked."""
+        self._by_message: dict[int, list[Waiter]] = {}
+        """The waiters of reactions and buttons by the IDs of the messages."""
+
+    def __len__(self) -> int:
+        """Return the count of the waiters that have not been resolved."""
+        return len(self._waiters)
+
+    def wait(self, message: Any = None,
+             user_id: int | None = None,
+             message_check: Check | None = None,
+             reaction_check: Check | None = None,
+             button_check: Check | None = None, *,
+             channel_id: int | None = None) -> asyncio.Future:
+        """Start waiting for a reply to the message.
+
+        :param message: The message of the request,
+        or None if it is attached by the attach method after it is sent.
+        :param user_id: The ID of the only user whose messages are checked,
+        or None to check the messages of everyone in the channel.
+        :param message_check: The check of the replies with messages
+        in the channel of the message, or None to not expect them.
+        :param reaction_check: The check of the reactions
+        to the message, or None to not expect them.
+        :param button_check: The check of the clicks of the buttons
+        of the message, or None to not expect them.
+        :param channel_id: The ID of the channel of the message
+        if the message is not passed. If both are None,
+        then the messages are expected in the private channel of the user.
+
+        :return: The future which result is set to the first event
+        that passed the check, or to the exception raised by the check.
+        It has to be passed to the cancel method
+        if it is not needed anymore.
+
+        :raise ValueError: If neither the message, the channel
+        nor the user is passed."""
+        if message is not None:
+            channel_id = message.channel.id
+        elif channel_id is None and user_id is None:
+            raise ValueError('The channel of the messages is unknown.')
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = Waiter(future, channel_id, None, user_id,
+                        message_check, reaction_check, button_check)
+        self._waiters[future] = waiter
+        if message_check is not None:
+            _add(self._by_channel, (channel_id, user_id), waiter)
+        if message is not None:
+            self.attach(future, message)
+
+        return future
+
+    def attach(self, future: asyncio.Future, message: Any) -> None:
+        """Start waiting for the reactions and the buttons
+        of the sent message.
+
+        :param future: The future returned by the wait method.
+        :param message: The sent message of the request."""
+        waiter = self._waiters.get(future)
+        if waiter is None or waiter.message_id is not None:
+            return
+        waiter.message_id = message.id
+        if waiter.reaction_check is not None or waiter.button_check is not None:
+            _add(self._by_message, waiter.message_id, waiter)
+
+    def cancel(self, future: asyncio.Future) -> None:
+        """Stop waiting for the reply.
+
+        :param future: The future returned by the wait method."""
+        waiter = self._waiters.get(future)
+        if waiter is not None:
+            self._forget(waiter)
+            future.cancel()
+
+    def _forget(self, waiter: Waiter) -> None:
+        del self._waiters[waiter.future]
+        if waiter.message_check is not None:
+            _remove(self._by_channel, (waiter.channel_id, waiter.user_id), waiter)
+        if waiter.message_id is not None and (
+                waiter.reaction_check is not None or
+                waiter.button_check is not None):
+            _remove(self._by_message, waiter.message_id, waiter)
+
+    def _check(self, waiter: Waiter, check: Check | None, event: Any) -> bool:
+        """Resolve the waiter by the event if it passes the check.
+
+        :return: Whether the waiter was resolved by the event."""
+        if check is None or waiter.future.done():
+            return False
+        try:
+            passed = check(event)
+        except Exception as e:
+            self._forget(waiter)
+            waiter.future.set_exception(e)
+            return False
+        else:
+            if passed:
+                self._forget(waiter)
+                waiter.future.set_result(event)
+            return bool(passed)
+
+    def dispatch_message(self, message: Any) -> None:
+        """Pass the message to the waiters of its channel."""
+        channel_id = message.channel.id
+        keys = [(channel_id, message.author.id), (channel_id, None)]
+        if message.guild is None:
+            keys.append((None, message.author.id))
+        for key in keys:
+            waiters = self._by_channel.get(key)
+            if waiters:
+                # The waiters are removed from the list when they are resolved
+                for waiter in tuple(waiters):
+                    self._check(waiter, waiter.message_check, message)
+
+    def dispatch_reaction(self, reaction: Any) -> None:
+        """Pass the added reaction to the waiters of its message."""
+        waiters = self._by_message.get(reaction.message.id)
+        if waiters:
+            for waiter in tuple(waiters):
+                self._check(waiter, waiter.reaction_check, reaction)
+
+    def dispatch_button_click(self, interaction: Any) -> bool:
+        """Pass the click of a button to the waiters of its message.
+
+        :return: Whether a waiter was resolved by the click."""
+        resolved = False
+        waiters = self._by_message.get(interaction.message.id)
+        if waiters:
+            for waiter in tuple(waiters):
+                resolved |= self._check(waiter, waiter.button_check, interaction)
+        return resolved
+
+
+router = InteractionRouter()
+"""The router of the replies to the requests of the bot."""
@@ -1,16 +1,41 @@
 from discord.ext import commands
 
+import Imaginarium
 import configuration as config
 import messages_text as mt
 from messages_text import users_languages as ul
 
 
+command_errors = Imaginarium.metrics.counter(
+    'discord_command_errors_total',
+    'The errors of the commands by their types.', ('error',))
+latency = Imaginarium.metrics.gauge(
+    'discord_latency_seconds',
+    'The latency between a heartbeat and its acknowledgement.')
+
+
 class Listeners(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.metrics_server = None
+
+        latency.set_function(lambda: self.bot.latency)
+
+    def cog_unload(self):
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # The event is dispatched again after reconnections
+        if self.metrics_server is None and config.METRICS_ADDRESS is not None:
+            self.metrics_server = await Imaginarium.metrics.serve(
+                *config.METRICS_ADDRESS)
 
     @commands.Cog.listener()
     async def on_command_error(self, ctx, error):
+        command_errors.labels(type(error).__name__).inc()
+
         # Do not handle command errors if the command has its own
         if not hasattr(ctx.command, 'on_error'):
             return
@@ -42,12 +67,6 @@ class Listeners(commands.Cog):
             case _:
                 raise error
 
-    @commands.Cog.listener()
-    async def on_button_click(self, interaction):
-        if not interaction.responded:
-            # Ignore the "This interaction failed" error
-            await interaction.respond(type=6)
-
 
 def setup(bot):
     bot.add_cog(cog=Listeners(bot))
@@ -1,3 +1,5 @@
+import asyncio
+from argparse import ArgumentParser, Namespace
 from os import environ
 from pathlib import Path
 import sys
@@ -25,14 +27,21 @@ else:
 import configuration as config
 import messages_text as mt
 from messages_text import users_languages as ul
+from shards import (
+    RELAY_SECRET_VARIABLE,
+    ShardsSupervisor,
+    recommended_shard_count,
+    watch_supervisor
+)
 
 load_dotenv()
 
 # Add directory with cogs to search for
 sys.path.append(environ['PATH_TO_DISCORD_COGS_DIRECTORY'])
 
-bot = commands.Bot(command_prefix=config.PREFIX,
-                   intents=Intents.all())
+bot = commands.AutoShardedBot(command_prefix=config.PREFIX,
+                              intents=Intents.all(),
+                              shard_count=config.SHARD_COUNT)
 bot.remove_command('help')
 
 
@@ -113,7 +122,48 @@ async def reload_extensions(ctx):
         bot.reload_extension(extension)
 
 
+def parse_arguments(args: list[str] = None) -> Namespace:
+    parser = ArgumentParser(description='Run the Discord bot.')
+    parser.add_argument('--shard-ids', type=int, nargs='+',
+                        help='The IDs of the shards the process runs. '
+                             'All the shards are run by default.')
+    parser.add_argument('--shard-count', type=int,
+                        help='The count of all the shards of the bot.')
+    parser.add_argument('--process-index', type=int, default=0,
+                        help='The index of the process among the processes '
+                             'of the shards.')
+    arguments = parser.parse_args(args)
+    if arguments.shard_ids is not None and arguments.shard_count is None:
+        parser.error('the --shard-count argument is required with --shard-ids')
+    if (arguments.shard_ids is not None and config.RELAY_ADDRESS is not None and
+            not environ.get(RELAY_SECRET_VARIABLE)):
+        parser.error(f'the {RELAY_SECRET_VARIABLE} environment variable '
+                     f'is required with --shard-ids')
+
+    return arguments
+
+
 def main():
+    arguments = parse_arguments()
+
+    if arguments.shard_ids is None and config.SHARDS_PROCESSES > 1:
+        shard_count = (config.SHARD_COUNT or
+                       recommended_shard_count(environ['DISCORD_BOT_TOKEN']))
+        # Every process runs at least one shard
+        ShardsSupervisor(__file__,
+                         max(shard_count, config.SHARDS_PROCESSES),
+                         config.SHARDS_PROCESSES).run()
+        return
+
+    if arguments.shard_ids is not None:
+        bot.shard_ids = arguments.shard_ids
+        bot.shard_count = arguments.shard_count
+        if config.METRICS_ADDRESS is not None:
+            host, port = config.METRICS_ADDRESS
+            config.METRICS_ADDRESS = (host, port + arguments.process_index)
+        watch_supervisor(
+            lambda: asyncio.run_coroutine_threadsafe(bot.close(), bot.loop))
+
     for extension in get_extensions():
         bot.load_extension(extension)
 
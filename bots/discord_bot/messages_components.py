@@ -1,6 +1,7 @@
 from itertools import repeat
 from typing import (
     TypeAlias,
+    Callable,
     Iterable,
     MutableSequence
 )
@@ -59,6 +60,56 @@ def generate_buttons(labels: Iterable[str | int],
     return buttons
 
 
+class FrozenList(list):
+    """The list which cannot be changed,
+    so the cached components can be shared by all the messages.
+
+    It is still a list, since the components of the messages
+    are expected to be lists of rows."""
+    __slots__ = ()
+
+    def _frozen(self, *args, **kwargs):
+        raise TypeError('The cached components cannot be changed.')
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _frozen
+    append = extend = insert = pop = remove = clear = sort = reverse = _frozen
+
+
+ButtonsLayoutKey: TypeAlias = tuple[str, int, int, str | None]
+
+_layouts: dict[ButtonsLayoutKey, ButtonsComponent] = {}
+"""The layouts of the buttons by their kinds, the counts of the buttons,
+their styles and languages."""
+_layouts_cards_per_player: int | None = None
+"""The count of cards per player with which the layouts were built."""
+
+
+def cached_layout(key: ButtonsLayoutKey,
+                  build: Callable[[], ButtonsComponent]) -> ButtonsComponent:
+    """Return the layout of the buttons built once for the key.
+
+    :param key: The kind of the layout, the count of the buttons,
+    their style and the language of their labels.
+    :param build: The function which builds the layout.
+
+    :return: The layout, which is shared and cannot be changed.
+
+    .. note:: The layouts are built again
+    when the count of cards per player changes."""
+    global _layouts_cards_per_player
+    if _layouts_cards_per_player != Imaginarium.rules_setup.cards_per_player:
+        _layouts.clear()
+        _layouts_cards_per_player = Imaginarium.rules_setup.cards_per_player
+
+    try:
+        return _layouts[key]
+    except KeyError:
+        layout = _layouts[key] = FrozenList(
+            FrozenList(row) if isinstance(row, list) else row
+            for row in build())
+        return layout
+
+
 def cards_nums(cards_count: int) -> ButtonsComponent:
     """Generate list of DiscordComponents.Button with cards
     and its numbers.
@@ -66,13 +117,16 @@ def cards_nums(cards_count: int) -> ButtonsComponent:
     :param cards_count: Number of cards.
 
     :return: List of lists of DiscordComponents.Button."""
-    return generate_buttons(range(1, cards_count + 1))
+    return cached_layout(('cards', cards_count, ButtonStyle.gray, None),
+                         lambda: generate_buttons(range(1, cards_count + 1)))
 
 
 def confirm_association(message_language=None) -> ButtonsComponent:
-    return [Button(style=ButtonStyle.green,
-                   label=mt.confirm(message_language=message_language),
-                   emoji='✅')]
+    return cached_layout(
+        ('confirm_association', 1, ButtonStyle.green, message_language),
+        lambda: [Button(style=ButtonStyle.green,
+                        label=mt.confirm(message_language=message_language),
+                        emoji='✅')])
 
 
 def players_cards() -> ButtonsComponent:
@@ -131,6 +131,10 @@ def not_enough_players() -> str:
     return 'There are not enough players to start.'
 
 
+def phase_progress(answered: int, expected: int) -> str:
+    return f'Players made their choice: {answered}/{expected}.'
+
+
 ##############################################################################
 
 
@@ -152,6 +156,14 @@ def players_score(score: str) -> str:
     return f'Players score: \n{score}'
 
 
+def leaderboard(leaders: str) -> str:
+    return f'Leaderboard: \n{leaders}'
+
+
+def no_any_statistics() -> str:
+    return 'There are no any statistics yet.'
+
+
 def used_cards_list(used_cards: str) -> str:
     return f'Used cards: \n{used_cards}'
 
@@ -229,6 +241,10 @@ def step_timeout_must_be_number() -> str:
     return 'The step timeout is supposed to be a number.'
 
 
+def quorum_must_be_percent() -> str:
+    return 'The quorum is supposed to be a percent from 0 to 100.'
+
+
 def used_cards_successfully_reset() -> str:
     return 'Used cards are successfully reset.'
 
@@ -126,6 +126,10 @@ def not_enough_players() -> str:
     return 'Недостаточно игроков, чтобы начать игру.'
 
 
+def phase_progress(answered: int, expected: int) -> str:
+    return f'Игроки сделали выбор: {answered}/{expected}.'
+
+
 ##############################################################################
 
 
@@ -147,6 +151,14 @@ def players_score(score: str) -> str:
     return f'Счет: \n{score}'
 
 
+def leaderboard(leaders: str) -> str:
+    return f'Таблица лидеров: \n{leaders}'
+
+
+def no_any_statistics() -> str:
+    return 'Статистики пока нет.'
+
+
 def used_cards_list(used_cards: str) -> str:
     return f'Сброшенные карты: \n{used_cards}'
 
@@ -225,6 +237,10 @@ def step_timeout_must_be_number() -> str:
     return 'Время хода должно быть числом.'
 
 
+def quorum_must_be_percent() -> str:
+    return 'Кворум должен быть процентом от 0 до 100.'
+
+
 def used_cards_successfully_reset() -> str:
     return 'Сброшенные карты успешно очищены.'
 
@@ -129,6 +129,10 @@ def not_enough_players() -> str:
     return 'Недостатньо гравців для початку.'
 
 
+def phase_progress(answered: int, expected: int) -> str:
+    return f'Гравці зробили вибір: {answered}/{expected}.'
+
+
 ##############################################################################
 
 
@@ -150,6 +154,14 @@ def players_score(score: str) -> str:
     return f'Результати гравців: \n{score}'
 
 
+def leaderboard(leaders: str) -> str:
+    return f'Таблиця лідерів: \n{leaders}'
+
+
+def no_any_statistics() -> str:
+    return 'Статистики поки немає.'
+
+
 def used_cards_list(used_cards: str) -> str:
     return f'Використані карти: \n{used_cards}'
 
@@ -227,6 +239,10 @@ def step_timeout_must_be_number() -> str:
     return 'Таймаут ходу має бути числом.'
 
 
+def quorum_must_be_percent() -> str:
+    return 'Кворум має бути відсотком від 0 до 100.'
+
+
 def used_cards_successfully_reset() -> str:
     return 'Використані карти успішно скинуті.'
 
@@ -1,10 +1,17 @@
-import collections as _collections
+import importlib as _importlib
 
 from .texts import *
-from . import languages_maps
+from .languages_store import UsersLanguages
 
-from . import English
-from . import Russian
-from . import Ukrainian
+users_languages = UsersLanguages()
+"""The languages of the users, which are kept only in memory
+until the file of the languages is opened."""
 
-users_languages = _collections.defaultdict(lambda: None)
+# The language modules and maps are imported when they are used
+_lazy_modules = ('languages_maps', 'English', 'Russian', 'Ukrainian')
+
+
+def __getattr__(name: str):
+    if name in _lazy_modules:
+        return _importlib.import_module('.' + name, __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
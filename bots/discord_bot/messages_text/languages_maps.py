@@ -4,376 +4,640 @@
 # these are the languages for which I found the codes and
 # which are supported by google Translator.
 
+# The indexes are written out instead of being built from a list
+# when the module is imported, so they cost only their own memory.
+
+# noinspection SpellCheckingInspection
+code_language_map: dict[str, str] = {
+    'af': 'Afrikaans',
+    'ak': 'Akan',
+    'am': 'Amharic',
+    'ar': 'Arabic',
+    'as': 'Assamese',
+    'ay': 'Aymara',
+    'az': 'Azerbaijani',
+    'be': 'Belarusian',
+    'bg': 'Bulgarian',
+    'bm': 'Bambara',
+    'bn': 'Bengali',
+    'bs': 'Bosnian',
+    'ca': 'Catalan',
+    'co': 'Corsican',
+    'cs': 'Czech',
+    'cy': 'Welsh',
+    'da': 'Danish',
+    'de': 'German',
+    'dv': 'Divehi',
+    'ee': 'Ewe',
+    'el': 'Greek',
+    'en': 'English',
+    'eo': 'Esperanto',
+    'es': 'Spanish',
+    'et': 'Estonian',
+    'eu': 'Basque',
+    'fa': 'Persian',
+    'fi': 'Finnish',
+    'fr': 'French',
+    'fy': 'West Frisian',
+    'ga': 'Irish',
+    'gd': 'Scottish Gaelic',
+    'gl': 'Galician',
+    'gn': 'Guarani',
+    'gu': 'Gujarati',
+    'ha': 'Hausa',
+    'hi': 'Hindi',
+    'hr': 'Croatian',
+    'ht': 'Haitian',
+    'hu': 'Hungarian',
+    'hy': 'Armenian',
+    'id': 'Indonesian',
+    'ig': 'Igbo',
+    'is': 'Icelandic',
+    'it': 'Italian',
+    'ja': 'Japanese',
+    'ka': 'Georgian',
+    'kk': 'Kazakh',
+    'km': 'Cambodian',
+    'kn': 'Kannada',
+    'ko': 'Korean',
+    'ku': 'Kurdish',
+    'ky': 'Kirghiz',
+    'la': 'Latin',
+    'lb': 'Luxembourgish',
+    'lg': 'Ganda',
+    'ln': 'Lingala',
+    'lo': 'Laotian',
+    'lt': 'Lithuanian',
+    'lv': 'Latvian',
+    'mg': 'Malagasy',
+    'mi': 'Maori',
+    'mk': 'Macedonian',
+    'ml': 'Malayalam',
+    'mn': 'Mongolian',
+    'mr': 'Marathi',
+    'ms': 'Malay',
+    'mt': 'Maltese',
+    'my': 'Burmese',
+    'ne': 'Nepali',
+    'nl': 'Dutch',
+    'no': 'Norwegian',
+    'ny': 'Chichewa',
+    'om': 'Oromo',
+    'or': 'Oriya',
+    'pa': 'Panjabi / Punjabi',
+    'pl': 'Polish',
+    'ps': 'Pashto',
+    'pt': 'Portuguese',
+    'qu': 'Quechua',
+    'ro': 'Romanian',
+    'ru': 'Russian',
+    'rw': 'Rwandi',
+    'sa': 'Sanskrit',
+    'sd': 'Sindhi',
+    'si': 'Sinhalese',
+    'sk': 'Slovak',
+    'sl': 'Slovenian',
+    'sm': 'Samoan',
+    'sn': 'Shona',
+    'so': 'Somalia',
+    'sq': 'Albanian',
+    'sr': 'Serbian',
+    'st': 'Southern Sotho',
+    'su': 'Sundanese',
+    'sv': 'Swedish',
+    'sw': 'Swahili',
+    'ta': 'Tamil',
+    'te': 'Telugu',
+    'tg': 'Tajik',
+    'th': 'Thai',
+    'ti': 'Tigrinya',
+    'tk': 'Turkmen',
+    'tl': 'Tagalog / Filipino',
+    'tr': 'Turkish',
+    'ts': 'Tsonga',
+    'tt': 'Tatar',
+    'ug': 'Uyghur',
+    'uk': 'Ukrainian',
+    'ur': 'Urdu',
+    'uz': 'Uzbek',
+    'vi': 'Vietnamese',
+    'xh': 'Xhosa',
+    'yi': 'Yiddish',
+    'yo': 'Yoruba',
+    'zu': 'Zulu'
+}
+"""The English names of the languages by their codes."""
+
 # noinspection SpellCheckingInspection
-language_code_name_native = [
-    {'code': 'af',
-     'name': 'Afrikaans',
-     'native': 'Afrikaans'},
-    {'code': 'ak',
-     'name': 'Akan',
-     'native': 'Akana'},
-    {'code': 'am',
-     'name': 'Amharic',
-     'native': 'አማርኛ'},
-    {'code': 'ar',
-     'name': 'Arabic',
-     'native': 'العربية',
-     'rtl': 1},
-    {'code': 'as',
-     'name': 'Assamese',
-     'native': 'অসমীয়া'},
-    {'code': 'ay',
-     'name': 'Aymara',
-     'native': 'Aymar'},
-    {'code': 'az',
-     'name': 'Azerbaijani',
-     'native': 'Azərbaycanca / آذربايجان'},
-    {'code': 'be',
-     'name': 'Belarusian',
-     'native': 'Беларуская'},
-    {'code': 'bg',
-     'name': 'Bulgarian',
-     'native': 'Български'},
-    {'code': 'bm',
-     'name': 'Bambara',
-     'native': 'Bamanankan'},
-    {'code': 'bn',
-     'name': 'Bengali',
-     'native': 'বাংলা'},
-    {'code': 'bs',
-     'name': 'Bosnian',
-     'native': 'Bosanski'},
-    {'code': 'ca',
-     'name': 'Catalan',
-     'native': 'Català'},
-    {'code': 'co',
-     'name': 'Corsican',
-     'native': 'Corsu'},
-    {'code': 'cs',
-     'name': 'Czech',
-     'native': 'Česky'},
-    {'code': 'cy',
-     'name': 'Welsh',
-     'native': 'Cymraeg'},
-    {'code': 'da',
-     'name': 'Danish',
-     'native': 'Dansk'},
-    {'code': 'de',
-     'name': 'German',
-     'native': 'Deutsch'},
-    {'code': 'dv',
-     'name': 'Divehi',
-     'native': 'ދިވެހިބަސް',
-     'rtl': 1},
-    {'code': 'ee',
-     'name': 'Ewe',
-     'native': 'Ɛʋɛ'},
-    {'code': 'el',
-     'name': 'Greek',
-     'native': 'Ελληνικά'},
-    {'code': 'en',
-     'name': 'English',
-     'native': 'English'},
-    {'code': 'eo',
-     'name': 'Esperanto',
-     'native': 'Esperanto'},
-    {'code': 'es',
-     'name': 'Spanish',
-     'native': 'Español'},
-    {'code': 'et',
-     'name': 'Estonian',
-     'native': 'Eesti'},
-    {'code': 'eu',
-     'name': 'Basque',
-     'native': 'Euskara'},
-    {'code': 'fa',
-     'name': 'Persian',
-     'native': 'فارسی',
-     'rtl': 1},
-    {'code': 'fi',
-     'name': 'Finnish',
-     'native': 'Suomi'},
-    {'code': 'fr',
-     'name': 'French',
-     'native': 'Français'},
-    {'code': 'fy',
-     'name': 'West Frisian',
-     'native': 'Frysk'},
-    {'code': 'ga',
-     'name': 'Irish',
-     'native': 'Gaeilge'},
-    {'code': 'gd',
-     'name': 'Scottish Gaelic',
-     'native': 'Gàidhlig'},
-    {'code': 'gl',
-     'name': 'Galician',
-     'native': 'Galego'},
-    {'code': 'gn',
-     'name': 'Guarani',
-     'native': "Avañe'ẽ"},
-    {'code': 'gu',
-     'name': 'Gujarati',
-     'native': 'ગુજરાતી'},
-    {'code': 'ha',
-     'name': 'Hausa',
-     'native': 'هَوُسَ',
-     'rtl': 1},
-    {'code': 'hi',
-     'name': 'Hindi',
-     'native': 'हिन्दी'},
-    {'code': 'hr',
-     'name': 'Croatian',
-     'native': 'Hrvatski'},
-    {'code': 'ht',
-     'name': 'Haitian',
-     'native': 'Krèyol ayisyen'},
-    {'code': 'hu',
-     'name': 'Hungarian',
-     'native': 'Magyar'},
-    {'code': 'hy',
-     'name': 'Armenian',
-     'native': 'Հայերեն'},
-    {'code': 'id',
-     'name': 'Indonesian',
-     'native': 'Bahasa Indonesia'},
-    {'code': 'ig',
-     'name': 'Igbo',
-     'native': 'Igbo'},
-    {'code': 'is',
-     'name': 'Icelandic',
-     'native': 'Íslenska'},
-    {'code': 'it',
-     'name': 'Italian',
-     'native': 'Italiano'},
-    {'code': 'ja',
-     'name': 'Japanese',
-     'native': '日本語'},
-    {'code': 'ka',
-     'name': 'Georgian',
-     'native': 'ქართული'},
-    {'code': 'kk',
-     'name': 'Kazakh',
-     'native': 'Қазақша'},
-    {'code': 'km',
-     'name': 'Cambodian',
-     'native': 'ភាសាខ្មែរ'},
-    {'code': 'kn',
-     'name': 'Kannada',
-     'native': 'ಕನ್ನಡ'},
-    {'code': 'ko',
-     'name': 'Korean',
-     'native': '한국어'},
-    {'code': 'ku',
-     'name': 'Kurdish',
-     'native': 'Kurdî / كوردی',
-     'rtl': 1},
-    {'code': 'ky',
-     'name': 'Kirghiz',
-     'native': 'Kırgızca / Кыргызча'},
-    {'code': 'la',
-     'name': 'Latin',
-     'native': 'Latina'},
-    {'code': 'lb',
-     'name': 'Luxembourgish',
-     'native': 'Lëtzebuergesch'},
-    {'code': 'lg',
-     'name': 'Ganda',
-     'native': 'Luganda'},
-    {'code': 'ln',
-     'name': 'Lingala',
-     'native': 'Lingála'},
-    {'code': 'lo',
-     'name': 'Laotian',
-     'native': 'ລາວ / Pha xa lao'},
-    {'code': 'lt',
-     'name': 'Lithuanian',
-     'native': 'Lietuvių'},
-    {'code': 'lv',
-     'name': 'Latvian',
-     'native': 'Latviešu'},
-    {'code': 'mg',
-     'name': 'Malagasy',
-     'native': 'Malagasy'},
-    {'code': 'mi',
-     'name': 'Maori',
-     'native': 'Māori'},
-    {'code': 'mk',
-     'name': 'Macedonian',
-     'native': 'Македонски'},
-    {'code': 'ml',
-     'name': 'Malayalam',
-     'native': 'മലയാളം'},
-    {'code': 'mn',
-     'name': 'Mongolian',
-     'native': 'Монгол'},
-    {'code': 'mr',
-     'name': 'Marathi',
-     'native': 'मराठी'},
-    {'code': 'ms',
-     'name': 'Malay',
-     'native': 'Bahasa Melayu'},
-    {'code': 'mt',
-     'name': 'Maltese',
-     'native': 'bil-Malti'},
-    {'code': 'my',
-     'name': 'Burmese',
-     'native': 'မြန်မာစာ'},
-    {'code': 'ne',
-     'name': 'Nepali',
-     'native': 'नेपाली'},
-    {'code': 'nl',
-     'name': 'Dutch',
-     'native': 'Nederlands'},
-    {'code': 'no',
-     'name': 'Norwegian',
-     'native': 'Norsk'},
-    {'code': 'ny',
-     'name': 'Chichewa',
-     'native': 'Chi-Chewa'},
-    {'code': 'om',
-     'name': 'Oromo',
-     'native': 'Oromoo'},
-    {'code': 'or',
-     'name': 'Oriya',
-     'native': 'ଓଡ଼ିଆ'},
-    {'code': 'pa',
-     'name': 'Panjabi / Punjabi',
-     'native': 'ਪੰਜਾਬੀ / पंजाबी / پنجابي'},
-    {'code': 'pl',
-     'name': 'Polish',
-     'native': 'Polski'},
-    {'code': 'ps',
-     'name': 'Pashto',
-     'native': 'پښتو',
-     'rtl': 1},
-    {'code': 'pt',
-     'name': 'Portuguese',
-     'native': 'Português'},
-    {'code': 'qu',
-     'name': 'Quechua',
-     'native': 'Runa Simi'},
-    {'code': 'ro',
-     'name': 'Romanian',
-     'native': 'Română'},
-    {'code': 'ru',
-     'name': 'Russian',
-     'native': 'Русский'},
-    {'code': 'rw',
-     'name': 'Rwandi',
-     'native': 'Kinyarwandi'},
-    {'code': 'sa',
-     'name': 'Sanskrit',
-     'native': 'संस्कृतम्'},
-    {'code': 'sd',
-     'name': 'Sindhi',
-     'native': 'सिनधि'},
-    {'code': 'si',
-     'name': 'Sinhalese',
-     'native': 'සිංහල'},
-    {'code': 'sk',
-     'name': 'Slovak',
-     'native': 'Slovenčina'},
-    {'code': 'sl',
-     'name': 'Slovenian',
-     'native': 'Slovenščina'},
-    {'code': 'sm',
-     'name': 'Samoan',
-     'native': 'Gagana Samoa'},
-    {'code': 'sn',
-     'name': 'Shona',
-     'native': 'chiShona'},
-    {'code': 'so',
-     'name': 'Somalia',
-     'native': 'Soomaaliga'},
-    {'code': 'sq',
-     'name': 'Albanian',
-     'native': 'Shqip'},
-    {'code': 'sr',
-     'name': 'Serbian',
-     'native': 'Српски'},
-    {'code': 'st',
-     'name': 'Southern Sotho',
-     'native': 'Sesotho'},
-    {'code': 'su',
-     'name': 'Sundanese',
-     'native': 'Basa Sunda'},
-    {'code': 'sv',
-     'name': 'Swedish',
-     'native': 'Svenska'},
-    {'code': 'sw',
-     'name': 'Swahili',
-     'native': 'Kiswahili'},
-    {'code': 'ta',
-     'name': 'Tamil',
-     'native': 'தமிழ்'},
-    {'code': 'te',
-     'name': 'Telugu',
-     'native': 'తెలుగు'},
-    {'code': 'tg',
-     'name': 'Tajik',
-     'native': 'Тоҷикӣ'},
-    {'code': 'th',
-     'name': 'Thai',
-     'native': 'ไทย / Phasa Thai'},
-    {'code': 'ti',
-     'name': 'Tigrinya',
-     'native': 'ትግርኛ'},
-    {'code': 'tk',
-     'name': 'Turkmen',
-     'native': 'Туркмен / تركمن'},
-    {'code': 'tl',
-     'name': 'Tagalog / Filipino',
-     'native': 'Tagalog'},
-    {'code': 'tr',
-     'name': 'Turkish',
-     'native': 'Türkçe'},
-    {'code': 'ts',
-     'name': 'Tsonga',
-     'native': 'Xitsonga'},
-    {'code': 'tt',
-     'name': 'Tatar',
-     'native': 'Tatarça'},
-    {'code': 'ug',
-     'name': 'Uyghur',
-     'native': 'Uyƣurqə / ئۇيغۇرچە'},
-    {'code': 'uk',
-     'name': 'Ukrainian',
-     'native': 'Українська'},
-    {'code': 'ur',
-     'name': 'Urdu',
-     'native': 'اردو',
-     'rtl': 1},
-    {'code': 'uz',
-     'name': 'Uzbek',
-     'native': 'Ўзбек'},
-    {'code': 'vi',
-     'name': 'Vietnamese',
-     'native': 'Tiếng Việt'},
-    {'code': 'xh',
-     'name': 'Xhosa',
-     'native': 'isiXhosa'},
-    {'code': 'yi',
-     'name': 'Yiddish',
-     'native': 'ייִדיש',
-     'rtl': 1},
-    {'code': 'yo',
-     'name': 'Yoruba',
-     'native': 'Yorùbá'},
-    {'code': 'zu',
-     'name': 'Zulu',
-     'native': 'isiZulu'}
-]
+language_code_map: dict[str, str] = {
+    'Afrikaans': 'af',
+    'Akan': 'ak',
+    'Amharic': 'am',
+    'Arabic': 'ar',
+    'Assamese': 'as',
+    'Aymara': 'ay',
+    'Azerbaijani': 'az',
+    'Belarusian': 'be',
+    'Bulgarian': 'bg',
+    'Bambara': 'bm',
+    'Bengali': 'bn',
+    'Bosnian': 'bs',
+    'Catalan': 'ca',
+    'Corsican': 'co',
+    'Czech': 'cs',
+    'Welsh': 'cy',
+    'Danish': 'da',
+    'German': 'de',
+    'Divehi': 'dv',
+    'Ewe': 'ee',
+    'Greek': 'el',
+    'English': 'en',
+    'Esperanto': 'eo',
+    'Spanish': 'es',
+    'Estonian': 'et',
+    'Basque': 'eu',
+    'Persian': 'fa',
+    'Finnish': 'fi',
+    'French': 'fr',
+    'West Frisian': 'fy',
+    'Irish': 'ga',
+    'Scottish Gaelic': 'gd',
+    'Galician': 'gl',
+    'Guarani': 'gn',
+    'Gujarati': 'gu',
+    'Hausa': 'ha',
+    'Hindi': 'hi',
+    'Croatian': 'hr',
+    'Haitian': 'ht',
+    'Hungarian': 'hu',
+    'Armenian': 'hy',
+    'Indonesian': 'id',
+    'Igbo': 'ig',
+    'Icelandic': 'is',
+    'Italian': 'it',
+    'Japanese': 'ja',
+    'Georgian': 'ka',
+    'Kazakh': 'kk',
+    'Cambodian': 'km',
+    'Kannada': 'kn',
+    'Korean': 'ko',
+    'Kurdish': 'ku',
+    'Kirghiz': 'ky',
+    'Latin': 'la',
+    'Luxembourgish': 'lb',
+    'Ganda': 'lg',
+    'Lingala': 'ln',
+    'Laotian': 'lo',
+    'Lithuanian': 'lt',
+    'Latvian': 'lv',
+    'Malagasy': 'mg',
+    'Maori': 'mi',
+    'Macedonian': 'mk',
+    'Malayalam': 'ml',
+    'Mongolian': 'mn',
+    'Marathi': 'mr',
+    'Malay': 'ms',
+    'Maltese': 'mt',
+    'Burmese': 'my',
+    'Nepali': 'ne',
+    'Dutch': 'nl',
+    'Norwegian': 'no',
+    'Chichewa': 'ny',
+    'Oromo': 'om',
+    'Oriya': 'or',
+    'Panjabi / Punjabi': 'pa',
+    'Polish': 'pl',
+    'Pashto': 'ps',
+    'Portuguese': 'pt',
+    'Quechua': 'qu',
+    'Romanian': 'ro',
+    'Russian': 'ru',
+    'Rwandi': 'rw',
+    'Sanskrit': 'sa',
+    'Sindhi': 'sd',
+    'Sinhalese': 'si',
+    'Slovak': 'sk',
+    'Slovenian': 'sl',
+    'Samoan': 'sm',
+    'Shona': 'sn',
+    'Somalia': 'so',
+    'Albanian': 'sq',
+    'Serbian': 'sr',
+    'Southern Sotho': 'st',
+    'Sundanese': 'su',
+    'Swedish': 'sv',
+    'Swahili': 'sw',
+    'Tamil': 'ta',
+    'Telugu': 'te',
+    'Tajik': 'tg',
+    'Thai': 'th',
+    'Tigrinya': 'ti',
+    'Turkmen': 'tk',
+    'Tagalog / Filipino': 'tl',
+    'Turkish': 'tr',
+    'Tsonga': 'ts',
+    'Tatar': 'tt',
+    'Uyghur': 'ug',
+    'Ukrainian': 'uk',
+    'Urdu': 'ur',
+    'Uzbek': 'uz',
+    'Vietnamese': 'vi',
+    'Xhosa': 'xh',
+    'Yiddish': 'yi',
+    'Yoruba': 'yo',
+    'Zulu': 'zu'
+}
+"""The codes of the languages by their English names."""
+
+# noinspection SpellCheckingInspection
+code_native_language_map: dict[str, str] = {
+    'af': 'Afrikaans',
+    'ak': 'Akana',
+    'am': 'አማርኛ',
+    'ar': 'العربية',
+    'as': 'অসমীয়া',
+    'ay': 'Aymar',
+    'az': 'Azərbaycanca / آذربايجان',
+    'be': 'Беларуская',
+    'bg': 'Български',
+    'bm': 'Bamanankan',
+    'bn': 'বাংলা',
+    'bs': 'Bosanski',
+    'ca': 'Català',
+    'co': 'Corsu',
+    'cs': 'Česky',
+    'cy': 'Cymraeg',
+    'da': 'Dansk',
+    'de': 'Deutsch',
+    'dv': 'ދިވެހިބަސް',
+    'ee': 'Ɛʋɛ',
+    'el': 'Ελληνικά',
+    'en': 'English',
+    'eo': 'Esperanto',
+    'es': 'Español',
+    'et': 'Eesti',
+    'eu': 'Euskara',
+    'fa': 'فارسی',
+    'fi': 'Suomi',
+    'fr': 'Français',
+    'fy': 'Frysk',
+    'ga': 'Gaeilge',
+    'gd': 'Gàidhlig',
+    'gl': 'Galego',
+    'gn': "Avañe'ẽ",
+    'gu': 'ગુજરાતી',
+    'ha': 'هَوُسَ',
+    'hi': 'हिन्दी',
+    'hr': 'Hrvatski',
+    'ht': 'Krèyol ayisyen',
+    'hu': 'Magyar',
+    'hy': 'Հայերեն',
+    'id': 'Bahasa Indonesia',
+    'ig': 'Igbo',
+    'is': 'Íslenska',
+    'it': 'Italiano',
+    'ja': '日本語',
+    'ka': 'ქართული',
+    'kk': 'Қазақша',
+    'km': 'ភាសាខ្មែរ',
+    'kn': 'ಕನ್ನಡ',
+    'ko': '한국어',
+    'ku': 'Kurdî / كوردی',
+    'ky': 'Kırgızca / Кыргызча',
+    'la': 'Latina',
+    'lb': 'Lëtzebuergesch',
+    'lg': 'Luganda',
+    'ln': 'Lingála',
+    'lo': 'ລາວ / Pha xa lao',
+    'lt': 'Lietuvių',
+    'lv': 'Latviešu',
+    'mg': 'Malagasy',
+    'mi': 'Māori',
+    'mk': 'Македонски',
+    'ml': 'മലയാളം',
+    'mn': 'Монгол',
+    'mr': 'मराठी',
+    'ms': 'Bahasa Melayu',
+    'mt': 'bil-Malti',
+    'my': 'မြန်မာစာ',
+    'ne': 'नेपाली',
+    'nl': 'Nederlands',
+    'no': 'Norsk',
+    'ny': 'Chi-Chewa',
+    'om': 'Oromoo',
+    'or': 'ଓଡ଼ିଆ',
+    'pa': 'ਪੰਜਾਬੀ / पंजाबी / پنجابي',
+    'pl': 'Polski',
+    'ps': 'پښتو',
+    'pt': 'Português',
+    'qu': 'Runa Simi',
+    'ro': 'Română',
+    'ru': 'Русский',
+    'rw': 'Kinyarwandi',
+    'sa': 'संस्कृतम्',
+    'sd': 'सिनधि',
+    'si': 'සිංහල',
+    'sk': 'Slovenčina',
+    'sl': 'Slovenščina',
+    'sm': 'Gagana Samoa',
+    'sn': 'chiShona',
+    'so': 'Soomaaliga',
+    'sq': 'Shqip',
+    'sr': 'Српски',
+    'st': 'Sesotho',
+    'su': 'Basa Sunda',
+    'sv': 'Svenska',
+    'sw': 'Kiswahili',
+    'ta': 'தமிழ்',
+    'te': 'తెలుగు',
+    'tg': 'Тоҷикӣ',
+    'th': 'ไทย / Phasa Thai',
+    'ti': 'ትግርኛ',
+    'tk': 'Туркмен / تركمن',
+    'tl': 'Tagalog',
+    'tr': 'Türkçe',
+    'ts': 'Xitsonga',
+    'tt': 'Tatarça',
+    'ug': 'Uyƣurqə / ئۇيغۇرچە',
+    'uk': 'Українська',
+    'ur': 'اردو',
+    'uz': 'Ўзбек',
+    'vi': 'Tiếng Việt',
+    'xh': 'isiXhosa',
+    'yi': 'ייִדיש',
+    'yo': 'Yorùbá',
+    'zu': 'isiZulu'
+}
+"""The native names of the languages by their codes."""
+
+# noinspection SpellCheckingInspection
+name_code_map: dict[str, str] = {
+    'afrikaans': 'af',
+    'akan': 'ak',
+    'akana': 'ak',
+    'albanian': 'sq',
+    'amharic': 'am',
+    'arabic': 'ar',
+    'armenian': 'hy',
+    'assamese': 'as',
+    "avañe'ẽ": 'gn',
+    'aymar': 'ay',
+    'aymara': 'ay',
+    'azerbaijani': 'az',
+    'azərbaycanca': 'az',
+    'azərbaycanca / آذربايجان': 'az',
+    'bahasa indonesia': 'id',
+    'bahasa melayu': 'ms',
+    'bamanankan': 'bm',
+    'bambara': 'bm',
+    'basa sunda': 'su',
+    'basque': 'eu',
+    'belarusian': 'be',
+    'bengali': 'bn',
+    'bil-malti': 'mt',
+    'bosanski': 'bs',
+    'bosnian': 'bs',
+    'bulgarian': 'bg',
+    'burmese': 'my',
+    'cambodian': 'km',
+    'catalan': 'ca',
+    'català': 'ca',
+    'chi-chewa': 'ny',
+    'chichewa': 'ny',
+    'chishona': 'sn',
+    'corsican': 'co',
+    'corsu': 'co',
+    'croatian': 'hr',
+    'cymraeg': 'cy',
+    'czech': 'cs',
+    'danish': 'da',
+    'dansk': 'da',
+    'deutsch': 'de',
+    'divehi': 'dv',
+    'dutch': 'nl',
+    'eesti': 'et',
+    'english': 'en',
+    'español': 'es',
+    'esperanto': 'eo',
+    'estonian': 'et',
+    'euskara': 'eu',
+    'ewe': 'ee',
+    'filipino': 'tl',
+    'finnish': 'fi',
+    'français': 'fr',
+    'french': 'fr',
+    'frysk': 'fy',
+    'gaeilge': 'ga',
+    'gagana samoa': 'sm',
+    'galego': 'gl',
+    'galician': 'gl',
+    'ganda': 'lg',
+    'georgian': 'ka',
+    'german': 'de',
+    'greek': 'el',
+    'guarani': 'gn',
+    'gujarati': 'gu',
+    'gàidhlig': 'gd',
+    'haitian': 'ht',
+    'hausa': 'ha',
+    'hindi': 'hi',
+    'hrvatski': 'hr',
+    'hungarian': 'hu',
+    'icelandic': 'is',
+    'igbo': 'ig',
+    'indonesian': 'id',
+    'irish': 'ga',
+    'isixhosa': 'xh',
+    'isizulu': 'zu',
+    'italian': 'it',
+    'italiano': 'it',
+    'japanese': 'ja',
+    'kannada': 'kn',
+    'kazakh': 'kk',
+    'kinyarwandi': 'rw',
+    'kirghiz': 'ky',
+    'kiswahili': 'sw',
+    'korean': 'ko',
+    'krèyol ayisyen': 'ht',
+    'kurdish': 'ku',
+    'kurdî': 'ku',
+    'kurdî / كوردی': 'ku',
+    'kırgızca': 'ky',
+    'kırgızca / кыргызча': 'ky',
+    'laotian': 'lo',
+    'latin': 'la',
+    'latina': 'la',
+    'latvian': 'lv',
+    'latviešu': 'lv',
+    'lietuvių': 'lt',
+    'lingala': 'ln',
+    'lingála': 'ln',
+    'lithuanian': 'lt',
+    'luganda': 'lg',
+    'luxembourgish': 'lb',
+    'lëtzebuergesch': 'lb',
+    'macedonian': 'mk',
+    'magyar': 'hu',
+    'malagasy': 'mg',
+    'malay': 'ms',
+    'malayalam': 'ml',
+    'maltese': 'mt',
+    'maori': 'mi',
+    'marathi': 'mr',
+    'mongolian': 'mn',
+    'māori': 'mi',
+    'nederlands': 'nl',
+    'nepali': 'ne',
+    'norsk': 'no',
+    'norwegian': 'no',
+    'oriya': 'or',
+    'oromo': 'om',
+    'oromoo': 'om',
+    'panjabi': 'pa',
+    'panjabi / punjabi': 'pa',
+    'pashto': 'ps',
+    'persian': 'fa',
+    'pha xa lao': 'lo',
+    'phasa thai': 'th',
+    'polish': 'pl',
+    'polski': 'pl',
+    'portuguese': 'pt',
+    'português': 'pt',
+    'punjabi': 'pa',
+    'quechua': 'qu',
+    'romanian': 'ro',
+    'română': 'ro',
+    'runa simi': 'qu',
+    'russian': 'ru',
+    'rwandi': 'rw',
+    'samoan': 'sm',
+    'sanskrit': 'sa',
+    'scottish gaelic': 'gd',
+    'serbian': 'sr',
+    'sesotho': 'st',
+    'shona': 'sn',
+    'shqip': 'sq',
+    'sindhi': 'sd',
+    'sinhalese': 'si',
+    'slovak': 'sk',
+    'slovenian': 'sl',
+    'slovenčina': 'sk',
+    'slovenščina': 'sl',
+    'somalia': 'so',
+    'soomaaliga': 'so',
+    'southern sotho': 'st',
+    'spanish': 'es',
+    'sundanese': 'su',
+    'suomi': 'fi',
+    'svenska': 'sv',
+    'swahili': 'sw',
+    'swedish': 'sv',
+    'tagalog': 'tl',
+    'tagalog / filipino': 'tl',
+    'tajik': 'tg',
+    'tamil': 'ta',
+    'tatar': 'tt',
+    'tatarça': 'tt',
+    'telugu': 'te',
+    'thai': 'th',
+    'tigrinya': 'ti',
+    'tiếng việt': 'vi',
+    'tsonga': 'ts',
+    'turkish': 'tr',
+    'turkmen': 'tk',
+    'türkçe': 'tr',
+    'ukrainian': 'uk',
+    'urdu': 'ur',
+    'uyghur': 'ug',
+    'uyƣurqə': 'ug',
+    'uyƣurqə / ئۇيغۇرچە': 'ug',
+    'uzbek': 'uz',
+    'vietnamese': 'vi',
+    'welsh': 'cy',
+    'west frisian': 'fy',
+    'xhosa': 'xh',
+    'xitsonga': 'ts',
+    'yiddish': 'yi',
+    'yoruba': 'yo',
+    'yorùbá': 'yo',
+    'zulu': 'zu',
+    'íslenska': 'is',
+    'česky': 'cs',
+    'ɛʋɛ': 'ee',
+    'ελληνικά': 'el',
+    'беларуская': 'be',
+    'български': 'bg',
+    'кыргызча': 'ky',
+    'македонски': 'mk',
+    'монгол': 'mn',
+    'русский': 'ru',
+    'српски': 'sr',
+    'тоҷикӣ': 'tg',
+    'туркмен': 'tk',
+    'туркмен / تركمن': 'tk',
+    'українська': 'uk',
+    'ўзбек': 'uz',
+    'қазақша': 'kk',
+    'հայերեն': 'hy',
+    'ייִדיש': 'yi',
+    'آذربايجان': 'az',
+    'ئۇيغۇرچە': 'ug',
+    'اردو': 'ur',
+    'العربية': 'ar',
+    'تركمن': 'tk',
+    'فارسی': 'fa',
+    'كوردی': 'ku',
+    'هَوُسَ': 'ha',
+    'پنجابي': 'pa',
+    'پښتو': 'ps',
+    'ދިވެހިބަސް': 'dv',
+    'नेपाली': 'ne',
+    'पंजाबी': 'pa',
+    'मराठी': 'mr',
+    'संस्कृतम्': 'sa',
+    'सिनधि': 'sd',
+    'हिन्दी': 'hi',
+    'অসমীয়া': 'as',
+    'বাংলা': 'bn',
+    'ਪੰਜਾਬੀ': 'pa',
+    'ਪੰਜਾਬੀ / पंजाबी / پنجابي': 'pa',
+    'ગુજરાતી': 'gu',
+    'ଓଡ଼ିଆ': 'or',
+    'தமிழ்': 'ta',
+    'తెలుగు': 'te',
+    'ಕನ್ನಡ': 'kn',
+    'മലയാളം': 'ml',
+    'සිංහල': 'si',
+    'ไทย': 'th',
+    'ไทย / phasa thai': 'th',
+    'ລາວ': 'lo',
+    'ລາວ / pha xa lao': 'lo',
+    'မြန်မာစာ': 'my',
+    'ქართული': 'ka',
+    'ትግርኛ': 'ti',
+    'አማርኛ': 'am',
+    'ភាសាខ្មែរ': 'km',
+    '日本語': 'ja',
+    '한국어': 'ko'
+}
+"""The codes of the languages by their casefolded English and native names
+and the alternatives of the names."""
+
+rtl_languages_codes: frozenset[str] = frozenset({'ar', 'dv', 'fa', 'ha', 'ku', 'ps', 'ur', 'yi'})
+"""The codes of the languages which are written from right to left."""
+
+languages_codes = code_language_map.keys()
+languages_names = language_code_map.keys()
+
+
+def find_language_code(language: str) -> str | None:
+    """Find the code of the language by its code or name.
 
-code_language_map = {}
-languages_codes = set()
-for _lang in language_code_name_native:
-    _code = _lang['code']
-    code_language_map[_code] = _lang['name']
-    languages_codes.add(_code)
+    :param language: The code, the English name or the native name
+    of the language in any case.
 
-language_code_map = {}
-languages_names = set()
-for _lang in language_code_name_native:
-    _name = _lang['name']
-    language_code_map[_name] = _lang['code']
-    languages_names.add(_name)
+    :return: The code of the language or None if it is unknown."""
+    language = language.strip().casefold()
+    if language in code_language_map:
+        return language
+    return name_code_map.get(language)
@@ -0,0 +1,267 @@
+"""The languages the users chose for the messages of the bot.
+
+The languages are kept by the IDs of the users in SQLite.
+The recently used ones are kept in memory,
+including the users who did not choose any language,
+so a lookup of the language of a player in a hook is a dictionary lookup,
+and the changes are written to the file in batches in the background.
+The languages of the players are loaded in the background
+when the game starts::
+
+    users_languages.open('users_languages.sqlite3')
+    users_languages[ctx.author] = 'uk'
+    await users_languages.load(players)
+    users_languages[player]  # 'uk'
+
+.. note:: The language of a user who is not kept in memory
+is read from the file when it is looked up, which blocks the loop.
+It happens only for the commands of the users who do not play
+or were forgotten during a long game, and it is one lookup
+by the primary key of a local file, which takes tens of microseconds,
+so the lookups stay synchronous for all the messages of the bot."""
+import asyncio
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Iterable
+)
+
+_schema = '''
+CREATE TABLE IF NOT EXISTS users_languages (
+    user_id INTEGER PRIMARY KEY,
+    language TEXT NOT NULL
+)
+'''
+
+_language_query = 'SELECT language FROM users_languages WHERE user_id = ?'
+
+_set_language_query = '''
+INSERT INTO users_languages (user_id, language) VALUES (?, ?)
+ON CONFLICT (user_id) DO UPDATE SET language = excluded.language
+'''
+
+_reset_language_query = 'DELETE FROM users_languages WHERE user_id = ?'
+
+_NOT_CHANGED = object()
+
+
+def _user_id(user: Any) -> int:
+    """Return the ID of the user, the player or the ID itself."""
+    return getattr(user, 'id', user)
+
+
+class UsersLanguages:
+    """The languages of the users by the users or their IDs.
+
+    The users who did not choose a language have None.
+
+    :param capacity: The count of the users whose languages
+    are kept in memory when the languages are kept in a file.
+    Without the file only the chosen languages are kept.
+    :param flush_interval: The time in seconds during which
+    the changes are collected before they are written.
+    :param batch_size: The count of the changes
+    which are written at once without waiting."""
+
+    def __init__(self, capacity: int = 10000,
+                 flush_interval: float = 5.,
+                 batch_size: int = 100) -> None:
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._languages: OrderedDict[int, str | None] = OrderedDict()
+        """The recently used languages in the order of their use."""
+        self._changes: dict[int, str | None] = {}
+        """The changes which have not been written yet."""
+        self._writing: list[dict[int, str | None]] = []
+        """The changes which are being written.
+        It is changed only in the thread of the loop."""
+        self._path: Path | None = None
+        self._connection: sqlite3.Connection | None = None
+        # A single thread keeps the writes in order
+        self._worker: ThreadPoolExecutor | None = None
+        self._flush_timer: asyncio.TimerHandle | None = None
+
+    def open(self, path: Path | str | None) -> None:
+        """Keep the languages in the file.
+
+        :param path: The SQLite file of the languages,
+        or None to keep the languages only in memory."""
+        self.close()
+        self._languages.clear()
+        if path is None:
+            return
+
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self._path, check_same_thread=False)
+        self._connection.execute(_schema)
+        self._worker = ThreadPoolExecutor(max_workers=1,
+                                          thread_name_prefix='languages')
+
+    def close(self) -> None:
+        """Write the changes and close the file."""
+        if self._connection is None:
+            return
+        self.flush(wait=True)
+        self._worker.shutdown(wait=True)
+        self._connection.close()
+        self._connection = self._worker = self._path = None
+
+    def __len__(self) -> int:
+        """Return the count of the languages kept in memory."""
+        return len(self._languages)
+
+    def __getitem__(self, user: Any) -> str | None:
+        user_id = _user_id(user)
+        if self._connection is None:
+            return self._languages.get(user_id)
+        try:
+            language = self._languages[user_id]
+        except KeyError:
+            language = self._load(user_id)
+            self._remember(user_id, language)
+        else:
+            self._languages.move_to_end(user_id)
+
+        return language
+
+    def __setitem__(self, user: Any, language: str | None) -> None:
+        user_id = _user_id(user)
+        if self._connection is None:
+            if language is None:
+                self._languages.pop(user_id, None)
+            else:
+                self._languages[user_id] = language
+            return
+
+        self._remember(user_id, language)
+        self._changes[user_id] = language
+        self._schedule_flush()
+
+    def __delitem__(self, user: Any) -> None:
+        self[user] = None
+
+    def refresh(self, user: Any, language: str | None) -> None:
+        """Remember the language the user chose in another process,
+        which writes it to the file itself."""
+        user_id = _user_id(user)
+        if self._connection is not None:
+            # The other process may not have written the language yet,
+            # so it is remembered instead of being read from the file
+            self._remember(user_id, language)
+        elif language is None:
+            self._languages.pop(user_id, None)
+        else:
+            self._languages[user_id] = language
+
+    def _remember(self, user_id: int, language: str | None) -> None:
+        self._languages[user_id] = language
+        self._languages.move_to_end(user_id)
+        if len(self._languages) > self.capacity:
+            self._languages.popitem(last=False)
+
+    def _unwritten_change(self, user_id: int) -> str | None | object:
+        """Return the change which may have been forgotten
+        before it was written or _NOT_CHANGED."""
+        for changes in (self._changes, *reversed(self._writing)):
+            if user_id in changes:
+                return changes[user_id]
+        return _NOT_CHANGED
+
+    def _load(self, user_id: int) -> str | None:
+        language = self._unwritten_change(user_id)
+        if language is not _NOT_CHANGED:
+            return language
+
+        row = self._connection.execute(_language_query, (user_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _load_many(self, users_ids: list[int]) -> dict[int, str]:
+        placeholders = ', '.join('?' * len(users_ids))
+        return dict(self._connection.execute(
+            f'SELECT user_id, language FROM users_languages '
+            f'WHERE user_id IN ({placeholders})', users_ids))
+
+    async def load(self, users: Iterable[Any]) -> None:
+        """Read the languages of the users which are not kept in memory
+        in the background, so looking them up does not read the file.
+
+        :param users: The users, the players or their IDs."""
+        if self._connection is None:
+            return
+        users_ids = [user_id for user_id in map(_user_id, users)
+                     if user_id not in self._languages]
+        if not users_ids:
+            return
+
+        # The reads wait for the writes queued before them
+        languages = await asyncio.get_running_loop().run_in_executor(
+            self._worker, self._load_many, users_ids)
+        for user_id in users_ids:
+            # The language may have been looked up or changed meanwhile
+            if user_id in self._languages:
+                continue
+            language = self._unwritten_change(user_id)
+            if language is _NOT_CHANGED:
+                language = languages.get(user_id)
+            self._remember(user_id, language)
+
+    def _schedule_flush(self) -> None:
+        if len(self._changes) >= self.batch_size:
+            self.flush()
+        elif self._flush_timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush(wait=True)
+            else:
+                self._flush_timer = loop.call_later(self.flush_interval,
+                                                    self.flush)
+
+    def flush(self, wait: bool = False) -> None:
+        """Write the changes in the background.
+
+        :param wait: Whether to wait until the changes are written."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._connection is None or not self._changes:
+            return
+
+        changes, self._changes = self._changes, {}
+        self._writing.append(changes)
+        write = self._worker.submit(self._write, changes)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            wait = True
+        if wait:
+            try:
+                write.result()
+            finally:
+                self._forget_written(changes)
+        else:
+            def on_written(_):
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._forget_written, changes)
+
+            write.add_done_callback(on_written)
+
+    def _forget_written(self, changes: dict[int, str | None]) -> None:
+        self._writing = [writing for writing in self._writing
+                         if writing is not changes]
+
+    def _write(self, changes: dict[int, str | None]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                _set_language_query,
+                [(user_id, language) for user_id, language in changes.items()
+                 if language is not None])
+            self._connection.executemany(
+                _reset_language_query,
+                [(user_id,) for user_id, language in changes.items()
+                 if language is None])
@@ -1,10 +1,11 @@
-from pathlib import Path
-import importlib.util
+import importlib
 from types import ModuleType
 from functools import wraps
 import inspect
 from typing import (
     Iterable,
+    Iterator,
+    Mapping,
     TypeAlias,
     Any,
     Callable
@@ -14,33 +15,96 @@ import Imaginarium
 from Imaginarium.gameplay import GameCondition
 
 
-def _import_module(module_name: str,
-                   module_directory: Path | str = Path(__file__).parent) -> ModuleType:
-    """Import module from the specified directory and execute it to make it usable.
+class LanguageModules(Mapping[str, ModuleType]):
+    """The modules of the languages by their codes,
+    which are imported when they are used for the first time."""
 
-    :param module_name: Name of the module to import.
+    def __init__(self, modules_names: Mapping[str, str]) -> None:
+        """:param modules_names: The names of the modules
+        in this package by the codes of their languages."""
+        self._modules_names = dict(modules_names)
+        self._modules: dict[str, ModuleType] = {}
 
-    :param module_directory: Directory where the module is located.
+    def __getitem__(self, language: str) -> ModuleType:
+        try:
+            return self._modules[language]
+        except KeyError:
+            module = importlib.import_module(
+                '.' + self._modules_names[language], __package__)
+            self._modules[language] = module
+            return module
 
-    :return: The imported usable module."""
-    module_path = Path(module_directory) / (module_name + '.py')
-    spec = importlib.util.spec_from_file_location(module_name, module_path)
-    module = importlib.util.module_from_spec(spec)
-    # Execute the module to make it usable
-    spec.loader.exec_module(module)
+    def __contains__(self, language: object) -> bool:
+        # The module is not imported to check if the language is supported
+        return language in self._modules_names
 
-    return module
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._modules_names)
+
+    def __len__(self) -> int:
+        return len(self._modules_names)
 
 
 # The languages are specified in "ISO 639-1" encoding
-language_modules_map: dict[str, ModuleType] = {
-    'en': _import_module('English'),
-    'ru': _import_module('Russian'),
-    'uk': _import_module('Ukrainian'),
-}
+language_modules_map: LanguageModules = LanguageModules({
+    'en': 'English',
+    'ru': 'Russian',
+    'uk': 'Ukrainian',
+})
 default_language = 'en'
 
 Arguments: TypeAlias = tuple[tuple, dict[str, Any]]
+Formatter: TypeAlias = Callable[..., str]
+
+catalog: dict[str | None, dict[str, Formatter]] = {}
+"""The formatters of the messages by the languages and the names
+of the messages, which are compiled when a language is used
+for the first time.
+
+The languages which do not have a message have the formatter
+of the default language, and the languages which are not supported
+have the formatters of the default language."""
+_messages_names: list[str] = []
+
+
+def _missing_message(name: str) -> Formatter:
+    def formatter(*args, **kwargs) -> str:
+        raise AttributeError(
+            'The function with the same name is not found either '
+            'in the language module or in the default language module.'
+        )
+
+    formatter.__name__ = name
+    return formatter
+
+
+def _compile_language(language: str | None) -> dict[str, Formatter]:
+    """Collect the formatters of all the messages in the language
+    and put them into the catalog."""
+    if language == default_language:
+        module = language_modules_map[language]
+        translations = {name: getattr(module, name, None) or _missing_message(name)
+                        for name in _messages_names}
+    else:
+        default_translations = (catalog.get(default_language) or
+                                _compile_language(default_language))
+        if language in language_modules_map:
+            module = language_modules_map[language]
+            translations = {name: getattr(module, name, default_translations[name])
+                            for name in _messages_names}
+        else:
+            # The language is not supported or not specified
+            translations = default_translations
+
+    catalog[language] = translations
+    return translations
+
+
+def compile_catalog() -> None:
+    """Forget the compiled formatters, for example
+    after the language modules were changed,
+    so they are compiled again when they are used."""
+    catalog.clear()
 
 
 def _translate_decorator(preprocessing_func: Callable[[...], Arguments]) \
@@ -49,6 +113,9 @@ def _translate_decorator(preprocessing_func: Callable[[...], Arguments]) \
 
     Replace the decorated function with function that
     returns the equivalent message function and executes it.
+    The equivalent functions are compiled into the catalog
+    when their language is used for the first time,
+    so the translation of a message is a lookup in it.
 
 
     :param preprocessing_func: Function that processes the arguments and
@@ -69,42 +136,31 @@ def _translate_decorator(preprocessing_func: Callable[[...], Arguments]) \
 
     .. note: The decorated function must have a language keyword argument."""
     language_arg_name = 'message_language'
+    name = preprocessing_func.__name__
+
+    parameter = inspect.signature(preprocessing_func).parameters.get(language_arg_name)
+    if parameter is None or parameter.default is inspect.Parameter.empty:
+        raise ValueError(
+            f'The decorated function must have a '
+            f'default "{language_arg_name}" keyword argument in the function signature.'
+        )
+    default = parameter.default
+
+    _messages_names.append(name)
+    # The languages compiled before do not have the message
+    catalog.clear()
 
     @wraps(preprocessing_func)
     def inner(*args, **kwargs) -> str:
-        language_code = None
-        try:  # to extract the language from the passed or default keyword arguments.
-            language = kwargs.pop(language_arg_name)
-        except KeyError:
-            for name, param in inspect.signature(preprocessing_func).parameters.items():
-                if param.default != inspect.Parameter.empty:
-                    if name == language_arg_name:
-                        language = param.default
-                        break
-            else:
-                raise ValueError(
-                    f'The decorated function must have a '
-                    f'passed "{language_arg_name}" keyword argument or '
-                    f'a default "{language_arg_name}" keyword argument in the function signature.'
-                ) from None
+        language = kwargs.pop(language_arg_name, default)
 
         # Specify arguments without the language keyword argument.
         args, kwargs = preprocessing_func(*args, **kwargs)
 
-        # Try to find the equivalent function
-        try:
-            return getattr(language_modules_map[language],
-                           preprocessing_func.__name__)(*args, **kwargs)
-        except (KeyError, AttributeError):
-            # Try to find the default text if it has sense
-            if language != default_language:
-                return getattr(language_modules_map[default_language],
-                               preprocessing_func.__name__)(*args, **kwargs)
-            else:
-                raise AttributeError(
-                    'The function with the same name is not found either '
-                    'in the language module or in the default language module.'
-                )
+        translations = catalog.get(language)
+        if translations is None:
+            translations = _compile_language(language)
+        return translations[name](*args, **kwargs)
 
     return inner
 
@@ -146,58 +202,58 @@ def round_association(association: str = None, *,
 
 
 @_translate_decorator
-def choose_card(cards: Iterable[str], *,
+def choose_card(cards: Iterable[Imaginarium.card.Card | str], *,
                 message_language: str = None):
-    cards = '\n'.join(card for card in cards)
+    cards = '\n'.join(str(card) for card in cards)
 
     return (cards,), {}
 
 
 @_translate_decorator
-def choose_first_card(cards: Iterable[str], *,
+def choose_first_card(cards: Iterable[Imaginarium.card.Card | str], *,
                       message_language: str = None):
-    cards = '\n'.join(card for card in cards)
+    cards = '\n'.join(str(card) for card in cards)
     return (cards,), {}
 
 
 @_translate_decorator
-def choose_second_card(cards: Iterable[str], *,
+def choose_second_card(cards: Iterable[Imaginarium.card.Card | str], *,
                        message_language: str = None):
-    cards = '\n'.join(card for card in cards)
+    cards = '\n'.join(str(card) for card in cards)
     return (cards,), {}
 
 
 @_translate_decorator
-def your_chosen_card(card: str, *,
+def your_chosen_card(card: Imaginarium.card.Card | str, *,
                      message_language: str = None):
     return (card,), {}
 
 
 @_translate_decorator
-def card_selected_automatically(card: str, *,
+def card_selected_automatically(card: Imaginarium.card.Card | str, *,
                                 message_language: str = None):
     return (card,), {}
 
 
 @_translate_decorator
-def choose_your_leaders_card(cards: Iterable[str] = None, *,
+def choose_your_leaders_card(cards: Iterable[Imaginarium.card.Card | str] = None, *,
                              message_language: str = None):
     if cards is None:
         if GameCondition._leader is not None:
             cards = GameCondition._leader.cards
 
-    cards = '\n'.join(card for card in cards)
+    cards = '\n'.join(str(card) for card in cards)
 
     return (cards,), {}
 
 
 @_translate_decorator
-def choose_enemy_card(cards: Iterable[str] = None, *,
+def choose_enemy_card(cards: Iterable[Imaginarium.card.Card | str] = None, *,
                       message_language: str = None):
     if cards is None:
-        cards = (card[0] for card in GameCondition._discarded_cards)
+        cards = (card.card for card in GameCondition._discarded_cards)
 
-    cards = '\n'.join(card for card in cards)
+    cards = '\n'.join(str(card) for card in cards)
 
     return (cards,), {}
 
@@ -320,6 +376,18 @@ def not_enough_players(*, message_language: str = None):
     return (), {}
 
 
+@_translate_decorator
+def phase_progress(answered: int = None, expected: int = None, *,
+                   message_language: str = None):
+    progress = Imaginarium.getting_game_information.get_phase_progress()
+    if answered is None:
+        answered = progress.answered_count if progress else 0
+    if expected is None:
+        expected = progress.players_count if progress else 0
+
+    return (answered, expected), {}
+
+
 ##############################################################################
 
 
@@ -357,6 +425,23 @@ def players_score(score: str = None, *,
     return (score,), {}
 
 
+@_translate_decorator
+def leaderboard(leaders: Iterable[Imaginarium.statistics.PlayerStatistics], *,
+                message_language: str = None):
+    leaders = '\n'.join(
+        f'{place}. {player.name}: {player.points:g} '
+        f'({player.wins}/{player.games}, {player.guess_accuracy:.0%}, '
+        f'{player.average_decision_time:.1f} s)'
+        for place, player in enumerate(leaders, start=1))
+
+    return (leaders,), {}
+
+
+@_translate_decorator
+def no_any_statistics(*, message_language: str = None):
+    return (), {}
+
+
 @_translate_decorator
 def used_cards_list(used_cards: Iterable[str] = None, *,
                     message_language: str = None):
@@ -466,6 +551,11 @@ def step_timeout_must_be_number(*, message_language: str = None):
     return (), {}
 
 
+@_translate_decorator
+def quorum_must_be_percent(*, message_language: str = None):
+    return (), {}
+
+
 @_translate_decorator
 def used_cards_successfully_reset(*, message_language: str = None):
     return (), {}
@@ -0,0 +1,272 @@
+"""The scheduling of the messages the bot sends.
+
+The messages are queued per destination, a user or a channel,
+and each destination sends one message at a time in the order
+of the priorities: the prompts, which players have to answer in time,
+go before the confirmations of the choices,
+which go before the announcements in the channel.
+The texts queued with the same priority to the same destination
+are coalesced into one message, and the sends are spread
+within the budgets of Discord, the global one and the one of each
+destination, instead of hitting the limits and being retried::
+
+    sent_message = await outbound.send(player, text, priority=PROMPT,
+                                       components=buttons)
+    outbound.post(player, confirmation, priority=CONFIRMATION)"""
+import asyncio
+import heapq
+import itertools
+from time import monotonic
+from typing import (
+    Any,
+    Hashable
+)
+
+import Imaginarium
+
+PROMPT: int = 0
+CONFIRMATION: int = 1
+ANNOUNCEMENT: int = 2
+
+PRIORITIES_NAMES: dict[int, str] = {PROMPT: 'prompt',
+                                    CONFIRMATION: 'confirmation',
+                                    ANNOUNCEMENT: 'announcement'}
+
+MAX_MESSAGE_LENGTH: int = 2000
+"""The length of the longest message Discord accepts."""
+
+wait_seconds = Imaginarium.metrics.histogram(
+    'discord_outbound_wait_seconds',
+    'The time in seconds messages wait in the queues before they are sent.',
+    ('priority',))
+coalesced = Imaginarium.metrics.counter(
+    'discord_outbound_coalesced_total',
+    'The queued messages that were sent as a part of another message.')
+throttled_seconds = Imaginarium.metrics.counter(
+    'discord_outbound_throttled_seconds_total',
+    'The time in seconds the sends were delayed to stay within the budgets.',
+    ('budget',))
+
+
+class Budget:
+    """The count of requests which can be made per period.
+
+    The budget is refilled continuously, and the requests
+    which exceed it are delayed until it is refilled.
+
+    :param count: The count of requests per period.
+    :param period: The period in seconds."""
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated_at')
+
+    def __init__(self, count: int, period: float) -> None:
+        self.capacity = count
+        self.rate = count / period
+        self.tokens = float(count)
+        self.updated_at = monotonic()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    @property
+    def full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+    def reserve(self) -> float:
+        """Spend the budget on a request.
+
+        :return: The time in seconds after which
+        the request can be made."""
+        self._refill()
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.
+        return -self.tokens / self.rate
+
+
+class _Message:
+    __slots__ = ('priority', 'order', 'destination', 'content', 'edited',
+                 'kwargs', 'futures', 'queued_at')
+
+    def __init__(self, priority: int, order: int, destination: Any,
+                 content: str | None, edited: Any,
+                 kwargs: dict[str, Any]) -> None:
+        self.priority = priority
+        self.order = order
+        self.destination = destination
+        self.content = content
+        self.edited = edited
+        self.kwargs = kwargs
+        self.futures = [asyncio.get_running_loop().create_future()]
+        self.queued_at = monotonic()
+
+    def __lt__(self, other: '_Message') -> bool:
+        return (self.priority, self.order) < (other.priority, other.order)
+
+    @property
+    def plain(self) -> bool:
+        """Whether the message is only a new text, so it can be coalesced."""
+        return (isinstance(self.content, str) and not self.kwargs and
+                self.edited is None)
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # The messages that nobody awaits do not log their failures twice
+    if not future.cancelled():
+        future.exception()
+
+
+class Outbound:
+    """The queues of the messages to the destinations.
+
+    :param global_budget: The count of messages and the period
+    in seconds within which the bot sends them to all the destinations.
+    :param route_budget: The count of messages and the period
+    in seconds within which the bot sends them to one destination."""
+
+    def __init__(self, global_budget: tuple[int, float] = (50, 1.),
+                 route_budget: tuple[int, float] = (5, 5.)) -> None:
+        self.global_budget = Budget(*global_budget)
+        self._route_budget = route_budget
+        self._routes_budgets: dict[Hashable, Budget] = {}
+        self._queues: dict[Hashable, list[_Message]] = {}
+        self._workers: dict[Hashable, asyncio.Task] = {}
+        self._orders = itertools.count()
+
+    def __len__(self) -> int:
+        """Return the count of the queued messages."""
+        return sum(map(len, self._queues.values()))
+
+    def set_budgets(self, global_budget: tuple[int, float],
+                    route_budget: tuple[int, float]) -> None:
+        """Change the budgets of the sends."""
+        self.global_budget = Budget(*global_budget)
+        self._route_budget = route_budget
+        self._routes_budgets.clear()
+
+    def post(self, destination: Any, content: str | None = None, *,
+             priority: int = ANNOUNCEMENT, edited: Any = None,
+             **kwargs) -> asyncio.Future:
+        """Queue a message to the destination.
+
+        :param destination: The user, the player or the channel
+        with the send method and the ID.
+        :param content: The text of the message.
+        :param priority: PROMPT, CONFIRMATION or ANNOUNCEMENT.
+        :param edited: The message sent to the destination before,
+        which is edited instead of sending a new one.
+        :param kwargs: The other arguments of the send or edit method.
+
+        :return: The future which result is set to the sent
+        or the edited message.
+        If the message was coalesced with others,
+        then it is the message that contains all of them.
+
+        .. note:: The failures of the messages whose futures
+        are not awaited are not raised anywhere."""
+        key = destination.id
+        message = _Message(priority, next(self._orders),
+                           destination, content, edited, kwargs)
+        message.futures[0].add_done_callback(_consume_exception)
+        try:
+            heapq.heappush(self._queues[key], message)
+        except KeyError:
+            self._queues[key] = [message]
+            self._workers[key] = asyncio.create_task(self._work(key))
+
+        return message.futures[0]
+
+    async def send(self, destination: Any, content: str | None = None, *,
+                   priority: int = ANNOUNCEMENT, **kwargs) -> Any:
+        """Queue a message to the destination and wait until it is sent.
+
+        :return: The sent message.
+
+        :raise discord.DiscordException: If the message could not be sent."""
+        return await self.post(destination, content,
+                               priority=priority, **kwargs)
+
+    def _pop(self, queue: list[_Message]) -> _Message:
+        """Pop the next message and coalesce the texts queued after it."""
+        message = heapq.heappop(queue)
+        # The prompts are not coalesced, since each of them awaits its reply
+        if message.priority == PROMPT or not message.plain:
+            return message
+
+        texts = [message.content]
+        length = len(message.content)
+        while (queue and queue[0].priority == message.priority and
+               queue[0].plain and
+               length + 1 + len(queue[0].content) <= MAX_MESSAGE_LENGTH):
+            following = heapq.heappop(queue)
+            texts.append(following.content)
+            length += 1 + len(following.content)
+            message.futures += following.futures
+            coalesced.inc()
+        message.content = '\n'.join(texts)
+
+        return message
+
+    async def _work(self, key: Hashable) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                try:
+                    route_budget = self._routes_budgets[key]
+                except KeyError:
+                    route_budget = self._routes_budgets[key] = \
+                        Budget(*self._route_budget)
+                global_delay = self.global_budget.reserve()
+                route_delay = route_budget.reserve()
+                if global_delay or route_delay:
+                    throttled_seconds.labels('global').inc(global_delay)
+                    throttled_seconds.labels('route').inc(route_delay)
+                    await asyncio.sleep(max(global_delay, route_delay))
+
+                # The message is chosen after the delay,
+                # so the prompts queued meanwhile go first
+                message = self._pop(queue)
+                wait_seconds.labels(PRIORITIES_NAMES[message.priority]).observe(
+                    monotonic() - message.queued_at)
+                try:
+                    if message.edited is None:
+                        sent_message = await message.destination.send(
+                            message.content, **message.kwargs)
+                    else:
+                        await message.edited.edit(content=message.content,
+                                                  **message.kwargs)
+                        sent_message = message.edited
+                except Exception as e:
+                    for future in message.futures:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for future in message.futures:
+                        if not future.done():
+                            future.set_result(sent_message)
+        finally:
+            del self._queues[key]
+            del self._workers[key]
+            # The budget of the destination is forgotten
+            # only when it would be full anyway
+            budget = self._routes_budgets.get(key)
+            if budget is not None and budget.full:
+                del self._routes_budgets[key]
+            for message in queue:
+                for future in message.futures:
+                    future.cancel()
+
+    async def join(self) -> None:
+        """Wait until all the queued messages are sent."""
+        while self._workers:
+            await asyncio.gather(*self._workers.values(),
+                                 return_exceptions=True)
+
+
+outbound = Outbound()
+queued = Imaginarium.metrics.gauge(
+    'discord_outbound_queued', 'The messages waiting in the queues.')
+queued.set_function(lambda: len(outbound))
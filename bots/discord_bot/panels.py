@@ -0,0 +1,182 @@
+"""The panels of the players.
+
+A panel is the only direct message the bot sends to a player per game.
+Every phase edits it in place instead of sending a new message:
+the prompts are shown at once, the other updates are debounced,
+so only the last of the quick updates is shown,
+and the updates that do not change the panel are skipped.
+The update that confirms the click of a button is shown
+with the response to the click, which has to be sent anyway::
+
+    sent_message = await panel_of(player).show(prompt, components=buttons)
+    panel_of(player).update(confirmation, interaction=reply.interaction)"""
+import asyncio
+from typing import Any
+
+import Imaginarium
+from outbound import Outbound, PROMPT, CONFIRMATION, outbound
+
+UPDATE_MESSAGE: int = 7
+"""The type of the response to an interaction which edits its message."""
+
+updates = Imaginarium.metrics.counter(
+    'discord_panel_updates_total',
+    'The updates of the panels of the players by how they were shown.',
+    ('result',))
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+class Panel:
+    """The message of the game to a player which is edited in place.
+
+    :param recipient: The player or the user who receives the panel.
+    :param debounce: The time in seconds during which the updates
+    are collected before the last of them is shown.
+    :param outbound: The queues through which the panel is sent."""
+
+    def __init__(self, recipient: Any, debounce: float = 0.5,
+                 outbound: Outbound = outbound) -> None:
+        self.recipient = recipient
+        self.debounce = debounce
+        self.message: Any = None
+        """The sent message of the panel or None if it was not sent yet."""
+        self._outbound = outbound
+        self._content: str | None = None
+        self._components: list = []
+        self._shown: tuple[str | None, list] | None = None
+        self._flushing = asyncio.Lock()
+        self._responses: set[asyncio.Task] = set()
+        """The responses to the clicks which are being sent.
+        The panel is edited only after them, so they do not overwrite it."""
+        self._timer: asyncio.TimerHandle | None = None
+
+    def _changed(self) -> bool:
+        if self._shown is None:
+            return True
+        content, components = self._shown
+        return (content != self._content or
+                (components is not self._components and
+                 components != self._components))
+
+    async def _flush(self, priority: int) -> Any:
+        """Show the last update if it changes the panel.
+
+        :return: The message of the panel."""
+        async with self._flushing:
+            if self._responses:
+                await asyncio.wait(self._responses)
+            if not self._changed():
+                updates.labels('skipped').inc()
+                return self.message
+
+            shown = (self._content, self._components)
+            if self.message is None:
+                self.message = await self._outbound.send(
+                    self.recipient, self._content,
+                    priority=priority, components=self._components)
+                updates.labels('sent').inc()
+            else:
+                await self._outbound.send(
+                    self.recipient, self._content, priority=priority,
+                    edited=self.message, components=self._components)
+                updates.labels('edited').inc()
+            self._shown = shown
+
+            return self.message
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._run(self._flush(CONFIRMATION))
+
+    async def show(self, content: str, components: list = None) -> Any:
+        """Show the prompt on the panel at once.
+
+        :param content: The text of the panel.
+        :param components: The components of the panel,
+        which replace the components of the previous update.
+
+        :return: The message of the panel.
+
+        :raise discord.DiscordException: If the panel could not be shown."""
+        self._cancel_timer()
+        self._content = content
+        self._components = components or []
+
+        return await self._flush(PROMPT)
+
+    def update(self, content: str, components: list = None,
+               interaction: Any = None) -> None:
+        """Show the update on the panel after the debounce time.
+
+        :param content: The text of the panel.
+        :param components: The components of the panel,
+        which replace the components of the previous update.
+        :param interaction: The click of a button of the panel.
+        If it is passed, the update is shown at once
+        with the response to the click."""
+        self._content = content
+        self._components = components or []
+        self._cancel_timer()
+
+        if interaction is None or self._flushing.locked():
+            if interaction is not None:
+                # The panel is being edited, so the click is only answered
+                self._respond(interaction, type=6)
+            self._timer = asyncio.get_running_loop().call_later(
+                self.debounce, self._on_timer)
+            return
+
+        if not self._changed():
+            self._respond(interaction, type=6)
+            updates.labels('skipped').inc()
+        else:
+            self._respond(interaction, type=UPDATE_MESSAGE,
+                          content=self._content, components=self._components)
+            self._shown = (self._content, self._components)
+            updates.labels('responded').inc()
+
+    def _respond(self, interaction: Any, **response: Any) -> None:
+        task = self._run(interaction.respond(**response))
+        self._responses.add(task)
+        task.add_done_callback(self._responses.discard)
+
+    @staticmethod
+    def _run(coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coroutine)
+        task.add_done_callback(_consume_exception)
+        return task
+
+    def close(self) -> None:
+        """Drop the updates which have not been shown yet."""
+        self._cancel_timer()
+
+
+debounce: float = 0.5
+"""The debounce time in seconds of the panels of the next games."""
+panels: dict[int, Panel] = {}
+"""The panels of the current game by the IDs of the players."""
+
+
+def panel_of(player: Any) -> Panel:
+    """Return the panel of the player in the current game."""
+    try:
+        return panels[player.id]
+    except KeyError:
+        panel = panels[player.id] = Panel(player, debounce)
+        return panel
+
+
+def clear() -> None:
+    """Forget the panels of the previous game."""
+    for panel in panels.values():
+        panel.close()
+    panels.clear()
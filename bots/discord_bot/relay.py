@@ -0,0 +1,384 @@
+"""The relay of the events between the processes of the shards.
+
+Discord sends the events of the guilds to the shards of the guilds,
+so the games, which are started in the guilds, are played
+by the processes of their shards, but the direct messages
+and the clicks of the buttons in them are sent only to the first shard.
+Its process is the hub of the relay: it forwards the direct messages
+to the other processes, asks them whether they wait for the clicks
+of the buttons nobody waits for in it,
+and passes the changes of the users' languages between all of them::
+
+    await relay.serve('127.0.0.1', 9120, secret)  # The process of the first shard
+    await relay.connect('127.0.0.1', 9120, secret, bot.http)  # The other processes
+    relay.forward_message(message)
+    claimed = await relay.forward_button_click(interaction)
+
+The replies received through the relay are resolved by the router
+of the process as if they were received from Discord,
+and the clicks are answered with the callbacks of the interactions.
+Both sides of a connection prove that they know the secret
+shared by the processes before anything else is passed,
+so other local processes cannot read the replies or make moves."""
+import asyncio
+import hmac
+import secrets
+from itertools import count
+from typing import (
+    Any,
+    NamedTuple
+)
+
+from discord.http import HTTPClient, Route
+
+import Imaginarium
+from Imaginarium import protocol
+from interaction_router import InteractionRouter, router
+from messages_text import users_languages
+
+forwarded = Imaginarium.metrics.counter(
+    'discord_relay_forwarded_total',
+    'The events forwarded to the other processes of the shards.',
+    ('event',))
+rejected = Imaginarium.metrics.counter(
+    'discord_relay_rejected_total',
+    'The connections to the relay which did not prove the secret.')
+
+HANDSHAKE_TIMEOUT: float = 5.
+"""The time in seconds in which the processes have to prove the secret."""
+
+
+class _Route(Route):
+    # The callbacks of the interactions are not available in the API v7
+    BASE = 'https://discord.com/api/v9'
+
+
+class RelayedUser(NamedTuple):
+    id: int
+    bot: bool
+
+
+class RelayedChannel(NamedTuple):
+    id: int
+
+
+class RelayedComponent(NamedTuple):
+    custom_id: str
+    label: str
+
+
+class RelayedMessage:
+    """The direct message received by another process."""
+    __slots__ = ('id', 'channel', 'author', 'content')
+    guild = None
+
+    def __init__(self, id: int, channel_id: int, author: RelayedUser,
+                 content: str = '') -> None:
+        self.id = id
+        self.channel = RelayedChannel(channel_id)
+        self.author = author
+        self.content = content
+
+    def __repr__(self) -> str:
+        return (f'<RelayedMessage id={self.id} channel_id={self.channel.id} '
+                f'author_id={self.author.id}>')
+
+
+def _components_data(components: list) -> list[dict]:
+    """Return the rows of the components as they are sent to Discord.
+
+    :param components: The components or the lists of the components
+    of each row."""
+    if not components:
+        return []
+    rows = components if isinstance(components[0], list) else [components]
+    return [{'type': 1, 'components': [component.to_dict() for component in row]}
+            for row in rows]
+
+
+class RelayedInteraction:
+    """The click of a button in a direct message
+    received by another process."""
+    __slots__ = ('id', 'token', 'message', 'author', 'component',
+                 'responded', '_http')
+
+    def __init__(self, id: int, token: str, message: RelayedMessage,
+                 author: RelayedUser, component: RelayedComponent,
+                 http: HTTPClient) -> None:
+        self.id = id
+        self.token = token
+        self.message = message
+        self.author = author
+        self.component = component
+        self.responded = False
+        self._http = http
+
+    @property
+    def user(self) -> RelayedUser:
+        return self.author
+
+    async def respond(self, *, type: int = 4, content: str = None,
+                      components: list = None, ephemeral: bool = False,
+                      **kwargs) -> None:
+        """Answer the click with the callback of the interaction.
+
+        :param type: The type of the response: 4 sends a message,
+        6 only acknowledges the click and 7 edits the message of the button.
+
+        :raise discord.HTTPException: If the response was not accepted."""
+        payload: dict[str, Any] = {'type': type}
+        if type != 6:
+            data = payload['data'] = {'content': content}
+            if components is not None:
+                data['components'] = _components_data(components)
+            if ephemeral:
+                data['flags'] = 64
+        await self._http.request(
+            _Route('POST', '/interactions/{interaction_id}/{interaction_token}/callback',
+                   interaction_id=self.id, interaction_token=self.token),
+            json=payload)
+        self.responded = True
+
+    def __repr__(self) -> str:
+        return (f'<RelayedInteraction id={self.id} '
+                f'message_id={self.message.id} author_id={self.author.id}>')
+
+
+def _message_data(message: Any) -> list:
+    return [message.id, message.channel.id,
+            message.author.id, message.author.bot, message.content]
+
+
+def _button_click_data(interaction: Any) -> list:
+    raw_data = interaction.raw_data
+    return [int(raw_data['id']), raw_data['token'],
+            interaction.message.id, interaction.message.channel.id,
+            interaction.author.id, interaction.author.bot,
+            interaction.component.custom_id, interaction.component.label]
+
+
+def _secret_bytes(secret: str | bytes) -> bytes:
+    if not secret:
+        raise ValueError('The relay cannot be used without a secret.')
+    return secret.encode() if isinstance(secret, str) else secret
+
+
+class Relay:
+    """The connections between the processes of the shards.
+
+    :param router: The router which resolves the relayed replies."""
+
+    def __init__(self, router: InteractionRouter = router) -> None:
+        self._router = router
+        self._server: asyncio.AbstractServer | None = None
+        self._connecting: asyncio.Task | None = None
+        self._http: HTTPClient | None = None
+        self._secret: bytes = b''
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task] = {}
+        """The connections and the tasks serving them."""
+        self._peers: set[asyncio.StreamWriter] = set()
+        """The connections of the other processes which proved the secret.
+        The hub is the only peer of the other processes."""
+        self._request_ids = count(1)
+        self._calls: dict[int, asyncio.Future] = {}
+
+    @property
+    def is_hub(self) -> bool:
+        """Whether the process receives the direct messages."""
+        return self._server is not None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the process serves the relay or connects to it."""
+        return self._server is not None or self._connecting is not None
+
+    async def serve(self, host: str, port: int, secret: str | bytes) -> int:
+        """Accept the other processes as the process of the first shard.
+
+        :param secret: The secret shared by the processes.
+
+        :return: The port at which the relay is served,
+        which is chosen by the system if the port is 0."""
+        self._secret = _secret_bytes(secret)
+        self._server = await asyncio.start_server(self._communicate, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def peers_count(self) -> int:
+        """Return the count of the connected processes."""
+        return len(self._peers)
+
+    async def connect(self, host: str, port: int, secret: str | bytes,
+                      http: HTTPClient, retry_interval: float = 1.) -> None:
+        """Connect to the process of the first shard in background
+        and reconnect when the connection is lost.
+
+        :param secret: The secret shared by the processes.
+        :param http: The client through which the relayed clicks
+        are answered."""
+        self._secret = _secret_bytes(secret)
+        self._http = http
+        self._connecting = asyncio.create_task(
+            self._keep_connected(host, port, retry_interval))
+
+    async def _keep_connected(self, host: str, port: int,
+                              retry_interval: float) -> None:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                await asyncio.sleep(retry_interval)
+                continue
+            await self._communicate(reader, writer)
+            await asyncio.sleep(retry_interval)
+
+    def _proof(self, role: str, nonce: bytes) -> bytes:
+        return hmac.digest(self._secret, role.encode() + nonce, 'sha256')
+
+    async def _authenticate(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> bool:
+        """Prove the secret to the other side and check its proof.
+
+        :return: Whether the other side knows the secret."""
+        # The roles are a part of the proofs,
+        # so a proof cannot be sent back as the proof of the other side
+        role, peer_role = ('hub', 'shard') if self.is_hub else ('shard', 'hub')
+        nonce = secrets.token_bytes(32)
+        writer.write(protocol.pack_frame(protocol.EVENT, 0, ['challenge', nonce]))
+        _, _, (event, peer_nonce) = await protocol.read_frame(reader)
+        if event != 'challenge' or not isinstance(peer_nonce, bytes):
+            return False
+
+        writer.write(protocol.pack_frame(
+            protocol.EVENT, 0, ['proof', self._proof(role, peer_nonce)]))
+        _, _, (event, proof) = await protocol.read_frame(reader)
+        return (event == 'proof' and isinstance(proof, bytes) and
+                hmac.compare_digest(proof, self._proof(peer_role, nonce)))
+
+    async def _communicate(self, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+        try:
+            if not await asyncio.wait_for(self._authenticate(reader, writer),
+                                          HANDSHAKE_TIMEOUT):
+                rejected.inc()
+                return
+            self._peers.add(writer)
+
+            while True:
+                kind, request_id, body = await protocol.read_frame(reader)
+                match kind:
+                    case protocol.EVENT:
+                        self._handle_event(writer, *body)
+                    case protocol.CALL:
+                        claimed = self._handle_button_click(*body[1])
+                        writer.write(protocol.pack_frame(
+                            protocol.RESULT, request_id, claimed))
+                    case protocol.RESULT:
+                        future = self._calls.get(request_id)
+                        if future is not None and not future.done():
+                            future.set_result(body)
+        except (asyncio.IncompleteReadError, ConnectionError,
+                asyncio.TimeoutError, protocol.ProtocolError,
+                ValueError, TypeError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            self._peers.discard(writer)
+            writer.close()
+
+    def _handle_event(self, source: asyncio.StreamWriter,
+                      event: str, data: list) -> None:
+        match event:
+            case 'message':
+                message_id, channel_id, author_id, author_bot, content = data
+                self._router.dispatch_message(RelayedMessage(
+                    message_id, channel_id,
+                    RelayedUser(author_id, author_bot), content))
+            case 'language':
+                users_languages.refresh(*data)
+                if self.is_hub:
+                    self._publish(event, data, excluded=source)
+
+    def _handle_button_click(self, interaction_id: int, token: str,
+                             message_id: int, channel_id: int,
+                             author_id: int, author_bot: bool,
+                             custom_id: str, label: str) -> bool:
+        author = RelayedUser(author_id, author_bot)
+        return self._router.dispatch_button_click(RelayedInteraction(
+            interaction_id, token,
+            RelayedMessage(message_id, channel_id, author),
+            author, RelayedComponent(custom_id, label), self._http))
+
+    def _publish(self, event: str, data: list,
+                 excluded: asyncio.StreamWriter = None) -> None:
+        if not self._peers:
+            return
+        frame = protocol.pack_frame(protocol.EVENT, 0, [event, data])
+        for writer in self._peers:
+            if writer is not excluded and not writer.is_closing():
+                writer.write(frame)
+        forwarded.labels(event).inc()
+
+    def forward_message(self, message: Any) -> None:
+        """Pass the direct message to the other processes."""
+        self._publish('message', _message_data(message))
+
+    async def forward_button_click(self, interaction: Any,
+                                   timeout: float = 1.) -> bool:
+        """Pass the click of a button in a direct message
+        to the other processes.
+
+        :param timeout: The time in seconds after which the processes
+        that did not answer are considered not waiting for the click.
+
+        :return: Whether a process waited for the click.
+        It answers the click itself."""
+        if not self._peers:
+            return False
+
+        frame_data = ['button_click', _button_click_data(interaction)]
+        loop = asyncio.get_running_loop()
+        futures = []
+        for writer in self._peers:
+            request_id = next(self._request_ids) & 0xFFFFFFFF
+            future = self._calls[request_id] = loop.create_future()
+            futures.append((request_id, future))
+            writer.write(protocol.pack_frame(protocol.CALL, request_id, frame_data))
+        forwarded.labels('button_click').inc()
+
+        try:
+            done, _ = await asyncio.wait([future for _, future in futures],
+                                         timeout=timeout)
+        finally:
+            for request_id, _ in futures:
+                self._calls.pop(request_id, None)
+
+        return any(future.result() for future in done)
+
+    def publish_language(self, user_id: int, language: str | None) -> None:
+        """Pass the language the user chose to the other processes,
+        which keep the languages in their own memory."""
+        self._publish('language', [user_id, language])
+
+    async def close(self) -> None:
+        """Stop accepting the other processes and close the connections."""
+        tasks = list(self._connections.values())
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._connecting is not None:
+            self._connecting.cancel()
+            tasks.append(self._connecting)
+            self._connecting = None
+        for writer in tuple(self._connections):
+            writer.close()
+        for future in self._calls.values():
+            future.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+relay = Relay()
+"""The relay of the process, which does nothing
+unless the bot runs in several processes."""
@@ -0,0 +1,102 @@
+"""The declarative description of the replies the bot expects.
+
+A spec is compiled once per phase into the checks of messages and buttons,
+which look up the author and the text of a reply in prepared sets
+instead of parsing and validating the text on every event::
+
+    checks = ReplySpec(excluded_users={leader.id},
+                       numbers=range(1, cards_per_player + 1)).compile()
+    await wait_for_reply(player, text, checks=checks, buttons=buttons)"""
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Mapping,
+    NamedTuple
+)
+
+MESSAGE: str = 'message'
+BUTTON: str = 'button'
+
+
+class ReplyChecks(NamedTuple):
+    """The compiled checks of a spec.
+
+    :param message_check: The check of messages
+    or None if messages are not expected.
+    :param button_check: The check of the clicks of buttons
+    or None if buttons are not expected."""
+    message_check: Callable[[Any], bool] | None
+    button_check: Callable[[Any], bool] | None
+
+
+class ReplySpec:
+    """The replies the bot expects."""
+    __slots__ = ('users', 'excluded_users', 'numbers', 'excluded_numbers',
+                 'excluded_numbers_by_users', 'kinds', 'allow_bots')
+
+    def __init__(self, *,
+                 users: Collection[int] | None = None,
+                 excluded_users: Collection[int] = (),
+                 numbers: range | None = None,
+                 excluded_numbers: Collection[int] = (),
+                 excluded_numbers_by_users: Mapping[int, Collection[int]] | None = None,
+                 kinds: Collection[str] = (MESSAGE, BUTTON),
+                 allow_bots: bool = False) -> None:
+        """Describe the expected replies.
+
+        :param users: The IDs of the users who can reply,
+        or None if everyone can reply.
+        :param excluded_users: The IDs of the users who cannot reply.
+        :param numbers: The numbers the reply can contain,
+        or None if the reply can contain any text.
+        :param excluded_numbers: The numbers the reply cannot contain.
+        :param excluded_numbers_by_users: The map of the IDs of users
+        and the numbers their replies cannot contain.
+        :param kinds: The kinds of replies: MESSAGE and BUTTON.
+        :param allow_bots: Whether bots can reply."""
+        self.users = users
+        self.excluded_users = excluded_users
+        self.numbers = numbers
+        self.excluded_numbers = excluded_numbers
+        self.excluded_numbers_by_users = excluded_numbers_by_users or {}
+        self.kinds = kinds
+        self.allow_bots = allow_bots
+
+    def compile(self) -> ReplyChecks:
+        """Return the checks of messages and buttons."""
+        users = None if self.users is None else frozenset(self.users)
+        excluded_users = frozenset(self.excluded_users)
+        allow_bots = self.allow_bots
+
+        texts = None
+        texts_by_users = {}
+        if self.numbers is not None:
+            # The texts of the numbers are prepared,
+            # so the reply is not parsed as a number
+            texts = frozenset(str(number) for number in self.numbers
+                              if number not in self.excluded_numbers)
+            texts_by_users = {
+                user_id: texts.difference(str(number) for number in numbers)
+                for user_id, numbers in self.excluded_numbers_by_users.items()}
+
+        def check(author: Any, text: str) -> bool:
+            if author.bot and not allow_bots:
+                return False
+            author_id = author.id
+            if users is not None and author_id not in users:
+                return False
+            if author_id in excluded_users:
+                return False
+            if texts is None:
+                return True
+            return text in texts_by_users.get(author_id, texts)
+
+        def message_check(message: Any) -> bool:
+            return check(message.author, message.content)
+
+        def button_check(interaction: Any) -> bool:
+            return check(interaction.author, interaction.component.label)
+
+        return ReplyChecks(message_check if MESSAGE in self.kinds else None,
+                           button_check if BUTTON in self.kinds else None)
@@ -8,8 +8,10 @@ from discord.ext.commands import Context, Cog, command
 from chardet import detect
 
 import Imaginarium
+import configuration as config
 import messages_text as mt
 from messages_text import users_languages as ul
+from relay import relay
 
 
 async def _iterate_sources(ctx: Context,
@@ -43,6 +45,10 @@ class SettingUpGame(Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    def cog_unload(self):
+        # Write the chosen languages which are not written yet
+        mt.users_languages.close()
+
     @command()
     async def set_winning_score(self, ctx, score):
         if score.isdigit():
@@ -57,6 +63,13 @@ class SettingUpGame(Cog):
         else:
             await ctx.send(mt.step_timeout_must_be_number())
 
+    @command()
+    async def set_quorum_percent(self, ctx, percent):
+        if percent.isdigit() and int(percent) <= 100:
+            Imaginarium.setting_up_game.set_quorum(int(percent) / 100)
+        else:
+            await ctx.send(mt.quorum_must_be_percent())
+
     @command()
     async def reset_used_cards(self, ctx):
         Imaginarium.setting_up_game.reset_used_cards()
@@ -104,18 +117,12 @@ class SettingUpGame(Cog):
 
     @command()
     async def set_language(self, ctx, language):
-        language_code = None
-
-        # If the language is a code
-        if 2 <= len(language) <= 3:
-            language_code = language.lower()
-        else:
-            language = language.capitalize()
-            if language in mt.languages_maps.languages_names:
-                language_code = mt.languages_maps.language_code_map[language]
+        # The language can be a code, an English or a native name
+        language_code = mt.languages_maps.find_language_code(language)
 
         if language_code in mt.language_modules_map:
             mt.users_languages[ctx.author] = language_code
+            relay.publish_language(ctx.author.id, language_code)
 
             await ctx.author.send(mt.your_language_is(
                 mt.languages_maps.code_language_map[language_code],
@@ -128,10 +135,13 @@ class SettingUpGame(Cog):
     @command()
     async def reset_language(self, ctx):
         mt.users_languages[ctx.author] = None
+        relay.publish_language(ctx.author.id, None)
 
         await ctx.author.send(mt.your_language_reset(
             message_language=ul[ctx.author]))
 
 
 def setup(bot):
+    mt.users_languages.open(config.LANGUAGES_PATH)
+
     bot.add_cog(cog=SettingUpGame(bot))
@@ -0,0 +1,151 @@
+"""The processes of the groups of the shards of the bot.
+
+Discord sends the events of each guild to one shard,
+whose ID is derived from the ID of the guild,
+so the shards are split into groups which are run by separate processes,
+and every process handles only the commands, the games
+and the replies of its guilds with its own core.
+The supervisor starts a process for every group,
+restarts the processes which stop,
+and the processes stop when the supervisor stops.
+The processes relay the direct messages with the secret
+which the supervisor passes to them in the environment::
+
+    supervisor = ShardsSupervisor(main_path, shard_count=8, processes_count=4)
+    supervisor.run()"""
+import secrets
+import sys
+import threading
+from os import environ
+from subprocess import Popen, PIPE, TimeoutExpired
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Callable
+
+import requests
+
+GATEWAY_URL: str = 'https://discord.com/api/v9/gateway/bot'
+RELAY_SECRET_VARIABLE: str = 'DISCORD_RELAY_SECRET'
+"""The environment variable of the secret of the relay."""
+
+
+def shard_id_of(guild_id: int, shard_count: int) -> int:
+    """Return the ID of the shard which receives the events of the guild."""
+    return (guild_id >> 22) % shard_count
+
+
+def split_shards(shard_count: int, processes_count: int) -> list[list[int]]:
+    """Split the IDs of the shards into the groups of the processes.
+
+    :return: The consecutive IDs of each group.
+    The first group contains the first shard, which receives
+    the direct messages, and the fewest other shards."""
+    size, extra = divmod(shard_count, processes_count)
+    groups = []
+    start = 0
+    for index in range(processes_count):
+        end = start + size + (index >= processes_count - extra)
+        groups.append(list(range(start, end)))
+        start = end
+
+    return groups
+
+
+def recommended_shard_count(token: str) -> int:
+    """Return the count of the shards Discord recommends for the bot.
+
+    :raise requests.RequestException: If Discord did not answer."""
+    response = requests.get(GATEWAY_URL, timeout=10,
+                            headers={'Authorization': f'Bot {token}'})
+    response.raise_for_status()
+
+    return response.json()['shards']
+
+
+def watch_supervisor(stop: Callable[[], None]) -> None:
+    """Call the function when the supervisor of the process stops.
+
+    The supervisor keeps the input of the process open,
+    so it is closed however the supervisor is stopped."""
+    def wait():
+        sys.stdin.read()
+        stop()
+
+    threading.Thread(target=wait, name='supervisor', daemon=True).start()
+
+
+class ShardsSupervisor:
+    """The processes of the groups of the shards.
+
+    :param main_path: The script of the bot, which runs the shards
+    passed to it with the "--shard-ids" and "--shard-count" arguments.
+    :param shard_count: The count of all the shards.
+    :param processes_count: The count of the processes.
+    :param restart_delay: The time in seconds after the start
+    of a process before which it is not restarted,
+    so the processes that fail at once do not restart in a loop.
+
+    .. note:: The secret of the relay is taken from the environment
+    or generated for the processes of the supervisor."""
+
+    def __init__(self, main_path: Path | str, shard_count: int,
+                 processes_count: int, restart_delay: float = 5.) -> None:
+        if not 0 < processes_count <= shard_count:
+            raise ValueError(
+                f'{shard_count} shards cannot be split '
+                f'between {processes_count} processes.')
+
+        self.main_path = main_path
+        self.shard_count = shard_count
+        self.groups = split_shards(shard_count, processes_count)
+        self.restart_delay = restart_delay
+        self._environment = {
+            **environ,
+            RELAY_SECRET_VARIABLE: (environ.get(RELAY_SECRET_VARIABLE) or
+                                    secrets.token_hex(32))}
+        self._processes: list[Popen | None] = [None] * processes_count
+        self._started_at: list[float] = [0.] * processes_count
+
+    def _start(self, index: int) -> None:
+        if self._processes[index] is not None:
+            self._processes[index].stdin.close()
+        self._processes[index] = Popen(
+            [sys.executable, self.main_path,
+             '--shard-ids', *map(str, self.groups[index]),
+             '--shard-count', str(self.shard_count),
+             '--process-index', str(index)],
+            stdin=PIPE, env=self._environment)
+        self._started_at[index] = monotonic()
+
+    def run(self, poll_interval: float = 1.) -> None:
+        """Start the processes and restart them when they stop
+        until the supervisor is interrupted."""
+        try:
+            for index in range(len(self.groups)):
+                self._start(index)
+            while True:
+                sleep(poll_interval)
+                for index, process in enumerate(self._processes):
+                    if (process.poll() is not None and
+                            monotonic() - self._started_at[index] >= self.restart_delay):
+                        print(f'The process of the shards {self.groups[index]} '
+                              f'stopped with the code {process.returncode}. '
+                              f'It is restarted.')
+                        self._start(index)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = 10.) -> None:
+        """Stop the processes and wait for them."""
+        processes = [process for process in self._processes
+                     if process is not None]
+        for process in processes:
+            # The processes close the bots when their input is closed
+            process.stdin.close()
+        for process in processes:
+            try:
+                process.wait(timeout)
+            except TimeoutExpired:
+                process.terminate()